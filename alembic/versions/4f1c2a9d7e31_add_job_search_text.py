@@ -0,0 +1,71 @@
+"""add job search_text full-text index
+
+Revision ID: 4f1c2a9d7e31
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.hepler.text_search import TextSearchHelper
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1c2a9d7e31"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("job", sa.Column("search_text", sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT job.id, job.title, job.job_description, job.job_requirement, "
+            "GROUP_CONCAT(skill.name SEPARATOR ' ') "
+            "FROM job "
+            "LEFT JOIN job_skill ON job_skill.job_id = job.id "
+            "LEFT JOIN skill ON skill.id = job_skill.skill_id "
+            "GROUP BY job.id"
+        )
+    ).all()
+    values = [
+        {
+            "id": id,
+            "search_text": TextSearchHelper.fold(
+                re.sub(
+                    r"<[^>]+>",
+                    " ",
+                    " ".join(
+                        [
+                            title or "",
+                            description or "",
+                            requirement or "",
+                            skills or "",
+                        ]
+                    ),
+                )
+            ),
+        }
+        for id, title, description, requirement, skills in rows
+    ]
+    if values:
+        bind.execute(
+            sa.text("UPDATE job SET search_text = :search_text WHERE id = :id"), values
+        )
+
+    op.execute(
+        "ALTER TABLE job ADD FULLTEXT INDEX idx_job_search_text (search_text) "
+        "WITH PARSER ngram"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_search_text", table_name="job")
+    op.drop_column("job", "search_text")
@@ -0,0 +1,47 @@
+"""add conversation last_message_id and last_message_at
+
+Revision ID: 8b2d5e7f1a90
+Revises: 4f1c2a9d7e31
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2d5e7f1a90"
+down_revision: Union[str, None] = "4f1c2a9d7e31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "conversation", sa.Column("last_message_id", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "conversation",
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "UPDATE conversation "
+        "JOIN (SELECT conversation_id, MAX(id) AS id FROM message "
+        "GROUP BY conversation_id) latest "
+        "ON latest.conversation_id = conversation.id "
+        "JOIN message ON message.id = latest.id "
+        "SET conversation.last_message_id = message.id, "
+        "conversation.last_message_at = message.created_at, "
+        "conversation.updated_at = conversation.updated_at"
+    )
+    op.create_index(
+        "ix_conversation_last_message_at", "conversation", ["last_message_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversation_last_message_at", table_name="conversation")
+    op.drop_column("conversation", "last_message_at")
+    op.drop_column("conversation", "last_message_id")
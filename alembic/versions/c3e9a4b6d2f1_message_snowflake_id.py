@@ -0,0 +1,59 @@
+"""widen message ids to BIGINT for snowflake ids
+
+Revision ID: c3e9a4b6d2f1
+Revises: 8b2d5e7f1a90
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e9a4b6d2f1"
+down_revision: Union[str, None] = "8b2d5e7f1a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, nullable) holding a message id
+COLUMNS = [
+    ("message_reaction", "message_id", False),
+    ("message_image", "message_id", False),
+    ("pinned_message", "message_id", False),
+    ("message", "parent_id", True),
+    ("conversation", "last_message_id", True),
+    ("conversation_member", "last_read_message_id", True),
+]
+
+
+def alter_columns(existing_type, type_, autoincrement: bool) -> None:
+    # Foreign keys to message.id must change type together with it
+    op.execute("SET FOREIGN_KEY_CHECKS = 0")
+    op.alter_column(
+        "message",
+        "id",
+        existing_type=existing_type,
+        type_=type_,
+        existing_nullable=False,
+        autoincrement=autoincrement,
+    )
+    for table, column, nullable in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=existing_type,
+            type_=type_,
+            existing_nullable=nullable,
+        )
+    op.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def upgrade() -> None:
+    alter_columns(sa.Integer(), sa.BigInteger(), autoincrement=False)
+
+
+def downgrade() -> None:
+    # Fails once snowflake ids are stored, they do not fit in INT
+    alter_columns(sa.BigInteger(), sa.Integer(), autoincrement=True)
@@ -3,11 +3,21 @@ from starlette.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.db.base import get_db
+from sqlalchemy import text
+
+from app.db.base import get_db, async_engine
 from app.db.base_class import Base
 from app.db.init_db import init_db
+from app.core.reference_data.reference_data_registry import reference_data_registry
 from app.storage.s3 import s3_service
-from app.storage.redis import redis_dependency
+from app.storage.redis import redis_dependency, get_redis
+from app.storage.local_cache import local_cache_invalidator
+from app.storage.cache_invalidation import cache_invalidation_bus
+from app.core.auth.token_blacklist_service import token_blacklist_service
+from app.core.websocket.websocket_handler import websocket_manager
+from app.core.message.message_queue_service import message_queue_service
+from app.core.suggest.suggest_service import suggest_service
+from app.core.job.job_facet_service import job_facet_service
 from app.core.loggers import get_logger, setup_logging
 from app.core import loggers
 from app.common.exception_handler import register_exception
@@ -30,7 +40,11 @@ async def check_sync_engine():
 
 async def check_async_engine():
     logger.debug(msg="Checking async engine")
-    # do something with async engine
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"Failed to connect to Database with async engine: {e}")
 
 
 async def setup_redis():
@@ -45,17 +59,23 @@ async def setup_s3():
 
 async def disable_all_connections():
     logger.debug(msg="Disabling all connections with MySQL")
-    # do something with MySQL
+    await async_engine.dispose()
 
 
 async def disable_all_redis_connections():
     logger.debug(msg="Disabling all connections with Redis")
-    # do something with Redis
+    await local_cache_invalidator.stop()
+    await cache_invalidation_bus.stop()
+    token_blacklist_service.stop()
+    await websocket_manager.stop()
+    await message_queue_service.stop()
+    await job_facet_service.stop()
+    await suggest_service.stop()
 
 
 async def disable_all_s3_connections():
     logger.debug(msg="Disabling all connections with S3")
-    # do something with S3
+    s3_service.close()
 
 
 @asynccontextmanager
@@ -69,7 +89,28 @@ async def lifespan(app: FastAPI):
     # Startup event
     print("Redis connection opened")
     init_db(next(get_db()))
+    reference_data_registry.load(next(get_db()))
     await redis_dependency.init()
+    try:
+        await local_cache_invalidator.start(await get_redis())
+    except Exception as e:
+        logger.error(f"Failed to start local cache invalidation: {e}")
+    try:
+        await cache_invalidation_bus.start(await get_redis())
+    except Exception as e:
+        logger.error(f"Failed to start cache invalidation: {e}")
+    try:
+        await token_blacklist_service.load(next(get_db()), await get_redis())
+    except Exception as e:
+        logger.error(f"Failed to load token blacklist: {e}")
+    try:
+        await websocket_manager.start()
+    except Exception as e:
+        logger.error(f"Failed to start websocket pubsub: {e}")
+    await suggest_service.start()
+    await job_facet_service.start()
+    # Always drained, entries may be left from before write-behind was disabled
+    await message_queue_service.start()
     yield
     # Shutdown event
     print("Redis connection closed")
@@ -19,8 +19,15 @@ from app.api.api_v1.endpoint.config import (
     field,
 )
 
-from app.api.api_v1.endpoint.user import user_auth, user, company, job, cv_applications
-from app.api.api_v1.endpoint.admin import admin_approval_request_job
+from app.api.api_v1.endpoint.user import (
+    user_auth,
+    user,
+    company,
+    job,
+    cv_applications,
+    suggest,
+)
+from app.api.api_v1.endpoint.admin import admin_approval_request_job, admin_cache
 from app.api.api_v1.endpoint.chat import websocket, chat, conversation, contact, message
 
 api_router = APIRouter(prefix="/api/v1")
@@ -39,6 +46,7 @@ api_router.include_router(skill.router, prefix="/skill", tags=["skill"])
 api_router.include_router(field.router, prefix="/field", tags=["field"])
 api_router.include_router(job.router, prefix="/job", tags=["job"])
 api_router.include_router(company.router, prefix="/company", tags=["company"])
+api_router.include_router(suggest.router, prefix="/suggest", tags=["suggest"])
 
 api_router.include_router(
     verify.router, prefix="/business/verify", tags=["business_verify"]
@@ -69,6 +77,9 @@ api_router.include_router(
     prefix="/admin/approval_request_job",
     tags=["admin_approval_request_job"],
 )
+api_router.include_router(
+    admin_cache.router, prefix="/admin/cache", tags=["admin_cache"]
+)
 
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from app.core.auth.user_manager_service import user_manager_service
+from app.common.response import CustomResponse
+from app.storage.local_cache import local_cache_invalidator
+
+router = APIRouter()
+
+
+@router.get("/stats", summary="Get in-process cache statistics.")
+async def get_cache_stats(
+    current_user=Depends(user_manager_service.get_current_superuser),
+):
+    """
+    Get in-process cache statistics.
+
+    This endpoint returns the size and hit/miss counters of every in-process
+    cache of the worker serving the request, including the verified token cache.
+
+    Returns:
+    - list: name, size, maxsize, hits and misses of each cache.
+    """
+    return CustomResponse(data=local_cache_invalidator.get_stats())
@@ -15,6 +15,9 @@ async def get_campaign(
     current_user=Depends(user_manager_service.get_current_business_admin_superuser),
     skip: int = Query(None, description="The number of users to skip.", example=0),
     limit: int = Query(None, description="The number of users to return.", example=10),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
     sort_by: SortBy = Query(
         None, description="The field to sort by.", example=SortBy.ID
     ),
@@ -35,6 +38,7 @@ async def get_campaign(
     Parameters:
     - skip (int): The number of users to skip.
     - limit (int): The number of users to return.
+    - cursor (str): The cursor of the next page.
     - sort_by (str): The field to sort by.
     - order_by (str): The order to sort by.
     - business_id (int): The business id.
@@ -19,6 +19,9 @@ async def get_cv_applications(
     current_user=Depends(user_manager_service.get_current_business),
     skip: int = Query(None, description="The number of cv to skip.", example=0),
     limit: int = Query(None, description="The number of cv to return.", example=10),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
     sort_by: SortBy = Query(
         None, description="The field to sort by.", example=SortBy.CREATED_AT
     ),
@@ -39,6 +42,7 @@ async def get_cv_applications(
     Parameters:
     - skip (int): The number of cv to skip.
     - limit (int): The number of cv to return.
+    - cursor (str): The cursor of the next page.
     - sort_by (str): The field to sort by.
     - order_by (str): The order to sort by.
     - status (str): The status of cv application.
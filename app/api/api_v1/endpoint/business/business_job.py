@@ -82,6 +82,9 @@ async def search_job(
     current_user=Depends(user_manager_service.get_current_business_admin_superuser),
     skip: int = Query(None, description="The number of users to skip.", example=0),
     limit: int = Query(None, description="The number of users to return.", example=100),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
     sort_by: SortJobBy = Query(
         None, description="The field to sort by.", example=SortJobBy.ID
     ),
@@ -117,6 +120,7 @@ async def search_job(
     Parameters:
     - skip (int): The number of users to skip.
     - limit (int): The number of users to return.
+    - cursor (str): The cursor of the next page.
     - sort_by (str): The field to sort by.
     - order_by (str): The order to sort by.
     - company_id (int): The company id.
@@ -23,6 +23,9 @@ async def get_conversation(
     limit: int = Query(
         None, description="The number of conversation to return.", example=100
     ),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
 ):
     """
     Get list of messages.
@@ -32,6 +35,7 @@ async def get_conversation(
     Parameters:
     - skip (int): The number of messages to skip.
     - limit (int): The number of messages to return.
+    - cursor (str): The cursor of the next page.
 
     Returns:
     - status_code (200): The list of messages has been found successfully.
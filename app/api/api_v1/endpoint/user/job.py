@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, Query, Path
 from redis.asyncio import Redis
 from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_db
+from app.db.base import get_db, get_async_db
 from app.storage.redis import get_redis
 from app.core.job.job_service import job_service
 from app.hepler.enum import OrderType, SortJobBy, JobType, SalaryType
@@ -14,9 +15,13 @@ router = APIRouter()
 @router.get("/search", summary="Search list of job.")
 async def search_job(
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
     redis: Redis = Depends(get_redis),
     skip: int = Query(None, description="The number of users to skip.", example=0),
     limit: int = Query(None, description="The number of users to return.", example=100),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
     sort_by: SortJobBy = Query(
         None, description="The field to sort by.", example=SortJobBy.ID
     ),
@@ -50,6 +55,7 @@ async def search_job(
     Parameters:
     - skip (int): The number of users to skip.
     - limit (int): The number of users to return.
+    - cursor (str): The cursor of the next page.
     - sort_by (str): The field to sort by.
     - order_by (str): The order to sort by.
     - company_id (int): The company id.
@@ -74,15 +80,19 @@ async def search_job(
     """
     args = locals()
 
-    return await job_service.search_by_user(db, redis, {**args})
+    return await job_service.search_by_user(db, async_db, redis, {**args})
 
 
 @router.get("", summary="Get list of job.")
 async def get_job(
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
     redis: Redis = Depends(get_redis),
     skip: int = Query(None, description="The number of users to skip.", example=0),
     limit: int = Query(None, description="The number of users to return.", example=100),
+    cursor: str = Query(
+        None, description="The cursor of the next page, used instead of skip."
+    ),
     sort_by: SortJobBy = Query(
         None, description="The field to sort by.", example=SortJobBy.ID
     ),
@@ -100,6 +110,7 @@ async def get_job(
     Parameters:
     - skip (int): The number of users to skip.
     - limit (int): The number of users to return.
+    - cursor (str): The cursor of the next page.
     - sort_by (str): The field to sort by.
     - order_by (str): The order to sort by.
     - company_id (int): The company id.
@@ -113,7 +124,7 @@ async def get_job(
     """
     args = locals()
 
-    return await job_service.get_by_user(db, redis, {**args})
+    return await job_service.get_by_user(db, async_db, redis, {**args})
 
 
 @router.get("/count_job_by_category", summary="Count job by category.")
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Query, Depends
+from redis.asyncio import Redis
+
+from app.storage.redis import get_redis
+from app.core.suggest.suggest_service import suggest_service
+from app.hepler.enum import SuggestType
+
+router = APIRouter()
+
+
+@router.get("", summary="Suggest companies, jobs, skills and positions.")
+async def suggest(
+    redis: Redis = Depends(get_redis),
+    keyword: str = Query(..., description="The keyword.", example="ke toan"),
+    type: SuggestType = Query(
+        None, description="Only suggest this type.", example=SuggestType.JOB
+    ),
+    limit: int = Query(
+        None, description="The number of suggestions per type.", example=5
+    ),
+):
+    """
+    Suggest companies, jobs, skills and positions.
+
+    This endpoint allows autocompleting a keyword typed with or without
+    Vietnamese diacritics.
+
+    Parameters:
+    - keyword (str): The keyword.
+    - type (str): Only suggest this type.
+    - limit (int): The number of suggestions per type.
+
+    Returns:
+    - status_code (200): The suggestions have been found successfully.
+    - status_code (400): The request is invalid.
+
+    """
+    args = locals()
+
+    return await suggest_service.suggest(redis, args)
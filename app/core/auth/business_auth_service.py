@@ -3,9 +3,10 @@ from datetime import datetime, timezone
 from fastapi import Request
 from fastapi import BackgroundTasks
 
-from app.crud import manager as managerCRUD, blacklist as blacklistCRUD
+from app.crud import manager as managerCRUD
 from app.schema.auth import AuthLogin, AuthChangePassword, AuthForgotPassword
 from app.core.auth.jwt.auth_handler import token_manager
+from app.core.auth.token_blacklist_service import token_blacklist_service
 from app.core.business.business_helper import business_helper
 from app.core.admin.admin_helper import admin_helper
 from app.common.exception import CustomException
@@ -64,8 +65,7 @@ class BusinessService:
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Token expired"
             )
 
-        check_blacklist = blacklistCRUD.get_by_token(db, token)
-        if check_blacklist:
+        if await token_blacklist_service.is_revoked(db, token):
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
             )
@@ -105,7 +105,7 @@ class BusinessService:
 
     async def logout(self, db: Session, request: Request):
         token = request.headers.get("Authorization").split(" ")[1]
-        blacklistCRUD.create(db=db, token=token)
+        await token_blacklist_service.revoke(db, token)
 
         return CustomResponse(msg="Logout successfully")
 
@@ -37,7 +37,7 @@ class JWTBearer(HTTPBearer):
 
     def verify_jwt(self, jwtoken: str) -> bool:
         try:
-            payload = token_manager.decodeJWT(jwtoken)
+            payload = token_manager.verifyJWT(jwtoken)
         except:
             payload = None
         return payload
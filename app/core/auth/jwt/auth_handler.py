@@ -1,4 +1,6 @@
+import hashlib
 import jwt
+import time
 from datetime import timedelta
 from pydantic import BaseModel
 from typing import Union, Dict, Any
@@ -9,6 +11,7 @@ from app.core.config import settings
 from app.db.base_class import Base
 from app.hepler.common import CommonHelper
 from app.model import Account
+from app.storage.local_cache import LocalCache, local_cache_invalidator
 
 
 class TokenManager:
@@ -16,14 +19,23 @@ class TokenManager:
         self,
         *,
         secret_key: str = settings.TOKENS_SECRET_KEY,
+        private_key: str = settings.TOKENS_PRIVATE_KEY,
+        public_key: str = settings.TOKENS_PUBLIC_KEY,
         algorithm: str = settings.SECURITY_ALGORITHM,
         access_token_expire: str = settings.ACCESS_TOKEN_EXPIRE,
         refresh_token_expire: str = settings.REFRESH_TOKEN_EXPIRE
     ) -> None:
         self.secret_key = secret_key
+        # Asymmetric algorithms sign with the private key and verify with the
+        # public key, so other services can verify tokens without the secret
+        self.signing_key = private_key or secret_key
+        self.verifying_key = public_key or secret_key
         self.algorithm = algorithm
         self.access_token_expire = access_token_expire
         self.refresh_token_expire = refresh_token_expire
+        self.verified = local_cache_invalidator.register(
+            LocalCache("verified_token_", maxsize=settings.VERIFIED_TOKEN_CACHE_SIZE)
+        )
 
     def signJWT(
         self,
@@ -44,7 +56,9 @@ class TokenManager:
             payload = payload
         payload.update({"iat": iat, "exp": exp, "type": token_type.value})
         data = TokenPayload(**payload)
-        token = jwt.encode(data.model_dump(), self.secret_key, algorithm=self.algorithm)
+        token = jwt.encode(
+            data.model_dump(), self.signing_key, algorithm=self.algorithm
+        )
         return token
 
     def signJWTRefreshToken(
@@ -65,12 +79,30 @@ class TokenManager:
     def decodeJWT(self, token: str):
         try:
             decode_token = jwt.decode(
-                token, self.secret_key, algorithms=[self.algorithm]
+                token, self.verifying_key, algorithms=[self.algorithm]
             )
             return decode_token
         except:
             return {}
 
+    def verifyJWT(self, token: str):
+        """decodeJWT remembering verified tokens until they expire, so a
+        repeated token skips the signature check"""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        payload = self.verified.get(key)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                return dict(payload)
+            self.verified.delete(key)
+
+        payload = self.decodeJWT(token)
+        if payload:
+            expire = int(payload["exp"] - time.time())
+            if expire > 0:
+                self.verified.set(key, payload, expire)
+            return dict(payload)
+        return payload
+
     def create_payload(self, account: Account):
         return {
             "id": account.id,
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from redis.asyncio import Redis
+from sqlalchemy.orm import Session
+from typing import Optional, Set
+
+from app.crud import blacklist as blacklistCRUD
+from app.core.config import settings
+from app.core.auth.jwt.auth_handler import token_manager
+from app.hepler.bloom_filter import BloomFilter
+from app.hepler.common import CommonHelper
+from app.db.base import SessionLocal
+from app.storage.redis import get_redis
+from app.storage.cache_invalidation import cache_invalidation_bus
+from app.storage.cache.token_cache_service import token_cache_service
+from app.core.loggers import logger
+
+
+class TokenBlacklistService:
+    """Revoked tokens are kept in Redis until they expire.
+
+    Each worker mirrors them in a bloom filter, loaded on startup and kept
+    current through the cache invalidation bus, so a token that was never
+    revoked is accepted without a round trip. Pub/sub may drop a revocation,
+    so the filter is only trusted while the bus is subscribed and is reloaded
+    periodically and whenever the bus reconnects. Each reload first copies
+    recent revocations from MySQL, so one whose Redis write failed reaches
+    Redis too. MySQL stays the durable record and the fallback when Redis is
+    down or disagrees with the filter.
+    """
+
+    def __init__(self, reload_interval: int = 60 * 5):
+        self.topic = "token_revoked"
+        self.bloom = BloomFilter()
+        self.ready = False
+        self.reload_interval = reload_interval
+        # Hashes received while a reload scans Redis, kept in the new filter
+        self.added_while_reloading: Optional[Set[str]] = None
+        self.synced_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def get_hash(self, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get_remaining(self, token: str) -> int:
+        payload = token_manager.decodeJWT(token)
+        if not payload:
+            return 0
+        return int(payload["exp"] - CommonHelper.utc_now().timestamp())
+
+    async def revoke(self, db: Session, token: str) -> None:
+        blacklistCRUD.create(db=db, token=token)
+        token_hash = self.get_hash(token)
+        self.add(token_hash)
+        try:
+            redis = await get_redis()
+            await token_cache_service.revoke(
+                redis, token_hash, self.get_remaining(token)
+            )
+            await cache_invalidation_bus.publish(redis, self.topic, [token_hash])
+        except Exception as e:
+            logger.error(f"Failed to revoke token in Redis: {e}")
+
+    async def is_revoked(self, db: Session, token: str) -> bool:
+        token_hash = self.get_hash(token)
+        in_bloom = token_hash in self.bloom
+        if self.ready and cache_invalidation_bus.connected and not in_bloom:
+            return False
+        try:
+            redis = await get_redis()
+            if await token_cache_service.is_revoked(redis, token_hash):
+                return True
+            # Known revoked here but missing in Redis, its Redis write may have failed
+            if not in_bloom:
+                return False
+        except Exception as e:
+            logger.error(f"Failed to check revoked token in Redis: {e}")
+        return blacklistCRUD.get_by_token(db, token) is not None
+
+    def add(self, token_hash: str) -> None:
+        self.bloom.add(token_hash)
+        if self.added_while_reloading is not None:
+            self.added_while_reloading.add(token_hash)
+
+    async def add_to_bloom(self, redis: Redis, token_hashes: list) -> None:
+        for token_hash in token_hashes:
+            self.add(token_hash)
+
+    async def reload(self, redis: Redis) -> None:
+        """Rebuild the bloom filter from Redis and swap it in"""
+        self.added_while_reloading = set()
+        try:
+            revoked = await token_cache_service.get_revoked(redis)
+            bloom = BloomFilter()
+            for token_hash in [*revoked, *self.added_while_reloading]:
+                bloom.add(token_hash)
+            self.bloom = bloom
+        finally:
+            self.added_while_reloading = None
+        self.ready = True
+        logger.info(f"Token blacklist loaded with {len(revoked)} revoked tokens")
+
+    def get_oldest_valid(self) -> datetime:
+        """Creation time of the oldest token that may still be valid"""
+        return CommonHelper.utc_now() - timedelta(
+            seconds=max(settings.ACCESS_TOKEN_EXPIRE, settings.REFRESH_TOKEN_EXPIRE)
+        )
+
+    async def copy(self, db: Session, redis: Redis, since: datetime) -> None:
+        """Copy tokens revoked in MySQL since Since to Redis"""
+        tokens = await asyncio.to_thread(blacklistCRUD.get_created_since, db, since)
+        for token in tokens:
+            await token_cache_service.revoke(
+                redis, self.get_hash(token), self.get_remaining(token)
+            )
+
+    async def sync(self, redis: Redis, since: datetime = None) -> None:
+        """Copy revocations whose Redis write may have failed from MySQL, then
+        reload the bloom filter"""
+        started_at = CommonHelper.utc_now()
+        with SessionLocal() as db:
+            await self.copy(db, redis, since or self.get_oldest_valid())
+        await self.reload(redis)
+        self.synced_at = started_at
+
+    async def load(self, db: Session, redis: Redis) -> None:
+        """Copy tokens revoked in MySQL that may still be valid to Redis, then
+        fill the bloom filter from Redis and keep it in sync"""
+        started_at = CommonHelper.utc_now()
+        await self.copy(db, redis, self.get_oldest_valid())
+        await self.reload(redis)
+        self.synced_at = started_at
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                # Overlap the previous sync for revocations committed late
+                await self.sync(
+                    await get_redis(),
+                    self.synced_at - timedelta(seconds=self.reload_interval),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to reload token blacklist: {e}")
+
+    def stop(self) -> None:
+        self.ready = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+
+token_blacklist_service = TokenBlacklistService()
+cache_invalidation_bus.register(
+    token_blacklist_service.topic, token_blacklist_service.add_to_bloom
+)
+cache_invalidation_bus.on_reconnect(token_blacklist_service.sync)
@@ -8,7 +8,6 @@ from app.core import constant
 from app.crud import (
     user as userCRUD,
     social_network as social_networkCRUD,
-    blacklist as blacklistCRUD,
     account as accountCRUD,
 )
 from app.schema.auth import AuthLogin, AuthChangePassword
@@ -18,6 +17,7 @@ from app.schema.social_network import (
     SocialNetworkCreate,
 )
 from app.core.auth.jwt.auth_handler import token_manager
+from app.core.auth.token_blacklist_service import token_blacklist_service
 from app.hepler.enum import Provider
 from app.model import User, Account
 from app.common.exception import CustomException
@@ -145,8 +145,7 @@ class UserAuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Token expired"
             )
 
-        check_blacklist = blacklistCRUD.get_by_token(db, token)
-        if check_blacklist:
+        if await token_blacklist_service.is_revoked(db, token):
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
             )
@@ -178,7 +177,7 @@ class UserAuthService:
 
     async def logout(self, db: Session, request: Request):
         token = request.headers.get("Authorization").split(" ")[1]
-        blacklistCRUD.create(db=db, token=token)
+        await token_blacklist_service.revoke(db, token)
 
         return CustomResponse(msg="Logout successfully")
 
@@ -1,144 +1,197 @@
 from fastapi import Depends, status, Query
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.db.base import get_db
 from app.core.auth.jwt.auth_bearer import JWTBearer
-from app.crud import (
-    user as userCRUD,
-    social_network as social_networkCRUD,
-    blacklist as blacklistCRUD,
-    manager as managerCRUD,
-    account as accountCRUD,
-)
+from app.crud import account as accountCRUD
 from app.hepler.enum import Role, TypeAccount
 from app.common.exception import CustomException
-from app.model import Manager, Account, Business, User, Blacklist
+from app.model import Manager, Account, Business, User
 from app.core.auth.jwt.auth_handler import token_manager
+from app.core.auth.token_blacklist_service import token_blacklist_service
+from app.storage.redis import get_redis
+from app.storage.cache.token_cache_service import token_cache_service
 
 
 class UserManagerService:
-    def get_current_user(
-        self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
-    ) -> Account:
+    """Authenticates requests from a cached identity projection.
+
+    The projection holds the account columns and the flags the checks below
+    need, so the common path costs no database round trip. Handlers get an
+    Account attached to their session whose relationships load on access.
+    """
+
+    async def get_identity(self, db: Session, account_id: int) -> Optional[dict]:
+        redis = None
+        try:
+            redis = await get_redis()
+            identity = await token_cache_service.get_identity(redis, account_id)
+            if identity:
+                return identity
+        except Exception as e:
+            print(e)
+
+        account = accountCRUD.get(db, account_id)
+        if account is None:
+            return None
+        user: User = account.user
+        manager: Manager = account.manager
+        business: Business = manager.business if manager else None
+        identity = {
+            "account": {
+                "id": account.id,
+                "full_name": account.full_name,
+                "is_active": account.is_active,
+                "avatar": account.avatar,
+                "role": account.role,
+                "type_account": account.type_account,
+            },
+            "user": user is not None,
+            "social_network": bool(user and user.social_network),
+            "manager": manager is not None,
+            "is_verified": bool(user and user.is_verified),
+            "is_verified_email": bool(business and business.is_verified_email),
+        }
+        if redis:
+            try:
+                await token_cache_service.set_identity(redis, account_id, identity)
+            except Exception as e:
+                print(e)
+        return identity
+
+    def get_account(self, db: Session, identity: dict) -> Account:
+        """Attach the projected account to the session without a query"""
+        data = identity["account"]
+        account = Account(
+            **{
+                **data,
+                "role": Role(data["role"]),
+                "type_account": TypeAccount(data["type_account"]),
+            }
+        )
+        make_transient_to_detached(account)
+        return db.merge(account, load=False)
+
+    async def authenticate(self, db: Session, data: dict) -> Optional[dict]:
+        if await token_blacklist_service.is_revoked(db, data["token"]):
+            raise CustomException(
+                status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
+            )
+        return await self.get_identity(db, data["payload"]["id"])
+
+    async def get_current_user_identity(
+        self, db: Session, data: dict
+    ) -> Tuple[Account, dict]:
         token_decode = data["payload"]
         if token_decode["type_account"] != TypeAccount.NORMAL:
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Unauthorized"
             )
 
-        token = data["token"]
-        if self.check_blacklist(db, token):
+        identity = await self.authenticate(db, data)
+        if token_decode["role"] == Role.USER:
+            found = identity and identity["user"]
+        elif token_decode["role"] == Role.SOCIAL_NETWORK:
+            found = identity and identity["social_network"]
+        else:
+            return None, identity
+        if not found:
             raise CustomException(
-                status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
+                status_code=status.HTTP_404_NOT_FOUND, msg="User not found"
             )
+        return self.get_account(db, identity), identity
 
-        id = token_decode["id"]
-        if token_decode["role"] == Role.USER:
-            user: User = userCRUD.get(db, id)
-            if user is None:
-                raise CustomException(
-                    status_code=status.HTTP_404_NOT_FOUND, msg="User not found"
-                )
-
-            return user.account
-        elif token_decode["role"] == Role.SOCIAL_NETWORK:
-            social_network = social_networkCRUD.get(db, id)
-            if social_network is None:
-                raise CustomException(
-                    status_code=status.HTTP_404_NOT_FOUND, msg="User not found"
-                )
-            user: User = social_network.user
-            return user.account
+    async def get_current_user(
+        self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
+    ) -> Account:
+        account, _ = await self.get_current_user_identity(db, data)
+        return account
 
-    def get_current_user_verify(
+    async def get_current_user_verify(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ) -> Account:
-        account = self.get_current_user(data, db)
-        user: User = account.user
-        if not user.is_verified:
+        account, identity = await self.get_current_user_identity(db, data)
+        if not identity["is_verified"]:
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="User not verified"
             )
         return account
 
-    def get_current_user_or_business_verify(
+    async def get_current_user_or_business_verify(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ):
         token_decode = data["payload"]
         if token_decode["type_account"] == TypeAccount.NORMAL:
-            account = self.get_current_user(data, db)
-            user: User = account.user
-            if not user.is_verified:
-                raise CustomException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, msg="User not verified"
-                )
-            return account
+            return await self.get_current_user_verify(data, db)
         elif token_decode["type_account"] == TypeAccount.BUSINESS:
-            account = self.get_current_business(data, db)
-            manager: Manager = account.manager
-            business: Business = manager.business
-            if not business.is_verified_email:
+            account, identity = await self.get_current_business_identity(
+                db, data, [Role.BUSINESS]
+            )
+            if not identity["is_verified_email"]:
                 raise CustomException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     msg="Business not verified",
                 )
             return account
 
-    def get_current_business_by_role(self, db, data: dict, allowed_roles: List[Role]):
+    async def get_current_business_identity(
+        self, db: Session, data: dict, allowed_roles: List[Role]
+    ) -> Tuple[Account, dict]:
         token_decode = data["payload"]
         if token_decode["type_account"] != TypeAccount.BUSINESS:
             raise CustomException(
                 status_code=status.HTTP_403_FORBIDDEN, msg="Not permission"
             )
 
-        token = data["token"]
-        if self.check_blacklist(db, token):
-            raise CustomException(
-                status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
-            )
-
-        id = token_decode["id"]
+        identity = await self.authenticate(db, data)
         role = token_decode["role"]
         if role not in allowed_roles:
             raise CustomException(
                 status_code=status.HTTP_403_FORBIDDEN, msg="Permission denied"
             )
-        manager = managerCRUD.get(db, id)
-        if manager is None:
+        if not identity or not identity["manager"]:
             raise CustomException(
                 status_code=status.HTTP_404_NOT_FOUND, msg="User not found"
             )
-        return manager.account
+        return self.get_account(db, identity), identity
+
+    async def get_current_business_by_role(
+        self, db, data: dict, allowed_roles: List[Role]
+    ):
+        account, _ = await self.get_current_business_identity(db, data, allowed_roles)
+        return account
 
-    def get_current_business_admin(
+    async def get_current_business_admin(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ):
-        return self.get_current_business_by_role(db, data, [Role.BUSINESS, Role.ADMIN])
+        return await self.get_current_business_by_role(
+            db, data, [Role.BUSINESS, Role.ADMIN]
+        )
 
-    def get_current_business_admin_superuser(
+    async def get_current_business_admin_superuser(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ):
-        return self.get_current_business_by_role(
+        return await self.get_current_business_by_role(
             db, data, [Role.BUSINESS, Role.ADMIN, Role.SUPER_USER]
         )
 
-    def get_current_business(
+    async def get_current_business(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ) -> Account:
-        return self.get_current_business_by_role(db, data, [Role.BUSINESS])
+        return await self.get_current_business_by_role(db, data, [Role.BUSINESS])
 
-    def get_current_admin(
+    async def get_current_admin(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ) -> Account:
-        return self.get_current_business_by_role(
+        return await self.get_current_business_by_role(
             db, data, [Role.ADMIN, Role.SUPER_USER]
         )
 
-    def get_current_superuser(
+    async def get_current_superuser(
         self, data: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
     ) -> Account:
-        return self.get_current_business_by_role(db, data, [Role.SUPER_USER])
+        return await self.get_current_business_by_role(db, data, [Role.SUPER_USER])
 
     def check_permission_business(
         db: Session,
@@ -166,32 +219,27 @@ class UserManagerService:
 
         return Role.ADMIN
 
-    def check_blacklist(self, db: Session, token: str) -> Blacklist:
-        return blacklistCRUD.get_by_token(db, token)
-
     async def get_current_account_verify_websocket(
         self,
         token: str = Query(...),
         db: Session = Depends(get_db),
     ) -> Account:
-        payload = token_manager.decodeJWT(token)
-        if not payload or self.check_blacklist(db, token):
+        payload = token_manager.verifyJWT(token)
+        if not payload:
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Token revoked"
             )
-        id = payload["id"]
-        account = accountCRUD.get(db, id)
-        if not account:
+        identity = await self.authenticate(db, {"token": token, "payload": payload})
+        if not identity:
             raise CustomException(
                 status_code=status.HTTP_401_UNAUTHORIZED, msg="Account not found"
             )
-        if account.role in [Role.USER, Role.SOCIAL_NETWORK]:
-            user: User = account.user
-            if not user.is_verified:
+        if identity["account"]["role"] in [Role.USER, Role.SOCIAL_NETWORK]:
+            if not identity["is_verified"]:
                 raise CustomException(
                     status_code=status.HTTP_401_UNAUTHORIZED, msg="User not verified"
                 )
-        return account
+        return self.get_account(db, identity)
 
 
 user_manager_service = UserManagerService()
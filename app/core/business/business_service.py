@@ -90,7 +90,7 @@ class BusinessService:
         avatar = business_data.avatar
         if avatar:
             key = avatar.filename
-            s3_service.upload_file(avatar, key)
+            await s3_service.async_upload_file(avatar, key)
             business_data.avatar = key
 
         account = accountCRUD.create(
@@ -128,7 +128,7 @@ class BusinessService:
         avatar = business_data.avatar
         if avatar:
             key = avatar.filename
-            s3_service.upload_file(avatar, key)
+            await s3_service.async_upload_file(avatar, key)
             business_data.avatar = key
 
         account = accountCRUD.update(
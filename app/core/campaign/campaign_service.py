@@ -12,6 +12,7 @@ from app.hepler.enum import Role, FilterCampaign
 from app.model import Manager, Account, Business, Company
 from app.core.campaign.campaign_helper import campaign_helper
 from app.common.exception import CustomException
+from app.hepler.cursor import CursorHelper
 from app.common.response import CustomResponse
 from fastapi import status
 
@@ -80,7 +81,15 @@ class CampaignService:
             campaign_helper.get_info(db, campaign) for campaign in campaigns
         ]
 
-        return CustomResponse(data={"count": count, "campaigns": campaigns_response})
+        return CustomResponse(
+            data={
+                "count": count,
+                "campaigns": campaigns_response,
+                "next_cursor": CursorHelper.next_cursor(
+                    campaigns, page.sort_by, page.limit
+                ),
+            }
+        )
 
     async def get_list(self, db: Session, data: dict):
         page = CampaignGetListPagination(**data)
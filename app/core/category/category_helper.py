@@ -8,6 +8,8 @@ from app.schema.category import (
 from app.model import Category
 from fastapi import status
 from app.common.exception import CustomException
+from app.storage.cache.config_cache_service import config_cache_service
+from app.core.reference_data.reference_data_registry import reference_data_registry
 
 
 class CategoryHelper:
@@ -16,12 +18,12 @@ class CategoryHelper:
         db: Session,
         id: int,
     ) -> int:
-        category = categoryCRUD.get(db, id)
+        category = self.get_info_by_id(db, id)
         if not category:
             raise CustomException(
                 status_code=status.HTTP_404_NOT_FOUND, msg="Category not found"
             )
-        return int
+        return id
 
     def check_list_valid(
         self,
@@ -31,14 +33,24 @@ class CategoryHelper:
         if not ids or ids is None:
             return []
 
-        return [self.check_valid(db, id) for id in ids]
+        reference_data_registry.check_ids(db, "category", ids)
+        return ids
 
     def get_info(self, category: Category) -> CategoryItemResponse:
         return CategoryItemResponse(**category.__dict__)
 
     def get_info_by_id(self, db: Session, id: int) -> CategoryItemResponse:
+        response = config_cache_service.get_local_category(id)
+        if response:
+            return response
+
         category = categoryCRUD.get(db, id)
-        return self.get_info(category)
+        if not category:
+            return None
+
+        response = self.get_info(category)
+        config_cache_service.set_local_category(id, response)
+        return response
 
     def get_list_info(self, categories: List[Category]) -> List:
         return [self.get_info(category) for category in categories]
@@ -51,14 +63,20 @@ class CategoryHelper:
         db: Session,
         job_id: int,
         ids: List[int],
+        commit: bool = True,
     ) -> None:
         ids = list(set(ids))
-        for category_id in ids:
-            job_category_data = {
-                "job_id": job_id,
-                "category_id": category_id,
-            }
-            job_categoryCRUD.create(db, obj_in=job_category_data)
+        job_categoryCRUD.create_many(
+            db,
+            objs_in=[
+                {
+                    "job_id": job_id,
+                    "category_id": category_id,
+                }
+                for category_id in ids
+            ],
+            commit=commit,
+        )
 
     def update_with_job_id(
         self,
@@ -59,6 +59,11 @@ class CategoryService:
         category = categoryCRUD.create(db, obj_in=category_data)
         response = category_helper.get_info(category)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(status_code=status.HTTP_201_CREATED, data=response)
 
     async def update(self, db: Session, category_id: int, data: dict):
@@ -72,6 +77,11 @@ class CategoryService:
 
         response = categoryCRUD.update(db, db_obj=category, obj_in=category_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def delete(self, db: Session, category_id: int):
@@ -83,6 +93,11 @@ class CategoryService:
 
         response = categoryCRUD.remove(db, id=category_id)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
 
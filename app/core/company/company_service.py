@@ -9,7 +9,8 @@ from app.schema.company import (
     CompanyPagination,
 )
 from app.schema.page import Pagination
-from app.hepler.enum import Role
+from app.hepler.enum import Role, SuggestType
+from app.core.suggest.suggest_service import suggest_service
 from app.storage.s3 import s3_service
 from app.core.auth.business_auth_helper import business_auth_helper
 from app.core.field.field_helper import field_helper
@@ -105,7 +106,7 @@ class CompanyService:
         logo = company_data.logo
         if logo:
             key = logo.filename
-            s3_service.upload_file(logo, key)
+            await s3_service.async_upload_file(logo, key)
             company_data.logo = key
 
         if current_user.role == Role.BUSINESS:
@@ -119,6 +120,13 @@ class CompanyService:
             field_helper.create_with_company_id(db, company.id, fields)
         response = company_helper.get_private_info(db, company)
 
+        try:
+            await suggest_service.index(
+                SuggestType.COMPANY, [(company.id, company.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(status_code=status.HTTP_201_CREATED, data=response)
 
     async def update(self, db: Session, data: dict, current_user: Account):
@@ -142,7 +150,7 @@ class CompanyService:
             field_helper.check_list_valid(db, new_fields)
         if logo:
             key = logo.filename
-            s3_service.upload_file(logo, key)
+            await s3_service.async_upload_file(logo, key)
             company_data.logo = key
 
         obj_in = CompanyUpdate(**company_data.model_dump())
@@ -151,6 +159,13 @@ class CompanyService:
 
         response = company_helper.get_private_info(db, company)
 
+        try:
+            await suggest_service.index(
+                SuggestType.COMPANY, [(company.id, company.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def delete(self, db: Session, company_id: int, current_user: Account):
@@ -170,6 +185,11 @@ class CompanyService:
 
         response = companyCRUD.remove(db, id=company_id)
 
+        try:
+            await suggest_service.remove(SuggestType.COMPANY, [company_id])
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
 
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 from pydantic import Field
 import logging
 
@@ -40,6 +40,10 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE: int = Field(default=86400)
     SECURITY_ALGORITHM: str = Field(default="HS256")
     TOKENS_SECRET_KEY: str = Field(default="secret")
+    # PEM keys for asymmetric algorithms (RS256, ES256...), verifiers only need the public key
+    TOKENS_PRIVATE_KEY: Optional[str] = Field(default=None)
+    TOKENS_PUBLIC_KEY: Optional[str] = Field(default=None)
+    VERIFIED_TOKEN_CACHE_SIZE: int = Field(default=10000)
     # Logging information
     LOG_LEVEL: int = Field(logging.WARNING)
     LOG_FORMAT_EXTENDED: bool = Field(default=False)
@@ -72,6 +76,9 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str
     AWS_DEFAULT_REGION: str
     AWS_BUCKET_NAME: str
+    AWS_S3_ENDPOINT_URL: Optional[str] = Field(default=None)
+    S3_UPLOAD_WORKERS: int = Field(default=8)
+    S3_MULTIPART_THRESHOLD: int = Field(default=8 * 1024 * 1024)
     # Redis information
     REDIS_HOST: str = Field(default="localhost")
     REDIS_PORT: int = Field(default=6379)
@@ -79,6 +86,8 @@ class Settings(BaseSettings):
     REDIS_DB: int = Field(default=0)
     REDIS_EXPIRE: int = Field(default=3600)
     REDIS_MAX_CONNECTIONS: int = Field(default=10)
+    # Broadcast chat messages before they are stored, see MessageQueueService
+    MESSAGE_WRITE_BEHIND: bool = Field(default=False)
     # Logging information
     LOG_LEVEL: int = Field(default=10)
 
@@ -19,5 +19,10 @@ ALLOWED_CV_TYPES = [
 ]
 MAX_IMAGE_SIZE = 2 * 1024 * 1024
 MAX_CV_SIZE = 5 * 1024 * 1024
+JOB_COUNT_CAP = 1000
+JOB_SEARCH_IDS_SIZE = 200
+# (min, max) in millions of VND, max 999 means no upper bound
+JOB_SALARY_RANGES = [(0, 3), (3, 10), (10, 20), (20, 30), (30, 999)]
+MESSAGE_RECENT_SIZE = 50
 BUCKET_URL = "https://tvnow-bucket.s3.amazonaws.com/"
 GOOGLE_GET_USER_INFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo?access_token="
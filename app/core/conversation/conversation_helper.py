@@ -1,5 +1,7 @@
+from collections import defaultdict
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List, Union
+from typing import Dict, List, Optional, Tuple, Union
 from fastapi import status
 from redis.asyncio import Redis
 
@@ -18,15 +20,18 @@ from app.crud import (
     account as accountCRUD,
     contact as contactCRUD,
     message as messageCRUD,
+    company as companyCRUD,
 )
 from app.schema.conversation import (
     ConversationCreate,
+    ConversationInboxPagination,
     ConversationResponse,
 )
 from app.schema.company import CompanyItemGeneralResponse
 from app.schema.account import AccountBasicResponse
 from app.schema.conversation_member import ConversationMemberCreate
 from app.schema.message import MessageBasicResponse
+from app.hepler.cursor import CursorHelper
 from app.common.exception import CustomException
 from app.core.user.user_helper import user_helper
 from app.core.business.business_helper import business_helper
@@ -97,6 +102,101 @@ class ConversationHelper:
             ),
         )
 
+    def get_list_conversation_response(
+        self,
+        db: Session,
+        conversations: List[Conversation],
+        current_user: Account,
+        limit: int = 5,
+    ) -> List[ConversationResponse]:
+        """Render a page of conversations with a constant number of queries:
+        members with their accounts, last messages, their senders and the
+        companies of business accounts are each loaded for the whole page"""
+        members: Dict[int, List[ConversationMember]] = defaultdict(list)
+        for conversation_member in conversation_memberCRUD.get_by_conversation_ids(
+            db, [conversation.id for conversation in conversations], limit
+        ):
+            members[conversation_member.conversation_id].append(conversation_member)
+
+        messages: List[Message] = messageCRUD.get_multi_by_ids(
+            db,
+            [
+                conversation.last_message_id
+                for conversation in conversations
+                if conversation.last_message_id
+            ],
+        )
+        senders: Dict[tuple, ConversationMember] = {
+            (sender.account_id, sender.conversation_id): sender
+            for sender in conversation_memberCRUD.get_by_account_and_conversation_ids(
+                db,
+                list(
+                    {
+                        (message.account_id, message.conversation_id)
+                        for message in messages
+                    }
+                ),
+            )
+        }
+
+        business_ids = {
+            conversation_member.account_id
+            for conversation_member in [
+                *[item for items in members.values() for item in items],
+                *senders.values(),
+            ]
+            if conversation_member.account.role == Role.BUSINESS
+        }
+        companies: Dict[int, Company] = (
+            {
+                company.business_id: company
+                for company in companyCRUD.get_by_business_ids(db, list(business_ids))
+            }
+            if business_ids
+            else {}
+        )
+
+        def get_member(conversation_member: ConversationMember) -> AccountBasicResponse:
+            account: Account = conversation_member.account
+            return AccountBasicResponse(
+                **account.__dict__,
+                nickname=conversation_member.nickname,
+                company=company_helper.get_info_general(companies.get(account.id)),
+            )
+
+        last_messages: Dict[int, MessageBasicResponse] = {}
+        for message in messages:
+            sender = senders.get((message.account_id, message.conversation_id))
+            last_messages[message.conversation_id] = MessageBasicResponse(
+                **message.__dict__,
+                user=(
+                    get_member(sender)
+                    if sender
+                    else self.get_user_basic_response(db, message.account)
+                ),
+            )
+
+        response = []
+        for conversation in conversations:
+            conversation_members = members[conversation.id]
+            if conversation.type == ConversationType.PRIVATE:
+                conversation_members = [
+                    conversation_member
+                    for conversation_member in conversation_members
+                    if conversation_member.account_id != current_user.id
+                ]
+            response.append(
+                ConversationResponse(
+                    **conversation.__dict__,
+                    members=[
+                        get_member(conversation_member)
+                        for conversation_member in conversation_members
+                    ],
+                    last_message=last_messages.get(conversation.id),
+                )
+            )
+        return response
+
     def filter_member(self, members: List[int], current_user: Account) -> List[int]:
         members = [member for member in members if member != current_user.id]
         if len(members) == 0:
@@ -271,21 +371,97 @@ class ConversationHelper:
     ) -> bool:
         is_exist: bool = None
         try:
-            is_exist = await message_cache_service.exists_conversation_id_in_list(
+            is_exist = await message_cache_service.exists_in_inbox(
                 redis, user_id=account_id, conversation_id=conversation_id
             )
         except Exception as e:
             print(e)
 
         if is_exist is None:
-            is_exist = (
-                conversationCRUD.get_by_account_id_and_conversation_id(
-                    db, account_id=account_id, conversation_id=conversation_id
+            conversations = await self.load_inbox(db, redis, account_id)
+            is_exist = conversation_id in [id for id, _ in conversations]
+
+        return is_exist
+
+    def get_activity_score(self, activity: Optional[datetime]) -> float:
+        return (activity or datetime.now()).timestamp()
+
+    async def load_inbox(
+        self, db: Session, redis: Redis, account_id: int
+    ) -> List[Tuple[int, float]]:
+        """Rebuild the inbox index of an account from the database, returns
+        (conversation_id, last activity) latest first"""
+        conversations = sorted(
+            [
+                (id, self.get_activity_score(activity))
+                for id, activity in conversationCRUD.get_activity_by_account_id(
+                    db, account_id
                 )
-                is not None
+            ],
+            key=lambda item: (item[1], item[0]),
+            reverse=True,
+        )
+        try:
+            await message_cache_service.build_inbox(
+                redis, user_id=account_id, conversations=conversations
             )
+        except Exception as e:
+            print(e)
+        return conversations
 
-        return is_exist
+    async def get_inbox(
+        self,
+        db: Session,
+        redis: Redis,
+        account_id: int,
+        page: ConversationInboxPagination,
+    ) -> List[Tuple[int, float]]:
+        """A page of (conversation_id, last activity) latest first"""
+        cursor = CursorHelper.decode(page.cursor) if page.cursor else None
+        conversations = None
+        try:
+            conversations = await message_cache_service.get_inbox(
+                redis,
+                user_id=account_id,
+                limit=page.limit,
+                skip=page.skip,
+                cursor=cursor,
+            )
+        except Exception as e:
+            print(e)
+
+        if conversations is None:
+            conversations = await self.load_inbox(db, redis, account_id)
+            if cursor:
+                conversations = [
+                    (id, score) for id, score in conversations if (score, id) < cursor
+                ]
+            else:
+                conversations = conversations[page.skip :]
+            conversations = conversations[: page.limit]
+        return conversations
+
+    async def touch_inbox(
+        self,
+        db: Session,
+        redis: Redis,
+        conversation_id: int,
+        activity: datetime,
+        account_ids: List[int] = None,
+    ) -> None:
+        """Move a conversation to the top of its members' inboxes"""
+        try:
+            await message_cache_service.touch_inbox(
+                redis,
+                user_ids=account_ids
+                or conversation_memberCRUD.get_account_ids_by_conversation_id(
+                    db, conversation_id
+                ),
+                conversation_id=conversation_id,
+                score=self.get_activity_score(activity),
+            )
+        except Exception as e:
+            print(e)
 
     def get_last_message(self, db: Session, conversation_id: int) -> Message:
         message: Message = messageCRUD.get_last_message(
@@ -9,7 +9,7 @@ from app.crud import (
     account as accountCRUD,
     conversation_member as conversation_memberCRUD,
 )
-from app.schema.page import Pagination
+from app.hepler.cursor import CursorHelper
 from app.schema.conversation import (
     ConversationCreateRequest,
     ConversationResponse,
@@ -17,6 +17,7 @@ from app.schema.conversation import (
     ConversationUpdateRequest,
     ConversationUpdateAvatarRequest,
     ConversationGetExistWithListMemberRequest,
+    ConversationInboxPagination,
 )
 from app.schema.websocket import (
     NewConversationSchema,
@@ -35,7 +36,7 @@ from app.storage.cache.file_url_cache_service import file_url_cache_service
 
 class ConversationService:
     async def get(self, db: Session, redis: Redis, data: dict, current_user: Account):
-        page: Pagination = Pagination(**data)
+        page = ConversationInboxPagination(**data)
         # conversations: List[Conversation] = conversationCRUD.get_by_account_id(
         #     db, account_id=current_user.id, **page.model_dump()
         # )
@@ -56,26 +57,25 @@ class ConversationService:
         #         )
 
         # return CustomResponse(data=response)
-        conversations: List[Conversation] = conversationCRUD.get_by_lastest_message(
-            db, account_id=current_user.id, **page.model_dump()
+        inbox = await conversation_helper.get_inbox(db, redis, current_user.id, page)
+        conversations = {
+            conversation.id: conversation
+            for conversation in conversationCRUD.get_multi_by_ids(
+                db, [id for id, _ in inbox]
+            )
+        }
+        response = conversation_helper.get_list_conversation_response(
+            db,
+            [conversations[id] for id, _ in inbox if id in conversations],
+            current_user,
         )
 
-        response = []
-        for conversation in conversations:
-            if conversation.type == ConversationType.PRIVATE:
-                response.append(
-                    conversation_helper.get_private_conversation_response(
-                        db, conversation, current_user
-                    )
-                )
-            else:
-                response.append(
-                    conversation_helper.get_group_conversation_response(
-                        db, conversation
-                    )
-                )
-
-        return CustomResponse(data=response)
+        # The body stays a list, so the next page cursor travels in a header
+        result = CustomResponse(data=response)
+        if len(inbox) == page.limit:
+            last_id, last_score = inbox[-1]
+            result.headers["X-Next-Cursor"] = CursorHelper.encode(last_score, last_id)
+        return result
 
     async def get_existing_conversation(
         self, db: Session, redis: Redis, data: dict, current_user: Account
@@ -149,6 +149,14 @@ class ConversationService:
                 db, members, current_user
             )
 
+        await conversation_helper.touch_inbox(
+            db,
+            redis,
+            response.id,
+            response.created_at,
+            [member.id for member in members + [current_user]],
+        )
+
         user_id_to_websocket: dict = websocket_manager.user_id_to_websocket
         for member_id in members + [current_user]:
             websockets = user_id_to_websocket.get(member_id.id)
@@ -213,7 +221,7 @@ class ConversationService:
 
         avatar = conversation_data.avatar
         key = avatar.filename
-        s3_service.upload_file(avatar, key)
+        await s3_service.async_upload_file(avatar, key)
         conversation_data.avatar = key
 
         obj_in = ConversationUpdate(**conversation_data.model_dump())
@@ -253,7 +261,7 @@ class ConversationService:
         files = attach_file_data.files
         file = files[0]
         key = file.filename
-        s3_service.upload_file(file, key)
+        await s3_service.async_upload_file(file, key)
         try:
             file_url_cache_service.cache_image_url_message(
                 redis, user_id=current_user.id, conversation_id=conversation.id, key=key
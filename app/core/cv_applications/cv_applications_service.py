@@ -16,6 +16,8 @@ from app.schema.cv_application import (
     CVApplicationUserFilterCount,
 )
 from app.common.exception import CustomException
+from app.hepler.cursor import CursorHelper
+from app.db.base import unit_of_work
 from app.model import Account
 from app.common.response import CustomResponse
 from app.storage.cache.cv_cache_service import cv_cache_service
@@ -47,7 +49,15 @@ class CVApplicationsService:
             for cv_application in cv_applications
         ]
 
-        return CustomResponse(data={"jobs": cv_applications_response, "count": count})
+        return CustomResponse(
+            data={
+                "jobs": cv_applications_response,
+                "count": count,
+                "next_cursor": CursorHelper.next_cursor(
+                    cv_applications, page.sort_by, page.limit
+                ),
+            }
+        )
 
     async def get_by_id(
         self, db: Session, id: int, current_user: Account
@@ -91,7 +101,7 @@ class CVApplicationsService:
         cv_file = cv_applications_data.cv
         if cv_file:
             key = cv_file.filename
-            s3_service.upload_file(cv_file, key)
+            await s3_service.async_upload_file(cv_file, key)
             cv_applications_data.cv = key
 
         obj_in = CVApplicationCreate(
@@ -99,9 +109,11 @@ class CVApplicationsService:
             user_id=current_user.id,
             campaign_id=job.campaign.id,
         )
-        cv_application = cv_applicationCRUD.create(db, obj_in=obj_in)
-        campaignCRUD.increase_count_apply(db, job.campaign)
-        userCRUD.increase_count_job_apply(db, current_user.user)
+        with unit_of_work(db):
+            cv_application = cv_applicationCRUD.create(db, obj_in=obj_in, commit=False)
+            campaignCRUD.increase_count_apply(db, job.campaign, commit=False)
+            userCRUD.increase_count_job_apply(db, current_user.user, commit=False)
+        db.refresh(cv_application)
 
         try:
             await cv_cache_service.incr(
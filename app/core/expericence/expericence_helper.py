@@ -1,8 +1,6 @@
 from sqlalchemy.orm import Session
 
-from app.crud import experience as experienceCRUD
-from app.common.exception import CustomException
-from fastapi import status
+from app.core.reference_data.reference_data_registry import reference_data_registry
 
 
 class ExperienceHelper:
@@ -11,11 +9,7 @@ class ExperienceHelper:
         db: Session,
         id: int,
     ) -> int:
-        experience = experienceCRUD.get(db, id)
-        if not experience:
-            raise CustomException(
-                status_code=status.HTTP_404_NOT_FOUND, msg="Experience not found"
-            )
+        reference_data_registry.check_ids(db, "experience", [id])
         return id
 
 
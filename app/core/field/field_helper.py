@@ -1,11 +1,10 @@
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.crud import field as fieldCRUD, company_field as company_fieldCRUD
+from app.crud import company_field as company_fieldCRUD
 from app.schema.field import FieldItemResponse
 from app.model import Field
-from app.common.exception import CustomException
-from fastapi import status
+from app.core.reference_data.reference_data_registry import reference_data_registry
 
 
 class FieldHelper:
@@ -20,12 +19,7 @@ class FieldHelper:
         db: Session,
         id: int,
     ) -> int:
-        field = fieldCRUD.get(db, id)
-        if not field:
-            raise CustomException(
-                status_code=status.HTTP_404_NOT_FOUND, msg="Field not found"
-            )
-
+        reference_data_registry.check_ids(db, "field", [id])
         return id
 
     def check_list_valid(
@@ -33,7 +27,8 @@ class FieldHelper:
         db: Session,
         ids: List[int],
     ) -> List[int]:
-        return [self.check_valid(db, id) for id in ids]
+        reference_data_registry.check_ids(db, "field", ids)
+        return ids
 
     def create_with_company_id(
         self,
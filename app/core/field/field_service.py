@@ -58,6 +58,11 @@ class FieldService:
 
         response = fieldCRUD.create(db, obj_in=field_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(status_code=status.HTTP_201_CREATED, data=response)
 
     async def update(self, db: Session, id: int, data: dict):
@@ -71,6 +76,11 @@ class FieldService:
 
         response = fieldCRUD.update(db, db_obj=field, obj_in=field_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def delete(self, db: Session, id: int):
@@ -82,6 +92,11 @@ class FieldService:
 
         response = fieldCRUD.remove(db, id=id)
 
+        try:
+            await config_cache_service.invalidate_local()
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
 
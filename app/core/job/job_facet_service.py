@@ -0,0 +1,187 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from redis.asyncio import Redis
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+
+from app.crud import job as jobCRUD
+from app.core import constant
+from app.db.base import SessionLocal
+from app.hepler.enum import SalaryType
+from app.storage.redis import get_redis
+from app.storage.cache.job_facet_cache_service import job_facet_cache_service
+from app.core.loggers import logger
+
+
+class JobFacetService:
+    """Keeps homepage statistics as counters updated on job events.
+
+    Jobs are counted when published or updated, uncounted when deleted and
+    swept out once past their deadline. A periodic full rebuild corrects any
+    drift, and readers fall back to the aggregate queries until the first
+    build exists.
+    """
+
+    def __init__(self, expire_interval: int = 60, rebuild_interval: int = 60 * 60 * 6):
+        self.expire_interval = expire_interval
+        self.rebuild_interval = rebuild_interval
+        self.task: Optional[asyncio.Task] = None
+
+    def get_salary_bucket(
+        self, min_salary: int, max_salary: int, salary_type: SalaryType
+    ) -> int:
+        """Same buckets as jobCRUD.count_job_by_salary"""
+        ranges = constant.JOB_SALARY_RANGES
+        unit = 1000000
+        if salary_type == SalaryType.VND:
+            for idx, (low, high) in enumerate(ranges):
+                if (
+                    min_salary is not None
+                    and max_salary is not None
+                    and min_salary >= low * unit
+                    and max_salary < high * unit
+                ):
+                    return idx
+        elif salary_type == SalaryType.DEAL:
+            return len(ranges)
+        elif salary_type == SalaryType.USD:
+            return len(ranges) + 1
+        return len(ranges) + 2
+
+    def get_members(self, db: Session, ids: List[int] = None) -> List[tuple]:
+        """(job_id, facets, company_id, deadline, published) of active jobs"""
+        categories = defaultdict(set)
+        for job_id, category_id in jobCRUD.get_facet_categories(db, ids):
+            categories[job_id].add(category_id)
+        provinces = defaultdict(set)
+        districts = defaultdict(set)
+        for job_id, province_id, district_id in jobCRUD.get_facet_locations(db, ids):
+            if province_id:
+                provinces[job_id].add(province_id)
+            if district_id:
+                districts[job_id].add(district_id)
+
+        members = []
+        for (
+            job_id,
+            deadline,
+            min_salary,
+            max_salary,
+            salary_type,
+            company_id,
+            approved_at,
+        ) in jobCRUD.get_facet_rows(db, ids):
+            facets = {
+                "category": sorted(categories[job_id]),
+                "salary": [self.get_salary_bucket(min_salary, max_salary, salary_type)],
+                "province": sorted(provinces[job_id]),
+                "district": sorted(districts[job_id]),
+            }
+            members.append(
+                (
+                    job_id,
+                    facets,
+                    company_id,
+                    # deadline >= NOW() stops matching at the start of the day
+                    datetime.combine(deadline, time.min).timestamp(),
+                    approved_at.timestamp() if approved_at else 0,
+                )
+            )
+        return members
+
+    async def sync(self, db: Session, job_ids: List[int], redis: Redis = None) -> None:
+        """Recount jobs after they were published, updated or unpublished"""
+        redis = redis or await get_redis()
+        members = self.get_members(db, job_ids)
+        for job_id in job_ids:
+            await job_facet_cache_service.remove(redis, job_id)
+        for member in members:
+            await job_facet_cache_service.add(redis, *member)
+
+    async def remove(self, job_ids: List[int], redis: Redis = None) -> None:
+        redis = redis or await get_redis()
+        for job_id in job_ids:
+            await job_facet_cache_service.remove(redis, job_id)
+
+    async def expire(self, redis: Redis) -> int:
+        """Uncount jobs whose deadline has passed"""
+        job_ids = await job_facet_cache_service.get_expired(
+            redis, datetime.now().timestamp()
+        )
+        await self.remove(job_ids, redis)
+        return len(job_ids)
+
+    async def rebuild(self, db: Session, redis: Redis, force: bool = False) -> None:
+        if not force and await job_facet_cache_service.is_built(redis):
+            return
+
+        members = await asyncio.to_thread(self.get_members, db)
+        await job_facet_cache_service.replace(redis, members)
+        logger.info(f"Job facets rebuilt with {len(members)} active jobs")
+
+    async def count_by_category(self, redis: Redis) -> Optional[List[Tuple[int, int]]]:
+        """(category_id, count) most jobs first, None until the first build"""
+        if not await job_facet_cache_service.is_built(redis):
+            return None
+        counts = await job_facet_cache_service.get_counts(redis, "category")
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+    async def count_by_salary(self, redis: Redis) -> Optional[List[Tuple[int, int]]]:
+        """(bucket, count) for every salary bucket, None until the first build"""
+        if not await job_facet_cache_service.is_built(redis):
+            return None
+        counts = await job_facet_cache_service.get_counts(redis, "salary")
+        return [
+            (idx, counts.get(idx, 0))
+            for idx in range(len(constant.JOB_SALARY_RANGES) + 3)
+        ]
+
+    async def count_by_location(self, redis: Redis, facet: str) -> Dict[int, int]:
+        """Active jobs per "province" or "district" id"""
+        return await job_facet_cache_service.get_counts(redis, facet)
+
+    async def get_recruitment_demand(self, redis: Redis) -> Optional[Dict[str, int]]:
+        if not await job_facet_cache_service.is_built(redis):
+            return None
+        since = (datetime.now() - timedelta(days=1)).timestamp()
+        return {
+            "number_of_job_24h": await job_facet_cache_service.count_published_since(
+                redis, since
+            ),
+            "number_of_job_active": await job_facet_cache_service.get_total(redis),
+            "number_of_company_active": await job_facet_cache_service.get_companies(
+                redis
+            ),
+        }
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                redis = await get_redis()
+                if await job_facet_cache_service.lock(
+                    redis, "expire", self.expire_interval
+                ):
+                    await self.expire(redis)
+                if await job_facet_cache_service.lock(
+                    redis, "rebuild", self.rebuild_interval
+                ):
+                    with SessionLocal() as db:
+                        await self.rebuild(db, redis, force=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in job facets: {e}")
+            await asyncio.sleep(self.expire_interval)
+
+
+job_facet_service = JobFacetService()
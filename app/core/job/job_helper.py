@@ -1,13 +1,24 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
-from typing import Union, List
+import inspect
+from typing import Awaitable, Callable, Union, List, Optional, Tuple
+from collections import defaultdict
 
 from app.schema.job import (
     JobItemResponse,
     JobItemResponseGeneral,
-    JobSearchByUser,
+    PaginationJob,
+    JobCount,
+)
+from app.schema.working_time import WorkingTimeResponse
+from app.schema.work_location import WorkLocatioResponse
+from app.crud import (
+    job as jobCRUD,
+    company as companyCRUD,
+    working_time as working_timeCRUD,
+    work_location as work_locationCRUD,
 )
-from app.crud import job as jobCRUD, company as companyCRUD
 from app.core.working_times.working_times_helper import working_times_helper
 from app.storage.cache.job_cache_service import job_cache_service
 from app.model import Job
@@ -18,26 +29,98 @@ from app.core.skill.skill_helper import skill_helper
 from app.core.category.category_helper import category_helper
 from app.core.work_locations.work_locations_hepler import work_location_helper
 from app.core.company.company_helper import company_helper
-from app.hepler.enum import JobSkillType
+from app.core.location.location_helper import location_helper
+from app.hepler.enum import JobSkillType, SortByJob
+from app.hepler.cursor import CursorHelper
+from app.core import constant
 
 
 class JobHepler:
     async def get_list_job(self, db: Session, redis: Redis, data: dict):
         jobs = jobCRUD.get_multi(db, **data)
-        jobs_response = []
-        for job in jobs:
-            job_res = await self.get_info(db, redis, job)
-            if isinstance(job_res, dict):
-                jobs_response.append(job_res) if job_res.get("company") else None
-            else:
-                jobs_response.append(job_res) if job_res.company else None
+        jobs_response = await self.get_list_job_info(db, redis, jobs)
 
-        return jobs_response
+        return [job_res for job_res in jobs_response if job_res.company]
 
     async def get_list_job_info(
-        self, db: Session, redis: Redis, jobs: List[Job]
+        self, db: Union[Session, AsyncSession], redis: Redis, jobs: List[Job]
+    ) -> List[JobItemResponse]:
+        return await self.get_list_job_info_by_ids(db, redis, [job.id for job in jobs])
+
+    async def get_list_job_info_by_ids(
+        self, db: Union[Session, AsyncSession], redis: Redis, ids: List[int]
+    ) -> List[JobItemResponse]:
+        jobs_response = {}
+        try:
+            jobs_response = await job_cache_service.get_many_job_info(redis, ids)
+        except Exception as e:
+            print(e)
+
+        missing_ids = [id for id in ids if id not in jobs_response]
+        if isinstance(db, AsyncSession):
+            missing_jobs_response = await db.run_sync(
+                self.get_list_info_by_ids, missing_ids
+            )
+        else:
+            missing_jobs_response = self.get_list_info_by_ids(db, missing_ids)
+        for job_response in missing_jobs_response:
+            jobs_response[job_response.id] = job_response
+        if missing_jobs_response:
+            try:
+                await job_cache_service.set_many_job_info(redis, missing_jobs_response)
+            except Exception as e:
+                print(e)
+
+        return [jobs_response[id] for id in ids if id in jobs_response]
+
+    def get_list_info_by_ids(
+        self, db: Session, ids: List[int], Schema=JobItemResponse
     ) -> List[JobItemResponse]:
-        return [await self.get_info(db, redis, job) for job in jobs]
+        if not ids:
+            return []
+
+        jobs = jobCRUD.get_multi_by_ids_with_relations(db, ids)
+        working_times = working_timeCRUD.get_by_job_ids(db, ids)
+        work_locations = work_locationCRUD.get_by_job_ids(db, ids)
+        companies = companyCRUD.get_by_business_ids(
+            db, list({job.business_id for job in jobs})
+        )
+
+        working_times_by_job = defaultdict(list)
+        for working_time in working_times:
+            working_times_by_job[working_time.job_id].append(
+                WorkingTimeResponse(**working_time.__dict__).model_dump()
+            )
+        work_locations_by_job = defaultdict(list)
+        for work_location in work_locations:
+            work_locations_by_job[work_location.job_id].append(
+                WorkLocatioResponse(
+                    **{
+                        k: v
+                        for k, v in work_location.__dict__.items()
+                        if k not in ["province", "district"]
+                    },
+                    province=location_helper.get_province_info(work_location.province),
+                    district=location_helper.get_district_info(work_location.district),
+                )
+            )
+        company_by_business = {
+            company.business_id: company_helper.get_info(db, company)
+            for company in companies
+        }
+
+        jobs_by_id = {job.id: job for job in jobs}
+        return [
+            self.build_info(
+                jobs_by_id[id],
+                working_times=working_times_by_job[id],
+                work_locations=work_locations_by_job[id],
+                company=company_by_business.get(jobs_by_id[id].business_id),
+                Schema=Schema,
+            )
+            for id in ids
+            if id in jobs_by_id
+        ]
 
     def check_fields(
         self,
@@ -62,22 +145,38 @@ class JobHepler:
     async def get_info(
         self, db: Session, redis: Redis, job: Job, Schema=JobItemResponse
     ) -> Union[JobItemResponse, dict]:
-        job_id = job.id
-        try:
-            job_response = await job_cache_service.get_cache_job_info(redis, job_id)
-            if job_response:
-                return job_response
-        except Exception as e:
-            print(e)
+        return await job_cache_service.get_or_compute_job_info(
+            redis, job.id, lambda: self.get_full_info(db, job, Schema)
+        )
 
+    def get_full_info(
+        self, db: Session, job: Job, Schema=JobItemResponse
+    ) -> Union[JobItemResponse, dict]:
         working_times_response = working_times_helper.get_by_job_id(db, job.id)
         work_locations_response = work_location_helper.get_by_job_id(db, job.id)
         company = companyCRUD.get_by_business_id(db, job.business_id)
         company_response = company_helper.get_info(db, company)
+        return self.build_info(
+            job,
+            working_times=working_times_response,
+            work_locations=work_locations_response,
+            company=company_response,
+            Schema=Schema,
+        )
+
+    def build_info(
+        self,
+        job: Job,
+        *,
+        working_times: list,
+        work_locations: list,
+        company: object,
+        Schema=JobItemResponse,
+    ) -> JobItemResponse:
         categories_response = category_helper.get_list_info(job.job_categories)
         must_have_skills_response = skill_helper.get_list_info(job.must_have_skills)
         should_have_skills_response = skill_helper.get_list_info(job.should_have_skills)
-        job_response = Schema(
+        return Schema(
             **{
                 k: v
                 for k, v in job.__dict__.items()
@@ -90,31 +189,65 @@ class JobHepler:
                     "job_categories",
                 ]
             },
-            working_times=working_times_response,
-            locations=work_locations_response,
-            company=company_response,
+            working_times=working_times,
+            locations=work_locations,
+            company=company,
             categories=categories_response,
             must_have_skills=must_have_skills_response,
             should_have_skills=should_have_skills_response,
         )
 
-        try:
-            await job_cache_service.cache_job_info(redis, job_id, job_response)
-        except Exception as e:
-            print(e)
-        return job_response
-
     def get_info_general(self, job: Job) -> JobItemResponseGeneral:
         job_response = JobItemResponseGeneral(
             **job.__dict__,
         )
         return job_response
 
-    def get_count_job_user_search_key(self, data: JobSearchByUser) -> str:
-        return f"{data.province_id}_{data.district_id}_{data.province_id}_{data.category_id}_{data.field_id}_{data.employment_type}_{data.job_experience_id}_{data.job_position_id}_{data.min_salary}_{data.max_salary}_{data.salary_type}_{data.deadline}_{data.keyword}_{data.suggest}_{data.updated_at}"
+    async def get_count(
+        self,
+        redis: Redis,
+        scope: str,
+        params: JobCount,
+        counter: Callable[[int], Union[int, Awaitable[int]]],
+    ) -> Tuple[int, bool]:
+        """Return (count, exact) for the filters, cached per normalized filter.
+
+        counter(cap) stops after cap + 1 rows, so large result sets cost the same
+        as small ones and are reported as capped instead of exact.
+        """
+
+        async def compute() -> Tuple[int, bool]:
+            count = counter(constant.JOB_COUNT_CAP)
+            if inspect.isawaitable(count):
+                count = await count
+            return min(count, constant.JOB_COUNT_CAP), count <= constant.JOB_COUNT_CAP
+
+        return await job_cache_service.get_or_compute_count(
+            redis, f"{scope}_{params.get_key()}", compute
+        )
+
+    def next_cursor(self, page: PaginationJob, jobs: List) -> Optional[str]:
+        """Relevance pages by skip, so it never hands out a cursor"""
+        sort_by = page.sort_by
+        if sort_by == SortByJob.RELEVANCE:
+            if page.keyword:
+                return None
+            sort_by = SortByJob.CREATED_AT
+        return CursorHelper.next_cursor(jobs, sort_by, page.limit)
 
-    def search_job_user_search_key(self, data: JobSearchByUser) -> str:
-        return f"{data.province_id}_{data.district_id}_{data.province_id}_{data.category_id}_{data.field_id}_{data.employment_type}_{data.job_experience_id}_{data.job_position_id}_{data.min_salary}_{data.max_salary}_{data.salary_type}_{data.deadline}_{data.keyword}_{data.suggest}_{data.updated_at}_{data.skip}_{data.limit}_{data.sort_by}_{data.order_by}"
+    def slice_ids(self, ids: List[int], page: PaginationJob) -> Optional[List[int]]:
+        """Ids of the requested page, None when it lies past the cached window"""
+        if page.cursor:
+            _, last_id = CursorHelper.decode(page.cursor)
+            if last_id not in ids:
+                return None
+            start = ids.index(last_id) + 1
+        else:
+            start = page.skip
+        end = start + page.limit
+        if end > len(ids) and len(ids) >= constant.JOB_SEARCH_IDS_SIZE:
+            return None
+        return ids[start:end]
 
     def create_fields(
         self,
@@ -127,14 +260,14 @@ class JobHepler:
         working_times: list,
     ):
         skill_helper.create_with_job_id(
-            db, job_id, must_have_skills, JobSkillType.MUST_HAVE
+            db, job_id, must_have_skills, JobSkillType.MUST_HAVE, commit=False
         )
         skill_helper.create_with_job_id(
-            db, job_id, should_have_skills, JobSkillType.SHOULD_HAVE
+            db, job_id, should_have_skills, JobSkillType.SHOULD_HAVE, commit=False
         )
-        work_location_helper.create_with_job_id(db, job_id, locations)
-        category_helper.create_with_job_id(db, job_id, categories)
-        working_times_helper.create_with_job_id(db, job_id, working_times)
+        work_location_helper.create_with_job_id(db, job_id, locations, commit=False)
+        category_helper.create_with_job_id(db, job_id, categories, commit=False)
+        working_times_helper.create_with_job_id(db, job_id, working_times, commit=False)
 
 
 job_helper = JobHepler()
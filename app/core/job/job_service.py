@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from redis.asyncio import Redis
 
@@ -32,7 +33,10 @@ from app.hepler.enum import (
     JobApprovalStatus,
     CampaignStatus,
     RequestApproval,
+    SuggestType,
 )
+from app.core.suggest.suggest_service import suggest_service
+from app.core.job.job_facet_service import job_facet_service
 from app.core.job_approval_requests import job_approval_request_helper
 from app.storage.cache.job_cache_service import job_cache_service
 from app.hepler.common import CommonHelper
@@ -44,6 +48,7 @@ from app.core.auth.business_auth_helper import business_auth_helper
 from app.core.campaign.campaign_helper import campaign_helper
 from fastapi import status
 from app.common.exception import CustomException
+from app.db.base import unit_of_work
 from app.common.response import CustomResponse
 
 
@@ -77,53 +82,80 @@ class JobService:
 
         return CustomResponse(data=response)
 
-    async def get_by_user(self, db: Session, redis: Redis, data: dict):
+    async def get_by_user(
+        self, db: Session, async_db: AsyncSession, redis: Redis, data: dict
+    ):
         page = JobFilterByUser(**data)
         page.job_status = JobStatus.PUBLISHED
         page.job_approve_status = JobApprovalStatus.APPROVED
 
-        jobs = await job_helper.get_list_job(db, redis, page.model_dump())
+        jobs = await jobCRUD.async_get_multi(async_db, **page.model_dump())
+        jobs_response = [
+            job_res
+            for job_res in await job_helper.get_list_job_info(async_db, redis, jobs)
+            if job_res.company
+        ]
 
         params = JobCount(**data)
-        number_of_all_jobs = jobCRUD.count(db, **params.model_dump())
+        number_of_all_jobs, count_exact = await job_helper.get_count(
+            redis,
+            "all",
+            params,
+            lambda cap: jobCRUD.async_count(async_db, cap=cap, **params.model_dump()),
+        )
 
         response = {
             "count": number_of_all_jobs,
-            "jobs": jobs,
+            "count_exact": count_exact,
+            "jobs": jobs_response,
+            "next_cursor": job_helper.next_cursor(page, jobs),
         }
 
         return CustomResponse(data=response)
 
-    async def search_by_user(self, db: Session, redis: Redis, data: dict):
+    async def search_by_user(
+        self, db: Session, async_db: AsyncSession, redis: Redis, data: dict
+    ):
         page = JobSearchByUser(**data)
         page.job_status = JobStatus.PUBLISHED
-        jobs_response = None
         count = 0
+        count_exact = True
         jobs_of_district_response = []
 
-        try:
-            jobs_response = await job_cache_service.get_cache_user_search(
-                redis, page.get_count_job_user_search_key()
-            )
-        except Exception as e:
-            print(e)
+        # Every page of a query is sliced from one cached, ordered id list
+        query_key = page.get_query_key()
+        ids = await job_cache_service.get_or_compute_search_ids(
+            redis,
+            query_key,
+            lambda: jobCRUD.async_user_search_ids(
+                async_db,
+                **{
+                    **page.model_dump(),
+                    "skip": 0,
+                    "limit": constant.JOB_SEARCH_IDS_SIZE,
+                    "cursor": None,
+                },
+            ),
+        )
 
-        if not jobs_response:
-            jobs = jobCRUD.user_search(db, **page.model_dump())
-            jobs_response = await job_helper.get_list_job_info(db, redis, jobs)
-            try:
-                await job_cache_service.cache_user_search(
-                    redis, page.get_count_job_user_search_key(), jobs_response
-                )
-            except Exception as e:
-                print(e)
+        page_ids = job_helper.slice_ids(ids, page)
+        if page_ids is None:
+            jobs = await jobCRUD.async_user_search(async_db, **page.model_dump())
+            jobs_response = await job_helper.get_list_job_info(async_db, redis, jobs)
+        else:
+            jobs_response = await job_helper.get_list_job_info_by_ids(
+                async_db, redis, page_ids
+            )
 
         if (page.province_id or page.district_id) and page.suggest:
+            cache_key = page.get_jobs_of_district_key()
             try:
-                cache_key = page.get_jobs_of_district_key()
-                jobs_of_district_response = await job_cache_service.get_list(
-                    redis, cache_key
+                jobs_of_district_response = (
+                    await job_cache_service.get_cache_province_district_search_by_user(
+                        redis, cache_key
+                    )
                 )
+                count = sum(item["count"] for item in jobs_of_district_response or [])
             except Exception as e:
                 print(e)
 
@@ -157,31 +189,26 @@ class JobService:
                 except Exception as e:
                     print(e)
 
+        elif len(ids) < constant.JOB_SEARCH_IDS_SIZE:
+            count = len(ids)
         else:
-            cache_key = page.get_count_job_user_search_key()
-            count = None
-            try:
-                count = await job_cache_service.get_cache_count_search_by_user(
-                    redis, cache_key
-                )
-            except Exception as e:
-                print(e)
-
-            if not count:
-                params = JobCount(**data)
-                count = jobCRUD.user_count(db, **params.model_dump())
-                try:
-                    await job_cache_service.cache_count_search_by_user(
-                        redis, cache_key, count
-                    )
-                except Exception as e:
-                    print(e)
+            params = JobCount(**data)
+            count, count_exact = await job_helper.get_count(
+                redis,
+                "user",
+                params,
+                lambda cap: jobCRUD.async_user_count(
+                    async_db, cap=cap, **params.model_dump()
+                ),
+            )
 
         response = {
             "count": count,
+            "count_exact": count_exact,
             "option": page,
             "jobs": jobs_response,
             "jobs_of_district": jobs_of_district_response,
+            "next_cursor": job_helper.next_cursor(page, jobs_response),
         }
 
         return CustomResponse(data=response)
@@ -213,20 +240,25 @@ class JobService:
 
         jobs = jobCRUD.search(db, **page.model_dump())
         params = JobCount(**page.model_dump())
-        count = jobCRUD.count(db, **params.model_dump())
+        count, count_exact = await job_helper.get_count(
+            redis,
+            "business",
+            params,
+            lambda cap: jobCRUD.count(db, cap=cap, **params.model_dump()),
+        )
 
-        jobs_response = []
-        for job in jobs:
-            job_res = await job_helper.get_info(db, redis, job)
-            if isinstance(job_res, dict):
-                jobs_response.append(job_res) if job_res.get("company") else None
-            else:
-                jobs_response.append(job_res) if job_res.company else None
+        jobs_response = [
+            job_res
+            for job_res in await job_helper.get_list_job_info(db, redis, jobs)
+            if job_res.company
+        ]
 
         response = {
             "count": count,
+            "count_exact": count_exact,
             "option": page,
             "jobs": jobs_response,
+            "next_cursor": job_helper.next_cursor(page, jobs),
         }
 
         return CustomResponse(data=response)
@@ -312,40 +344,36 @@ class JobService:
 
     async def count_job_by_category(self, db: Session, redis: Redis):
         time_scan = CommonHelper.get_current_time(db)
-        response = None
+        data = None
         try:
-            response = await job_cache_service.get_cache_count_job_by_category(redis)
+            data = await job_facet_service.count_by_category(redis)
         except Exception as e:
             print(e)
 
-        if not response:
-            data = jobCRUD.count_job_by_category(db)
-            response = []
-
-            for id, count in data:
-                category = category_helper.get_info_by_id(db, id)
-                response.append(
-                    {
-                        **category.model_dump(),
-                        "count": count,
-                        "time_scan": str(time_scan),
-                    }
-                )
-            try:
-                await job_cache_service.cache_count_job_by_category(redis, response)
-            except Exception as e:
-                print(e)
+        if data is None:
+            data = await job_cache_service.get_or_compute_statistics(
+                redis,
+                "count_job_by_category",
+                lambda: jobCRUD.count_job_by_category(db),
+            )
+
+        response = []
+        for id, count in data:
+            category = category_helper.get_info_by_id(db, id)
+            response.append(
+                {
+                    **category.model_dump(),
+                    "count": count,
+                    "time_scan": str(time_scan),
+                }
+            )
 
         return CustomResponse(data=response)
 
     async def count_job_by_salary(self, db: Session, redis: Redis):
         data = None
         salary_ranges = [
-            (0, 3, SalaryType.VND),
-            (3, 10, SalaryType.VND),
-            (10, 20, SalaryType.VND),
-            (20, 30, SalaryType.VND),
-            (30, 999, SalaryType.VND),
+            (min, max, SalaryType.VND) for min, max in constant.JOB_SALARY_RANGES
         ]
         other_salary = [
             SalaryType.DEAL,
@@ -353,17 +381,17 @@ class JobService:
             "other",
         ]
         try:
-            data = await job_cache_service.get_cache_count_job_by_salary(redis)
+            data = await job_facet_service.count_by_salary(redis)
         except Exception as e:
             print(e)
 
         time_scan = CommonHelper.get_current_time(db)
-        if not data:
-            data = jobCRUD.count_job_by_salary(db, salary_ranges)
-            try:
-                await job_cache_service.cache_count_job_by_salary(redis, data)
-            except Exception as e:
-                print(e)
+        if data is None:
+            data = await job_cache_service.get_or_compute_statistics(
+                redis,
+                "count_job_by_salary",
+                lambda: jobCRUD.count_job_by_salary(db, salary_ranges),
+            )
 
         response = []
         for index, (idx, count) in enumerate(data[:-3]):
@@ -407,58 +435,26 @@ class JobService:
         )
 
         try:
-            response = await job_cache_service.get_cache_job_cruiment_demand(redis)
+            response = await job_facet_service.get_recruitment_demand(redis)
         except Exception as e:
             print(e)
 
-        if not response:
-            number_of_job_24h = await job_cache_service.get_cache_count_job_24h(redis)
-            if not number_of_job_24h:
-                number_of_job_24h = jobCRUD.user_count(
-                    db, **params.model_dump(), approved_time=approved_time
-                )
-                try:
-                    await job_cache_service.cache_count_job_24h(
-                        redis, number_of_job_24h
-                    )
-                except Exception as e:
-                    print(e)
-
-            number_of_job_active = await job_cache_service.get_cache_count_job_active(
-                redis
-            )
-            if not number_of_job_active:
-                number_of_job_active = jobCRUD.user_count(
-                    db,
-                    **params.model_dump(),
-                )
-                try:
-                    await job_cache_service.cache_count_job_active(
-                        redis, number_of_job_active
-                    )
-                except Exception as e:
-                    print(e)
-            number_of_company_active = (
-                await job_cache_service.get_cache_count_job_active(redis)
+        if response is None:
+            response = await job_cache_service.get_or_compute_statistics(
+                redis,
+                "cruitment_demand",
+                lambda: {
+                    "number_of_job_24h": jobCRUD.user_count(
+                        db, **params.model_dump(), approved_time=approved_time
+                    ),
+                    "number_of_job_active": jobCRUD.user_count(
+                        db,
+                        **params.model_dump(),
+                    ),
+                    "number_of_company_active": jobCRUD.count_company_active_job(db),
+                },
             )
-            if not number_of_company_active:
-                number_of_company_active = jobCRUD.count_company_active_job(db)
-                try:
-                    await job_cache_service.cache_count_job_active(
-                        redis, number_of_company_active
-                    )
-                except Exception as e:
-                    print(e)
-            response = {
-                "number_of_job_24h": number_of_job_24h,
-                "number_of_job_active": number_of_job_active,
-                "number_of_company_active": number_of_company_active,
-                "time_scan": str(time_scan),
-            }
-            try:
-                await job_cache_service.cache_job_cruiment_demand(redis, response)
-            except Exception as e:
-                print(e)
+        response["time_scan"] = str(time_scan)
 
         return CustomResponse(data=response)
 
@@ -509,16 +505,18 @@ class JobService:
             employer_verified=is_verified_company,
         )
 
-        job = jobCRUD.create(db=db, obj_in=job_data_in)
-        job_helper.create_fields(
-            db,
-            job_id=job.id,
-            must_have_skills=job_data.must_have_skills,
-            should_have_skills=job_data.should_have_skills,
-            locations=job_data.locations,
-            categories=job_data.categories,
-            working_times=job_data.working_times,
-        )
+        with unit_of_work(db):
+            job = jobCRUD.create(db=db, obj_in=job_data_in, commit=False)
+            job_helper.create_fields(
+                db,
+                job_id=job.id,
+                must_have_skills=job_data.must_have_skills,
+                should_have_skills=job_data.should_have_skills,
+                locations=job_data.locations,
+                categories=job_data.categories,
+                working_times=job_data.working_times,
+            )
+            jobCRUD.update_search_text(db, job, commit=False)
         job_response = await job_helper.get_info(db, redis, job)
 
         return CustomResponse(status_code=status.HTTP_201_CREATED, data=job_response)
@@ -611,6 +609,12 @@ class JobService:
 
         response = jobCRUD.remove(db, id=job_id)
 
+        try:
+            await suggest_service.remove(SuggestType.JOB, [job_id])
+            await job_facet_service.remove([job_id])
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
 
@@ -8,8 +8,10 @@ from app.model import ApprovalLog
 
 
 class JobApprovalLogHelper:
-    def create_job_approval_log(db: Session, data: JobApprovalLogCreate) -> ApprovalLog:
-        job_approval_log = job_approval_logCRUD.create(db, obj_in=data)
+    def create_job_approval_log(
+        self, db: Session, data: JobApprovalLogCreate, commit: bool = True
+    ) -> ApprovalLog:
+        job_approval_log = job_approval_logCRUD.create(db, obj_in=data, commit=commit)
         return job_approval_log
 
 
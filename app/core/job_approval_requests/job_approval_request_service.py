@@ -6,13 +6,17 @@ from app.schema.job_approval_request import (
     JobApprovalRequestUpdate,
 )
 from app.schema.job_approval_log import JobApprovalLogCreate
+from app.schema.job import JobUpdate
 from app.core.job_approval_log.job_approval_log_helper import job_approval_log_helper
 from app.crud.job import job as jobCRUD
 from app.crud import job_approval_request as job_approval_requestCRUD
 from app.hepler.enum import JobStatus, JobApprovalStatus
+from app.core.suggest.suggest_service import suggest_service
+from app.core.job.job_facet_service import job_facet_service
 from app.model import Account
 from fastapi import status
 from app.common.exception import CustomException
+from app.db.base import unit_of_work
 from app.common.response import CustomResponse
 
 
@@ -55,28 +59,43 @@ class JobApprovalRequestService:
                 status_code=status.HTTP_400_BAD_REQUEST, msg="Job already approved"
             )
 
-        if job_approval_request_data.status == JobApprovalStatus.APPROVED:
-            if job.status != JobStatus.PUBLISHED:
-                jobCRUD.update(db, db_obj=job, obj_in={"status": JobStatus.PUBLISHED})
-        job_approval_request.id
-        job_approval_requestCRUD.update(
-            db,
-            db_obj=job_approval_request,
-            obj_in={"status": job_approval_request_data.status},
-        )
-        job_approval_log = JobApprovalLogCreate(
-            **{
-                "job_approval_request_id": job_approval_request.id,
-                "previous_status": job_approval_request.status,
-                "new_status": job_approval_request_data.status,
-                "admin_id": current_user.id,
-                "reason": job_approval_request_data.reason,
-            }
-        )
-        job_approval_log_helper.create_job_approval_log(
-            db,
-            job_approval_log,
-        )
+        previous_status = job_approval_request.status
+        with unit_of_work(db):
+            if job_approval_request_data.status == JobApprovalStatus.APPROVED:
+                if job.status != JobStatus.PUBLISHED:
+                    jobCRUD.update(
+                        db,
+                        db_obj=job,
+                        obj_in={"status": JobStatus.PUBLISHED},
+                        commit=False,
+                    )
+            job_approval_requestCRUD.update(
+                db,
+                db_obj=job_approval_request,
+                obj_in={"status": job_approval_request_data.status},
+                commit=False,
+            )
+            job_approval_log = JobApprovalLogCreate(
+                **{
+                    "job_approval_request_id": job_approval_request.id,
+                    "previous_status": previous_status,
+                    "new_status": job_approval_request_data.status,
+                    "admin_id": current_user.id,
+                    "reason": job_approval_request_data.reason,
+                }
+            )
+            job_approval_log_helper.create_job_approval_log(
+                db,
+                job_approval_log,
+                commit=False,
+            )
+        db.refresh(job_approval_request)
+
+        try:
+            await suggest_service.sync_jobs(db, [job.id])
+            await job_facet_service.sync(db, [job.id])
+        except Exception as e:
+            print(e)
 
         return CustomResponse(data=job_approval_request)
 
@@ -106,28 +125,46 @@ class JobApprovalRequestService:
                 status_code=status.HTTP_400_BAD_REQUEST, msg="Invalid status"
             )
 
-        job_approval_request.id
-        if job_approval_request.status == JobApprovalStatus.APPROVED:
-            job_update_in = JobApprovalRequestUpdate(**job_approval_request.__dict__)
-            jobCRUD.update(db, db_obj=job, obj_in=job_update_in)
-        job_approval_requestCRUD.update(
-            db,
-            db_obj=job_approval_request,
-            obj_in={"status": job_approval_update_data.status},
-        )
-        job_approval_log = JobApprovalLogCreate(
-            **{
-                "job_approval_request_id": job_approval_request.id,
-                "previous_status": job_approval_request.status,
-                "new_status": job_approval_update_data.status,
-                "admin_id": current_user.id,
-                "reason": job_approval_update_data.reason,
-            }
-        )
-        job_approval_log_helper.create_job_approval_log(
-            db,
-            job_approval_log,
-        )
+        previous_status = job_approval_request.status
+        with unit_of_work(db):
+            if job_approval_update_data.status == JobApprovalStatus.APPROVED:
+                # The requested changes are applied once approved
+                job_update_in = JobUpdate(
+                    **{
+                        key: value
+                        for key, value in job_approval_request.data.items()
+                        if key != "locations"
+                    }
+                )
+                jobCRUD.update(db, db_obj=job, obj_in=job_update_in, commit=False)
+                jobCRUD.update_search_text(db, job, commit=False)
+            job_approval_requestCRUD.update(
+                db,
+                db_obj=job_approval_request,
+                obj_in={"status": job_approval_update_data.status},
+                commit=False,
+            )
+            job_approval_log = JobApprovalLogCreate(
+                **{
+                    "job_approval_request_id": job_approval_request.id,
+                    "previous_status": previous_status,
+                    "new_status": job_approval_update_data.status,
+                    "admin_id": current_user.id,
+                    "reason": job_approval_update_data.reason,
+                }
+            )
+            job_approval_log_helper.create_job_approval_log(
+                db,
+                job_approval_log,
+                commit=False,
+            )
+        db.refresh(job_approval_request)
+
+        try:
+            await suggest_service.sync_jobs(db, [job.id])
+            await job_facet_service.sync(db, [job.id])
+        except Exception as e:
+            print(e)
 
         return CustomResponse(data=job_approval_request)
 
@@ -1,12 +1,10 @@
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.crud import job_position as job_positionCRUD
 from app.schema.job_position import JobPositionItemResponse
 from app.schema.group_position import GroupPositionItemResponse
 from app.model import JobPosition, GroupPosition
-from fastapi import status
-from app.common.exception import CustomException
+from app.core.reference_data.reference_data_registry import reference_data_registry
 
 
 class JobPositionHelper:
@@ -15,11 +13,7 @@ class JobPositionHelper:
         db: Session,
         id: int,
     ) -> int:
-        position = job_positionCRUD.get(db, id)
-        if not position:
-            raise CustomException(
-                status_code=status.HTTP_404_NOT_FOUND, msg="Position not found"
-            )
+        reference_data_registry.check_ids(db, "position", [id])
         return id
 
     def get_info(self, db: Session, position: JobPosition):
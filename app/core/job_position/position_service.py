@@ -17,6 +17,8 @@ from fastapi import status
 from app.common.exception import CustomException
 from app.common.response import CustomResponse
 from app.storage.cache.config_cache_service import config_cache_service
+from app.core.suggest.suggest_service import suggest_service
+from app.hepler.enum import SuggestType
 
 
 class JobPositionService:
@@ -107,6 +109,14 @@ class JobPositionService:
 
         response = job_positionCRUD.create(db, obj_in=job_position_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.index(
+                SuggestType.POSITION, [(response.id, response.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(status_code=status.HTTP_201_CREATED, data=response)
 
     async def create_group(self, db: Session, data: dict):
@@ -136,6 +146,14 @@ class JobPositionService:
             db, db_obj=job_position, obj_in=job_position_data
         )
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.index(
+                SuggestType.POSITION, [(response.id, response.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def update_group(self, db: Session, id: int, data: dict):
@@ -162,6 +180,12 @@ class JobPositionService:
 
         job_positionCRUD.remove(db, id=id)
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.remove(SuggestType.POSITION, [id])
+        except Exception as e:
+            print(e)
+
         return CustomResponse(msg="Deleted position successfully")
 
     async def delete_group(self, db: Session, id: int):
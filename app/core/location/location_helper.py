@@ -5,21 +5,40 @@ from app.model import Province, District
 from app.crud import province as provinceCRUD, district as districtCRUD
 from app.schema.province import ProvinceItemResponse
 from app.schema.district import DistrictItemResponse
+from app.storage.cache.location_cache_service import location_cache_service
 from app.common.exception import CustomException
 from fastapi import status
 
 
 class LocationHelper:
     def get_province_info_by_id(self, db: Session, id: int) -> ProvinceItemResponse:
+        response = location_cache_service.get_local_province(id)
+        if response:
+            return response
+
         province = provinceCRUD.get(db, id)
-        return ProvinceItemResponse(**province.__dict__) if province else None
+        if not province:
+            return None
+
+        response = ProvinceItemResponse(**province.__dict__)
+        location_cache_service.set_local_province(id, response)
+        return response
 
     def get_province_info(self, province: Province) -> ProvinceItemResponse:
         return ProvinceItemResponse(**province.__dict__) if province else None
 
     def get_district_info_by_id(self, db: Session, id: int) -> DistrictItemResponse:
+        response = location_cache_service.get_local_district(id)
+        if response:
+            return response
+
         district = districtCRUD.get(db, id)
-        return DistrictItemResponse(**district.__dict__) if district else None
+        if not district:
+            return None
+
+        response = DistrictItemResponse(**district.__dict__)
+        location_cache_service.set_local_district(id, response)
+        return response
 
     def get_district_info(self, district: District) -> DistrictItemResponse:
         return DistrictItemResponse(**district.__dict__) if district else None
@@ -1,13 +1,170 @@
+import json
+from collections import defaultdict
+from fastapi.encoders import jsonable_encoder
 from redis.asyncio import Redis
 from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
 
 
-from app.model import Account
+from app.model import Account, Company, Message, MessageImage, MessageReaction
+from app.crud import (
+    account as accountCRUD,
+    company as companyCRUD,
+    message as messageCRUD,
+    message_image as message_imageCRUD,
+    message_reaction as message_reactionCRUD,
+)
 from app.schema.account import AccountBasicResponse
+from app.schema.message import MessageResponse
+from app.schema.message_reaction import MessageReactionResponse
+from app.schema.message_image import MessageImageResponse
+from app.core import constant
+from app.core.company.company_helper import company_helper
+from app.hepler.enum import MessageType, Role
+from app.storage.cache.message_cache_service import message_cache_service
 
 
 class MessageHelper:
-    pass
+    def get_authors(
+        self, db: Session, account_ids: List[int]
+    ) -> Dict[int, AccountBasicResponse]:
+        """Author projections by account id, companies of business accounts
+        loaded in one query"""
+        accounts: List[Account] = accountCRUD.get_multi_by_ids(db, account_ids)
+        business_ids = [
+            account.id for account in accounts if account.role == Role.BUSINESS
+        ]
+        companies: Dict[int, Company] = (
+            {
+                company.business_id: company
+                for company in companyCRUD.get_by_business_ids(db, business_ids)
+            }
+            if business_ids
+            else {}
+        )
+        return {
+            account.id: AccountBasicResponse(
+                **account.__dict__,
+                company=company_helper.get_info_general(companies.get(account.id)),
+            )
+            for account in accounts
+        }
+
+    def get_list_message_response(
+        self, db: Session, messages: List[Message], current_user: Account = None
+    ) -> List[MessageResponse]:
+        """Hydrate a page of messages with a constant number of queries: the
+        reactions of the current user, parents, images and authors are each
+        loaded for the whole page, and every author is projected once"""
+        parents: Dict[int, Message] = {message.id: message for message in messages}
+        missing_parent_ids = {
+            message.parent_id
+            for message in messages
+            if message.parent_id and message.parent_id not in parents
+        }
+        if missing_parent_ids:
+            parents.update(
+                {
+                    parent.id: parent
+                    for parent in messageCRUD.get_multi_by_ids(
+                        db, list(missing_parent_ids)
+                    )
+                }
+            )
+
+        images: Dict[int, List[MessageImage]] = defaultdict(list)
+        for image in message_imageCRUD.get_by_message_ids(
+            db,
+            [message.id for message in messages if message.type == MessageType.IMAGE],
+        ):
+            images[image.message_id].append(image)
+
+        authors = self.get_authors(
+            db, list({message.account_id for message in messages})
+        )
+
+        response = []
+        for message in messages:
+            parent_message = parents.get(message.parent_id)
+            response.append(
+                MessageResponse(
+                    **message.__dict__,
+                    user=authors[message.account_id],
+                    parent=parent_message.__dict__ if parent_message else None,
+                    attachments=[
+                        MessageImageResponse(**image.__dict__)
+                        for image in images[message.id]
+                    ],
+                )
+            )
+        if current_user:
+            self.set_reactions(db, response, current_user)
+        return response
+
+    def set_reactions(
+        self, db: Session, messages: List[MessageResponse], current_user: Account
+    ) -> None:
+        """Attach the reactions of the current user with one query"""
+        reactions: Dict[int, MessageReaction] = {
+            reaction.message_id: reaction
+            for reaction in message_reactionCRUD.get_by_account_id_and_message_ids(
+                db, current_user.id, [message.id for message in messages]
+            )
+        }
+        for message in messages:
+            reaction = reactions.get(message.id)
+            message.reaction = (
+                MessageReactionResponse(**reaction.__dict__) if reaction else None
+            )
+
+    def get_recent_value(self, message: MessageResponse) -> str:
+        # Encoded like the API response, so parent rows lose their ORM state
+        return json.dumps(
+            jsonable_encoder(message.model_copy(update={"reaction": None}))
+        )
+
+    async def get_recent(
+        self, db: Session, redis: Redis, conversation_id: int, limit: int
+    ) -> Optional[List[MessageResponse]]:
+        """The first page of a conversation from its recent message buffer,
+        seeded from the database on a miss; None if Redis is unavailable"""
+        try:
+            values = await message_cache_service.get_recent(
+                redis, conversation_id=conversation_id, limit=limit
+            )
+            if values is not None:
+                return [MessageResponse.model_validate_json(value) for value in values]
+
+            messages: List[Message] = messageCRUD.get_by_conversation_id(
+                db, conversation_id=conversation_id, limit=constant.MESSAGE_RECENT_SIZE
+            )
+            response = self.get_list_message_response(db, messages)
+            await message_cache_service.seed_recent(
+                redis,
+                conversation_id=conversation_id,
+                values=[
+                    (message.id, self.get_recent_value(message)) for message in response
+                ],
+                complete=len(messages) < constant.MESSAGE_RECENT_SIZE,
+            )
+            return response[:limit]
+        except Exception as e:
+            print(e)
+        return None
+
+    async def append_recent(
+        self, redis: Redis, message: Message, user: AccountBasicResponse
+    ) -> None:
+        try:
+            await message_cache_service.append_recent(
+                redis,
+                conversation_id=message.conversation_id,
+                value=self.get_recent_value(
+                    MessageResponse(**message.__dict__, user=user)
+                ),
+            )
+        except Exception as e:
+            print(e)
 
 
 message_helper = MessageHelper()
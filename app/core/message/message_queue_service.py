@@ -0,0 +1,218 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError, WatchError
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.crud import message as messageCRUD
+from app.db.base import SessionLocal
+from app.model import Message
+from app.schema.message import MessageCreate
+from app.hepler.snowflake import snowflake
+from app.storage.redis import get_redis
+from app.core.loggers import logger
+
+
+class MessageQueueService:
+    """Write-behind persistence of chat messages.
+
+    A queued message gets its snowflake id in the app and is appended to a
+    Redis Stream, so it can be broadcast without waiting on MySQL. Every
+    worker reads the stream in one consumer group and inserts it in batches.
+    Entries are acknowledged once stored and entries left pending by a dead
+    consumer are claimed again, so delivery is at least once and inserts
+    skip the ids already stored.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        block: int = 1000,
+        claim_idle: int = 30000,
+        lease: int = 60,
+    ):
+        self.stream = "message_stream"
+        self.group = "message_writer"
+        self.worker_key = "snowflake_worker:"
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.block = block
+        self.claim_idle = claim_idle
+        self.lease = lease
+        self.lease_tried_at = 0.0
+        self.lease_failed = False
+        self.group_created = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def renew_worker_id(self, redis: Redis, worker_id: int) -> bool:
+        """Extend the lease of worker_id if this process still holds it"""
+        key = self.worker_key + str(worker_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != self.consumer.encode():
+                    return False
+                pipe.multi()
+                pipe.expire(key, self.lease)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def lease_worker_id(self, redis: Redis) -> None:
+        """Hold a snowflake worker id so live workers never share one.
+
+        The held id is renewed in place; ids are generated only until shortly
+        before the lease would expire, so a worker whose renewals stall stops
+        before another one can take its id over.
+        """
+        started_at = time.monotonic()
+        valid_until = started_at + self.lease * 5 / 6
+        worker_id = snowflake.worker_id
+        if worker_id is not None and await self.renew_worker_id(redis, worker_id):
+            snowflake.set_worker_id(worker_id, valid_until)
+            return
+
+        snowflake.set_worker_id(None)
+        for worker_id in range(snowflake.unleased_worker_id):
+            key = self.worker_key + str(worker_id)
+            if await redis.set(key, self.consumer, nx=True, ex=self.lease):
+                snowflake.set_worker_id(worker_id, valid_until)
+                return
+        raise RuntimeError("No snowflake worker id left")
+
+    async def keep_worker_id(self, redis: Redis) -> None:
+        """Lease or renew the worker id, logging only when it is lost.
+
+        Without one enqueue fails and messages are inserted directly, the
+        queue itself is still drained.
+        """
+        self.lease_tried_at = time.monotonic()
+        try:
+            await self.lease_worker_id(redis)
+        except Exception as e:
+            if not self.lease_failed:
+                logger.error(
+                    f"Failed to lease a snowflake worker id, "
+                    f"messages are inserted directly: {e}"
+                )
+            self.lease_failed = True
+            return
+        if self.lease_failed:
+            logger.info(f"Leased snowflake worker id {snowflake.worker_id}")
+        self.lease_failed = False
+
+    async def enqueue(self, redis: Redis, obj_in: MessageCreate) -> Message:
+        """Queue a new message for insertion, returns it unsaved"""
+        data = {
+            **obj_in.model_dump(),
+            "id": snowflake.next_id(),
+            "is_pinned": 0,
+            "like_count": 0,
+            "dislike_count": 0,
+            # Same clock as messageCRUD.create, naive local like the rest
+            "created_at": datetime.now(),
+        }
+        await redis.xadd(self.stream, {"data": json.dumps(jsonable_encoder(data))})
+        return Message(**data)
+
+    def decode(self, fields: Dict[bytes, bytes]) -> Dict[str, Any]:
+        data = json.loads(fields[b"data"])
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return data
+
+    def insert(self, messages: List[Dict[str, Any]]) -> None:
+        with SessionLocal() as db:
+            try:
+                messageCRUD.create_many_if_not_exists(db, messages)
+                return
+            except IntegrityError:
+                db.rollback()
+            # One bad message, say of a deleted conversation, must not block the rest
+            for message in messages:
+                try:
+                    messageCRUD.create_many_if_not_exists(db, [message])
+                except IntegrityError as e:
+                    db.rollback()
+                    logger.error(f"Dropped queued message {message['id']}: {e}")
+
+    async def read(self, redis: Redis) -> List[Tuple[bytes, Optional[dict]]]:
+        """Entries pending too long on any consumer first, then new ones"""
+        response = await redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            self.claim_idle,
+            "0-0",
+            count=self.batch_size,
+        )
+        if response[1]:
+            return response[1]
+        response = await redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=self.block,
+        )
+        return response[0][1] if response else []
+
+    async def persist(self, redis: Redis, entries: List[Tuple[bytes, dict]]) -> None:
+        # Entries deleted while pending come back without fields
+        messages = [self.decode(fields) for _, fields in entries if fields]
+        if messages:
+            await asyncio.to_thread(self.insert, messages)
+        ids = [id for id, _ in entries]
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.xack(self.stream, self.group, *ids)
+            pipe.xdel(self.stream, *ids)
+            await pipe.execute()
+
+    async def create_group(self, redis: Redis) -> None:
+        try:
+            await redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self.group_created = True
+
+    async def start(self) -> None:
+        # Messages cannot be queued until a worker id is leased
+        try:
+            await self.keep_worker_id(await get_redis())
+        except Exception as e:
+            logger.error(f"Failed to lease a snowflake worker id: {e}")
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Queued entries stay in the stream for the next start"""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                redis = await get_redis()
+                if time.monotonic() - self.lease_tried_at > self.lease / 3:
+                    await self.keep_worker_id(redis)
+                if not self.group_created:
+                    await self.create_group(redis)
+                entries = await self.read(redis)
+                if entries:
+                    await self.persist(redis, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in message queue: {e}")
+                await asyncio.sleep(1)
+
+
+message_queue_service = MessageQueueService()
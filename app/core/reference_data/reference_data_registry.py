@@ -0,0 +1,96 @@
+import time
+from fastapi import status
+from sqlalchemy.orm import Session
+from typing import Dict, List, Set
+
+from app.crud import (
+    skill as skillCRUD,
+    category as categoryCRUD,
+    province as provinceCRUD,
+    district as districtCRUD,
+    experience as experienceCRUD,
+    job_position as job_positionCRUD,
+    field as fieldCRUD,
+)
+from app.storage.local_cache import local_cache_invalidator
+from app.common.exception import CustomException
+
+
+class ReferenceDataRegistry:
+    def __init__(self, refresh_interval: int = 60 * 10):
+        # Shares the config cache name so config writes reload it on every worker.
+        self.name = "config_cache_"
+        self.version = 0
+        self.refresh_interval = refresh_interval
+        self.loaded_at: float = None
+        self.cruds = {
+            "skill": skillCRUD,
+            "category": categoryCRUD,
+            "province": provinceCRUD,
+            "district": districtCRUD,
+            "experience": experienceCRUD,
+            "position": job_positionCRUD,
+            "field": fieldCRUD,
+        }
+        self.errors = {
+            "skill": (status.HTTP_404_NOT_FOUND, "Skill not found"),
+            "category": (status.HTTP_404_NOT_FOUND, "Category not found"),
+            "province": (status.HTTP_400_BAD_REQUEST, "Province not found"),
+            "district": (status.HTTP_400_BAD_REQUEST, "District not found"),
+            "experience": (status.HTTP_404_NOT_FOUND, "Experience not found"),
+            "position": (status.HTTP_404_NOT_FOUND, "Position not found"),
+            "field": (status.HTTP_404_NOT_FOUND, "Field not found"),
+        }
+        self.ids: Dict[str, Set[int]] = {kind: set() for kind in self.cruds}
+
+    def load(self, db: Session) -> None:
+        self.ids = {kind: set(crud.get_ids(db)) for kind, crud in self.cruds.items()}
+        self.loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        self.loaded_at = None
+
+    def ensure_loaded(self, db: Session) -> None:
+        if (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > self.refresh_interval
+        ):
+            self.load(db)
+
+    def check_ids(self, db: Session, kind: str, ids: List[int]) -> List[int]:
+        ids = {id for id in ids or [] if id is not None}
+        if not ids:
+            return []
+
+        self.ensure_loaded(db)
+        known_ids = self.ids[kind]
+        missing_ids = ids - known_ids
+        if missing_ids:
+            found_ids = set(self.cruds[kind].get_existing_ids(db, list(missing_ids)))
+            known_ids |= found_ids
+            missing_ids -= found_ids
+
+        if missing_ids:
+            status_code, msg = self.errors[kind]
+            raise CustomException(status_code=status_code, msg=msg)
+
+        return list(ids)
+
+    def check_locations(self, db: Session, locations: List[dict]) -> List[dict]:
+        if not locations:
+            return locations
+
+        if any(location.get("province_id") is None for location in locations):
+            status_code, msg = self.errors["province"]
+            raise CustomException(status_code=status_code, msg=msg)
+
+        self.check_ids(
+            db, "province", [location["province_id"] for location in locations]
+        )
+        self.check_ids(
+            db, "district", [location.get("district_id") for location in locations]
+        )
+        return locations
+
+
+reference_data_registry = local_cache_invalidator.register(ReferenceDataRegistry())
@@ -7,6 +7,8 @@ from app.schema.job_skill import JobSkillCreate
 from app.model import Skill
 from app.hepler.enum import JobSkillType
 from app.common.exception import CustomException
+from app.storage.cache.config_cache_service import config_cache_service
+from app.core.reference_data.reference_data_registry import reference_data_registry
 from fastapi import status
 
 
@@ -18,14 +20,23 @@ class SkillHelper:
         return [self.get_info(skill) for skill in skills]
 
     def get_info_by_id(self, db: Session, id: int) -> dict:
+        response = config_cache_service.get_local_skill(id)
+        if response:
+            return response
+
         skill = skillCRUD.get(db, id)
-        return self.get_info(db, skill) if skill else None
+        if not skill:
+            return None
+
+        response = self.get_info(skill)
+        config_cache_service.set_local_skill(id, response)
+        return response
 
     def get_list_by_ids(self, db: Session, ids: list[int]) -> list:
         return [self.get_info_by_id(db, id) for id in ids]
 
     def check_valid(self, db: Session, id: int) -> int:
-        skill = skillCRUD.get(db, id)
+        skill = self.get_info_by_id(db, id)
         if not skill:
             raise CustomException(
                 status_code=status.HTTP_404_NOT_FOUND, msg="Skill not found"
@@ -34,7 +45,8 @@ class SkillHelper:
         return id
 
     def check_list_valid(self, db: Session, ids: list[int]) -> bool:
-        return [self.check_valid(db, id) for id in ids]
+        reference_data_registry.check_ids(db, "skill", ids)
+        return ids
 
     def create_with_job_id(
         self,
@@ -42,13 +54,17 @@ class SkillHelper:
         job_id: int,
         ids: list[dict],
         type: JobSkillType = JobSkillType.MUST_HAVE,
+        commit: bool = True,
     ) -> list:
         ids = list(set(ids))
-        for skill in ids:
-            skill = job_skillCRUD.create(
-                db,
-                obj_in=JobSkillCreate(job_id=job_id, skill_id=skill, type=type),
-            )
+        job_skillCRUD.create_many(
+            db,
+            objs_in=[
+                JobSkillCreate(job_id=job_id, skill_id=skill, type=type)
+                for skill in ids
+            ],
+            commit=commit,
+        )
 
         return ids
 
@@ -7,6 +7,8 @@ from app.schema.skill import SkillCreateRequest, SkillUpdateRequest
 from app.schema.page import Pagination
 from app.core import constant
 from app.storage.cache.config_cache_service import config_cache_service
+from app.core.suggest.suggest_service import suggest_service
+from app.hepler.enum import SuggestType
 from app.core.skill.skill_helper import skill_helper
 from app.common.exception import CustomException
 from app.common.response import CustomResponse
@@ -45,6 +47,14 @@ class SkillService:
         skill_data = SkillCreateRequest(**data)
         response = skillCRUD.create(db, obj_in=skill_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.index(
+                SuggestType.SKILL, [(response.id, response.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def update(self, db: Session, id: int, data: dict):
@@ -56,6 +66,14 @@ class SkillService:
 
         response = skillCRUD.update(db, db_obj=skill, obj_in=skill_data)
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.index(
+                SuggestType.SKILL, [(response.id, response.name)]
+            )
+        except Exception as e:
+            print(e)
+
         return CustomResponse(data=response)
 
     async def delete(self, db: Session, id: int):
@@ -65,6 +83,12 @@ class SkillService:
 
         skillCRUD.remove(db, id=id)
 
+        try:
+            await config_cache_service.invalidate_local()
+            await suggest_service.remove(SuggestType.SKILL, [id])
+        except Exception as e:
+            print(e)
+
         return CustomResponse(msg="Skill has been deleted")
 
 
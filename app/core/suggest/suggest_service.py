@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, time
+from redis.asyncio import Redis
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+
+from app.crud import (
+    company as companyCRUD,
+    job as jobCRUD,
+    skill as skillCRUD,
+    job_position as job_positionCRUD,
+)
+from app.schema.suggest import SuggestRequest, SuggestResponse
+from app.hepler.enum import SuggestType
+from app.hepler.text_search import TextSearchHelper
+from app.db.base import SessionLocal
+from app.storage.redis import get_redis
+from app.storage.cache.suggest_cache_service import suggest_cache_service
+from app.common.response import CustomResponse
+from app.core.loggers import logger
+
+
+class SuggestService:
+    """Prefix index of names for search suggestions.
+
+    Writes keep the index current and jobs are removed once past their
+    deadline. A periodic rebuild, run by one worker at a time, corrects any
+    drift without emptying the index.
+    """
+
+    def __init__(self, expire_interval: int = 60, rebuild_interval: int = 60 * 60 * 6):
+        self.expire_interval = expire_interval
+        self.rebuild_interval = rebuild_interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def suggest(self, redis: Redis, data: dict) -> CustomResponse:
+        suggest_data = SuggestRequest(**data)
+        types = [suggest_data.type] if suggest_data.type else list(SuggestType)
+
+        response = {}
+        for type in types:
+            items = await suggest_cache_service.search(
+                redis, type.value, suggest_data.keyword, suggest_data.limit
+            )
+            if type == SuggestType.JOB:
+                items = self.unique_names(items)
+            response[type.value] = [{"id": id, "name": name} for id, name in items]
+
+        return CustomResponse(data=SuggestResponse(**response))
+
+    def unique_names(self, items: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Many jobs share a title, keep the newest one of each"""
+        seen = set()
+        unique_items = []
+        for id, name in items:
+            folded = TextSearchHelper.fold(name)
+            if folded not in seen:
+                seen.add(folded)
+                unique_items.append((id, name))
+        return unique_items
+
+    async def index(
+        self,
+        type: SuggestType,
+        items: List[Tuple[int, str]],
+        redis: Redis = None,
+        deadlines: Dict[int, float] = None,
+    ) -> None:
+        redis = redis or await get_redis()
+        await suggest_cache_service.add_items(redis, type.value, items, deadlines)
+
+    async def remove(
+        self, type: SuggestType, ids: List[int], redis: Redis = None
+    ) -> None:
+        redis = redis or await get_redis()
+        await suggest_cache_service.remove_items(redis, type.value, ids)
+
+    async def index_jobs(self, rows: List[tuple], redis: Redis = None) -> None:
+        """Index (id, title, deadline) rows of active jobs until their deadline"""
+        await self.index(
+            SuggestType.JOB,
+            [(id, title) for id, title, _ in rows],
+            redis,
+            # deadline >= NOW() stops matching at the start of the day
+            {
+                id: datetime.combine(deadline, time.min).timestamp()
+                for id, _, deadline in rows
+            },
+        )
+
+    async def sync_jobs(self, db: Session, ids: List[int], redis: Redis = None) -> None:
+        """Index the active jobs among ids after a status or deadline change,
+        remove the others"""
+        rows = jobCRUD.get_published_titles(db, ids)
+        active_ids = {id for id, _, _ in rows}
+        await self.index_jobs(rows, redis)
+        await self.remove(
+            SuggestType.JOB, [id for id in ids if id not in active_ids], redis
+        )
+
+    async def expire(self, redis: Redis) -> int:
+        """Remove jobs whose deadline has passed"""
+        ids = await suggest_cache_service.get_expired(
+            redis, SuggestType.JOB.value, datetime.now().timestamp()
+        )
+        await self.remove(SuggestType.JOB, ids, redis)
+        return len(ids)
+
+    def get_items(self, db: Session) -> Dict[SuggestType, List[tuple]]:
+        return {
+            SuggestType.COMPANY: companyCRUD.get_names(db),
+            SuggestType.JOB: jobCRUD.get_published_titles(db),
+            SuggestType.SKILL: skillCRUD.get_names(db),
+            SuggestType.POSITION: job_positionCRUD.get_names(db),
+        }
+
+    async def rebuild(self, db: Session, redis: Redis) -> None:
+        """Bring the index in line with every company, active job, skill and
+        position, in place so suggestions keep working meanwhile"""
+        # Read before the database so items indexed meanwhile are kept
+        indexed_ids = {
+            type: await suggest_cache_service.get_ids(redis, type.value)
+            for type in SuggestType
+        }
+        items = await asyncio.to_thread(self.get_items, db)
+        for type, rows in items.items():
+            if type == SuggestType.JOB:
+                await self.index_jobs(rows, redis)
+            else:
+                await self.index(type, rows, redis)
+            ids = {row[0] for row in rows}
+            await self.remove(
+                type, [id for id in indexed_ids[type] if id not in ids], redis
+            )
+        logger.info("Suggest index rebuilt")
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                redis = await get_redis()
+                if await suggest_cache_service.lock(
+                    redis, "expire", self.expire_interval
+                ):
+                    await self.expire(redis)
+                if await suggest_cache_service.lock(
+                    redis, "rebuild", self.rebuild_interval
+                ):
+                    with SessionLocal() as db:
+                        await self.rebuild(db, redis)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in suggest index: {e}")
+            await asyncio.sleep(self.expire_interval)
+
+
+suggest_service = SuggestService()
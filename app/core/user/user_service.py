@@ -78,7 +78,7 @@ class UserService:
         avatar = user_data.avatar
         if avatar:
             key = avatar.filename
-            s3_service.upload_file(avatar, key)
+            await s3_service.async_upload_file(avatar, key)
             user_data.avatar = key
 
         account = accountCRUD.create(db, obj_in=AccountCreate(**user_data.model_dump()))
@@ -107,7 +107,7 @@ class UserService:
         avatar = user_data.avatar
         if avatar:
             key = avatar.filename
-            s3_service.upload_file(avatar, key)
+            await s3_service.async_upload_file(avatar, key)
             user_data.avatar = key
 
         account_data = AccountUpdate(**user_data.model_dump())
@@ -1,25 +1,47 @@
 from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from typing import AsyncIterator, Optional, Tuple
 
 from app.storage.redis import get_redis
 
 
 class RedisPubSubManager:
-    def __init__(self):
+    def __init__(self, channel_prefix: str = "conversation:"):
         self.redis: Redis = None
+        self.pubsub: Optional[PubSub] = None
+        self.channel_prefix = channel_prefix
+
+    def channel(self, chat_id: int) -> str:
+        return f"{self.channel_prefix}{chat_id}"
 
     async def connect(self) -> None:
+        """Open the single pattern subscription shared by every conversation"""
+        if self.pubsub is not None:
+            return
         self.redis = await get_redis()
-        self.pubsub = self.redis.pubsub()
-
-    async def subscribe(self, chat_id: int) -> Redis:
-        await self.pubsub.subscribe(chat_id)
-        return self.pubsub
-
-    async def unsubscribe(self, chat_id: int) -> None:
-        await self.pubsub.unsubscribe(chat_id)
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{self.channel_prefix}*")
+        except Exception:
+            await pubsub.close()
+            raise
+        self.pubsub = pubsub
+
+    async def listen(self) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (chat_id, message) for every conversation message"""
+        async for message in self.pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            channel: str = message["channel"].decode("utf-8")
+            chat_id = int(channel[len(self.channel_prefix) :])
+            yield chat_id, message["data"].decode("utf-8")
 
     async def publish(self, chat_id: int, message: str) -> None:
-        await self.redis.publish(chat_id, message)
+        if self.redis is None:
+            self.redis = await get_redis()
+        await self.redis.publish(self.channel(chat_id), message)
 
     async def close(self) -> None:
-        await self.pubsub.close()
+        if self.pubsub is not None:
+            await self.pubsub.close()
+            self.pubsub = None
@@ -7,6 +7,9 @@ from fastapi import status
 from app.core.websocket.websocket_manager import WebsocketManager
 from app.model import Account
 from app.core.conversation.conversation_helper import conversation_helper
+from app.core.message.message_helper import message_helper
+from app.core.message.message_queue_service import message_queue_service
+from app.core.config import settings
 from app.common.exception import CustomException
 from app.crud import (
     account as accountCRUD,
@@ -19,7 +22,6 @@ from app.hepler.enum import TypeAccount
 from app.schema.message import MessageCreate
 from app.schema.websocket import NewMessageSchema, ResponseMessageSchema
 from app.schema.account import AccountBasicResponse
-from app.storage.cache.message_cache_service import message_cache_service
 
 
 class WebsocketHelper:
@@ -43,14 +45,13 @@ class WebsocketHelper:
             response_conversation, members = await self.create_group_conversation(
                 db, websocket, redis, current_user, member_ids, websocket_manager
             )
-        try:
-            for member in members:
-                await message_cache_service.add_conversation_id_to_list(
-                    redis, user_id=member.id, conversation_id=response_conversation.id
-                )
-                pass
-        except Exception as e:
-            print(e)
+        await conversation_helper.touch_inbox(
+            db,
+            redis,
+            response_conversation.id,
+            response_conversation.created_at,
+            [member.id for member in members],
+        )
 
         return response_conversation, members
 
@@ -152,10 +153,20 @@ class WebsocketHelper:
             if message_data.attachments:
                 pass
 
-            message = messageCRUD.create(db, obj_in=message)
+            queued = None
+            if settings.MESSAGE_WRITE_BEHIND:
+                try:
+                    queued = await message_queue_service.enqueue(redis, message)
+                except Exception as e:
+                    print(e)
+            message = queued or messageCRUD.create(db, obj_in=message)
+            await conversation_helper.touch_inbox(
+                db, redis, conversation_id, message.created_at
+            )
             user: AccountBasicResponse = conversation_helper.get_user_basic_response(
                 db, current_user
             )
+            await message_helper.append_recent(redis, message, user)
             outcoming_message = ResponseMessageSchema(
                 id=message.id,
                 conversation_id=message.conversation_id,
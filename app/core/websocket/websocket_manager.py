@@ -1,25 +1,48 @@
 import asyncio
 import json
-from fastapi import WebSocket
-from redis.asyncio import Redis
-from typing import List, Dict, Set
+from fastapi import WebSocket, status
+from typing import Dict, Optional, Set
 
 from app.core.websocket.pubsub_manager import RedisPubSubManager
 from app.core.loggers import logger
 
 
 class WebsocketManager:
-    def __init__(self) -> None:
+    def __init__(self, send_queue_size: int = 256) -> None:
         self.handler: Dict[str, callable] = {}
         self.conversations: Dict[int, Set[WebSocket]] = {}
         self.pubsub = RedisPubSubManager()
         self.user_id_to_websocket: Dict[int, Set[WebSocket]] = {}
+        self.send_queue_size = send_queue_size
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.send_tasks: Dict[WebSocket, asyncio.Task] = {}
+        self.task: Optional[asyncio.Task] = None
 
     def handler_register(self, event: str, func: callable) -> None:
         self.handler[event] = func
 
+    async def start(self) -> None:
+        """Start the single reader task, which owns the subscription"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        await self.pubsub.close()
+
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
+        queue = asyncio.Queue(maxsize=self.send_queue_size)
+        self.send_queues[websocket] = queue
+        self.send_tasks[websocket] = asyncio.create_task(self.sender(websocket, queue))
+
+    async def disconnect(self, websocket: WebSocket) -> None:
+        self.send_queues.pop(websocket, None)
+        task = self.send_tasks.pop(websocket, None)
+        if task:
+            task.cancel()
 
     async def add_user(self, user_id: int, websocket: WebSocket) -> None:
         if user_id not in self.user_id_to_websocket:
@@ -29,51 +52,82 @@ class WebsocketManager:
     async def add_conversation(
         self, conversation_id: int, websocket: WebSocket
     ) -> None:
-        if conversation_id in self.conversations:
-            self.conversations[conversation_id].add(websocket)
-        else:
+        if conversation_id not in self.conversations:
             self.conversations[conversation_id] = set()
-            self.conversations[conversation_id].add(websocket)
-            await self.pubsub.connect()
-            pubsub_subscribe = await self.pubsub.subscribe(conversation_id)
-            asyncio.create_task(self.listen(pubsub_subscribe))
+        self.conversations[conversation_id].add(websocket)
 
     async def remove_conversations(
         self, conversation_id: int, websocket: WebSocket
     ) -> None:
-        self.conversations[conversation_id].remove(websocket)
-        if len(self.conversations[conversation_id]) == 0:
+        websockets = self.conversations.get(conversation_id)
+        if websockets is None:
+            return
+        websockets.discard(websocket)
+        if len(websockets) == 0:
             del self.conversations[conversation_id]
-            await self.pubsub.unsubscribe(conversation_id)
 
     async def remove_user(self, user_id: int, websocket: WebSocket) -> None:
-        self.user_id_to_websocket[user_id].remove(websocket)
-        if len(self.user_id_to_websocket[user_id]) == 0:
+        websockets = self.user_id_to_websocket.get(user_id)
+        if websockets is None:
+            return
+        websockets.discard(websocket)
+        if len(websockets) == 0:
             del self.user_id_to_websocket[user_id]
 
     async def broadcast(self, conversation_id: int, message: str | dict) -> None:
         if isinstance(message, dict):
             message = json.dumps(message)
-        print(f"Broadcasting to {conversation_id}: {message}")
-        print(self.conversations)
-        print(self.user_id_to_websocket)
         await self.pubsub.publish(conversation_id, message)
 
-    async def listen(self, pubsub_subscribe: Redis) -> None:
+    def send(self, websocket: WebSocket, message: str) -> None:
+        """Queue a message for one socket, closing it if it cannot keep up"""
+        queue = self.send_queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Websocket send queue is full, closing slow client")
+            self.send_queues.pop(websocket, None)
+            task = self.send_tasks.pop(websocket, None)
+            if task:
+                task.cancel()
+            asyncio.create_task(self.close(websocket))
+
+    async def sender(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
         try:
             while True:
-                message = await pubsub_subscribe.get_message(
-                    ignore_subscribe_messages=True
-                )
-                if message is not None:
-                    conversation_id = message["channel"].decode("utf-8")
-                    message = message["data"].decode("utf-8")
-                    conversation_id: int = int(conversation_id)
-                    for ws in self.conversations[conversation_id]:
-                        await ws.send_text(message)
+                message = await queue.get()
+                await websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in sender: {e}")
 
+    async def close(self, websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
         except Exception as e:
-            logger.error(f"Error in listen: {e}")
+            logger.error(f"Error closing websocket: {e}")
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                await self.pubsub.connect()
+                async for conversation_id, message in self.pubsub.listen():
+                    for ws in self.conversations.get(conversation_id, ()):
+                        self.send(ws, message)
+                logger.warning("Websocket pubsub stopped, subscribing again")
+                await self.pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in listen: {e}")
+                await asyncio.sleep(1)
 
     async def send_error(self, websocket: WebSocket, message: str) -> None:
-        await websocket.send_json({"status": "error", "message": message})
+        data = {"status": "error", "message": message}
+        if websocket in self.send_queues:
+            self.send(websocket, json.dumps(data))
+        else:
+            await websocket.send_json(data)
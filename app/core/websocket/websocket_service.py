@@ -6,7 +6,7 @@ from json.decoder import JSONDecodeError
 
 from app.core.websocket.websocket_handler import websocket_handler, websocket_manager
 from app.model import Account
-from app.crud import conversation as conversationCRUD
+from app.core.conversation.conversation_helper import conversation_helper
 from app.storage.cache.message_cache_service import message_cache_service
 
 
@@ -20,23 +20,18 @@ class WebsocketService:
 
         conversation_ids: List[int] = None
         try:
-            conversation_ids = (
-                await message_cache_service.get_cache_list_conversation_id(
-                    redis, user_id=current_user.id
-                )
+            conversation_ids = await message_cache_service.get_inbox_ids(
+                redis, user_id=current_user.id
             )
         except Exception as e:
             print(e)
-        if not conversation_ids:
-            conversation_ids = conversationCRUD.get_ids_by_account_id(
-                db, account_id=current_user.id
-            )
-            try:
-                await message_cache_service.cache_list_conversation_id(
-                    redis, user_id=current_user.id, conversation_ids=conversation_ids
+        if conversation_ids is None:
+            conversation_ids = [
+                id
+                for id, _ in await conversation_helper.load_inbox(
+                    db, redis, current_user.id
                 )
-            except Exception as e:
-                print(e)
+            ]
 
         for conversation_id in conversation_ids:
             await websocket_manager.add_conversation(conversation_id, websocket)
@@ -80,10 +75,11 @@ class WebsocketService:
                     continue
         except WebSocketDisconnect:
             print("Disconnect---------")
+        finally:
             await websocket_manager.remove_user(current_user.id, websocket)
             for conversation_id in conversation_ids:
                 await websocket_manager.remove_conversations(conversation_id, websocket)
-            await websocket_manager.pubsub.close()
+            await websocket_manager.disconnect(websocket)
 
 
 websocket_service = WebsocketService()
@@ -9,6 +9,7 @@ from app.schema.work_location import (
     WorkLocatioUpdate,
 )
 from app.core.location.location_helper import location_helper
+from app.core.reference_data.reference_data_registry import reference_data_registry
 from app.model import WorkLocation
 from app.common.exception import CustomException
 
@@ -35,15 +36,14 @@ class WorkLocationHepler:
         return work_locations
 
     def create_with_job_id(
-        self, db: Session, job_id: int, data: List[dict]
+        self, db: Session, job_id: int, data: List[dict], commit: bool = True
     ) -> List[dict]:
-        return [
-            self.create(
-                db,
-                WorkLocatioCreate(job_id=job_id, **work_location),
-            )
-            for work_location in data
+        work_locations = [
+            WorkLocatioCreate(job_id=job_id, **work_location) for work_location in data
         ]
+        work_locationCRUD.create_many(db, objs_in=work_locations, commit=commit)
+
+        return [work_location.model_dump() for work_location in work_locations]
 
     def create(self, db: Session, data: WorkLocatioCreate) -> dict:
         work_location = work_locationCRUD.create(db, obj_in=data)
@@ -111,7 +111,7 @@ class WorkLocationHepler:
         if not data or data is None:
             return data
 
-        return [self.check_valid(db, province_district) for province_district in data]
+        return reference_data_registry.check_locations(db, data)
 
 
 work_location_helper = WorkLocationHepler()
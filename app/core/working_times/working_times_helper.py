@@ -79,18 +79,13 @@ class WorkingTimesHelper:
         working_timeCRUD.remove(db, id)
 
     def create_with_job_id(
-        self, db: Session, job_id: int, data: List[dict]
+        self, db: Session, job_id: int, data: List[dict], commit: bool = True
     ) -> List[dict]:
-        working_times = []
-        for working_time in data:
-            working_time_data = WorkingTimeCreate(
-                job_id=job_id, **working_time
-            ).model_dump()
-
-            working_time = working_timeCRUD.create(db, obj_in=working_time_data)
-            working_times.append(
-                WorkingTimeResponse(**working_time.__dict__).model_dump()
-            )
+        working_times = [
+            WorkingTimeCreate(job_id=job_id, **working_time).model_dump()
+            for working_time in data
+        ]
+        working_timeCRUD.create_many(db, objs_in=working_times, commit=commit)
 
         return working_times
 
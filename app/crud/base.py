@@ -1,10 +1,13 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, or_, and_, func
 
 from app.db.base_class import Base
 from app.hepler.enum import Role
+from app.hepler.cursor import CursorHelper
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -21,6 +24,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi_by_ids(self, db: Session, ids: List[int]) -> List[ModelType]:
         return db.query(self.model).filter(self.model.id.in_(ids)).all()
 
+    def get_ids(self, db: Session) -> List[int]:
+        return [id for (id,) in db.query(self.model.id).all()]
+
+    def get_names(self, db: Session) -> List[Tuple[int, str]]:
+        return db.query(self.model.id, self.model.name).all()
+
+    def get_existing_ids(self, db: Session, ids: List[int]) -> List[int]:
+        return [
+            id for (id,) in db.query(self.model.id).filter(self.model.id.in_(ids)).all()
+        ]
+
     def get_multi(
         self,
         db: Session,
@@ -43,20 +57,97 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             .all()
         )
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+    def paginate(
+        self,
+        query,
+        *,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: str = "id",
+        order_by: str = "desc",
+        cursor: str = None,
+        **kwargs,
+    ):
+        """Order by (sort_by, id), then page after the cursor if given else by skip"""
+        column = getattr(self.model, sort_by or "id")
+        if order_by == "asc":
+            query = query.order_by(column, self.model.id)
+        else:
+            query = query.order_by(column.desc(), self.model.id.desc())
+        if cursor:
+            query = query.filter(self.cursor_filter(column, cursor, order_by))
+        else:
+            query = query.offset(skip or 0)
+        return query.limit(limit)
+
+    def capped_count(self, db: Session, query, cap: int) -> int:
+        """Count the rows of query but stop scanning after cap + 1 rows"""
+        return (
+            db.query(func.count()).select_from(query.limit(cap + 1).subquery()).scalar()
+        )
+
+    async def async_capped_count(self, db: AsyncSession, query, cap: int) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(query.limit(cap + 1).subquery())
+        )
+        return result.scalar()
+
+    def cursor_filter(self, column, cursor: str, order_by: str):
+        # MySQL sorts NULL first ascending and last descending
+        value, id = CursorHelper.decode(cursor)
+        if order_by == "asc":
+            if value is None:
+                return or_(
+                    and_(column.is_(None), self.model.id > id), column.is_not(None)
+                )
+            return or_(column > value, and_(column == value, self.model.id > id))
+        if value is None:
+            return and_(column.is_(None), self.model.id < id)
+        return or_(
+            column < value,
+            and_(column == value, self.model.id < id),
+            column.is_(None),
+        )
+
+    def create(
+        self, db: Session, *, obj_in: CreateSchemaType, commit: bool = True
+    ) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
         return db_obj
 
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: List[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True,
+    ) -> None:
+        if not objs_in:
+            return
+        db.execute(
+            insert(self.model),
+            [
+                obj_in.model_dump() if isinstance(obj_in, BaseModel) else obj_in
+                for obj_in in objs_in
+            ],
+        )
+        if commit:
+            db.commit()
+
     def update(
         self,
         db: Session,
         *,
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
     ) -> ModelType:
         obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
@@ -68,12 +159,18 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 if field in update_data and update_data[field] is not None:
                     setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
         return db_obj
 
-    def remove(self, db: Session, id: int) -> ModelType:
+    def remove(self, db: Session, id: int, commit: bool = True) -> ModelType:
         obj = db.query(self.model).filter(self.model.id == id).first()
         db.delete(obj)
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
         return obj
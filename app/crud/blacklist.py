@@ -1,4 +1,6 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
+from typing import List
 
 from app.model import Blacklist
 
@@ -7,6 +9,14 @@ class CRUDBlacklist:
     def get_by_token(self, db: Session, token: str) -> Blacklist:
         return db.query(Blacklist).filter(Blacklist.token == token).first()
 
+    def get_created_since(self, db: Session, since: datetime) -> List[str]:
+        return [
+            token
+            for token, in db.query(Blacklist.token).filter(
+                Blacklist.created_at >= since
+            )
+        ]
+
     def create(self, db: Session, *, token: str) -> Blacklist:
         db_obj = Blacklist(token=token)
         db.add(db_obj)
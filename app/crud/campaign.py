@@ -26,13 +26,14 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit: int = 10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
         status: CampaignStatus = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
             query, business_id=business_id, company_id=company_id, status=status
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count(
@@ -60,6 +61,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit=10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
@@ -70,7 +72,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
             job_status=JobStatus.PUBLISHED,
             job_deadline=True,
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count_has_published_job(
@@ -102,6 +104,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit=10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
@@ -110,7 +113,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
             company_id=company_id,
             status=CampaignStatus.OPEN,
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count_open(
@@ -140,6 +143,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit=10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
@@ -153,7 +157,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
             CVApplication.status == CVApplicationStatus.PENDING
             and CVApplication.created_at >= func.now() - text("INTERVAL 1 DAY")
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count_has_new_application(
@@ -216,6 +220,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit=10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
@@ -227,7 +232,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         query = query.join(Job).filter(
             Job.status == JobStatus.PUBLISHED, Job.deadline < func.now()
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count_has_published_job_expired(
@@ -259,6 +264,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
         limit=10,
         sort_by: SortBy = SortBy.ID,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
     ) -> List[Campaign]:
         query = db.query(self.model)
         query = self.apply_filter(
@@ -267,7 +273,7 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
             company_id=company_id,
             job_status=JobStatus.PENDING,
         )
-        result = self.return_campaign(query, skip, limit, sort_by, order_by)
+        result = self.return_campaign(query, skip, limit, sort_by, order_by, cursor)
         return result
 
     def count_has_pending_job(
@@ -312,24 +318,29 @@ class CRUDCampaign(CRUDBase[Campaign, CampaignCreate, CampaignUpdate]):
 
         return query
 
-    def return_campaign(self, query, skip, limit, sort_by, order_by) -> List[Campaign]:
-        query = (
-            query.order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == "desc"
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def return_campaign(
+        self, query, skip, limit, sort_by, order_by, cursor=None
+    ) -> List[Campaign]:
+        query = self.paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            order_by=order_by,
+            cursor=cursor,
+        ).all()
 
         return query
 
-    def increase_count_apply(self, db: Session, campaign: Campaign) -> Campaign:
+    def increase_count_apply(
+        self, db: Session, campaign: Campaign, commit: bool = True
+    ) -> Campaign:
         campaign.count_apply += 1
-        db.commit()
-        db.refresh(campaign)
+        if commit:
+            db.commit()
+            db.refresh(campaign)
+        else:
+            db.flush()
         return campaign
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, distinct
 from typing import List
 
@@ -14,6 +14,16 @@ class CRUDCompany(CRUDBase[Company, CompanyCreate, CompanyUpdate]):
             db.query(self.model).filter(self.model.business_id == business_id).first()
         )
 
+    def get_by_business_ids(
+        self, db: Session, business_ids: List[int]
+    ) -> List[Company]:
+        return (
+            db.query(self.model)
+            .options(selectinload(self.model.fields))
+            .filter(self.model.business_id.in_(business_ids))
+            .all()
+        )
+
     def get_company_by_tax_code(self, db: Session, tax_code: str) -> Company:
         return db.query(self.model).filter(self.model.tax_code == tax_code).first()
 
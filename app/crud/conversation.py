@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
+from datetime import datetime
 from sqlalchemy.sql import func
 
 from .base import CRUDBase
-from app.model import Conversation, ConversationMember, Message
+from app.model import Conversation, ConversationMember
 from app.schema.conversation import ConversationCreate, ConversationUpdate
 from app.hepler.enum import ConversationType
 
@@ -51,6 +52,24 @@ class CRUDConversation(CRUDBase[Conversation, ConversationCreate, ConversationUp
         )
         return [d[0] for d in data]
 
+    def get_activity_by_account_id(
+        self, db: Session, account_id: int
+    ) -> List[Tuple[int, datetime]]:
+        """(conversation_id, last message or creation time) of an account"""
+        data = (
+            db.query(
+                Conversation.id,
+                func.coalesce(Conversation.last_message_at, Conversation.created_at),
+            )
+            .join(
+                ConversationMember,
+                ConversationMember.conversation_id == Conversation.id,
+            )
+            .filter(ConversationMember.account_id == account_id)
+            .all()
+        )
+        return [(id, activity) for id, activity in data]
+
     def get_by_account_id_and_conversation_id(
         self, db: Session, account_id: int, conversation_id: int
     ) -> Conversation:
@@ -67,33 +86,20 @@ class CRUDConversation(CRUDBase[Conversation, ConversationCreate, ConversationUp
 
     def get_by_lastest_message(
         self, db: Session, *, account_id: int, limit: int = 10, skip: int = 0, **kwargs
-    ) -> Conversation:
-        subquery = (
-            db.query(
-                Message.conversation_id,
-                func.max(Message.created_at).label("latest_message"),
-            )
-            .group_by(Message.conversation_id)
-            .subquery()
-        )
-
-        query = (
+    ) -> List[Conversation]:
+        return (
             db.query(Conversation)
             .join(
                 ConversationMember,
                 ConversationMember.conversation_id == Conversation.id,
             )
-            .join(
-                subquery,
-                subquery.c.conversation_id == Conversation.id,
-            )
             .filter(ConversationMember.account_id == account_id)
-            .order_by(subquery.c.latest_message.desc())
+            .filter(Conversation.last_message_at.isnot(None))
+            .order_by(Conversation.last_message_at.desc(), Conversation.id.desc())
             .limit(limit)
             .offset(skip)
+            .all()
         )
 
-        return query.all()
-
 
 conversation = CRUDConversation(Conversation)
@@ -1,7 +1,7 @@
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy.sql import func
-from sqlalchemy import case
-from typing import List
+from sqlalchemy import case, tuple_
+from typing import List, Tuple
 
 from .base import CRUDBase
 from app.model import ConversationMember, Account, Message
@@ -118,5 +118,68 @@ class CRUDConversationMember(
             .first()
         )
 
+    def get_account_ids_by_conversation_id(
+        self, db: Session, conversation_id: int
+    ) -> List[int]:
+        data = (
+            db.query(ConversationMember.account_id)
+            .filter(ConversationMember.conversation_id == conversation_id)
+            .all()
+        )
+        return [d[0] for d in data]
+
+    def get_by_conversation_ids(
+        self, db: Session, conversation_ids: List[int], limit: int = 5
+    ) -> List[ConversationMember]:
+        """First members of each conversation, as get_by_conversation_id, with
+        their accounts"""
+        if not conversation_ids:
+            return []
+
+        role_priority = case(
+            (ConversationMember.type == MemberType.ADMIN, 1),
+            (ConversationMember.type == MemberType.MEMBER, 2),
+            else_=3,
+        )
+        ranked = (
+            db.query(
+                ConversationMember.id,
+                func.row_number()
+                .over(
+                    partition_by=ConversationMember.conversation_id,
+                    order_by=(role_priority, ConversationMember.id),
+                )
+                .label("rank"),
+            )
+            .filter(ConversationMember.conversation_id.in_(conversation_ids))
+            .subquery()
+        )
+        return (
+            db.query(ConversationMember)
+            .join(ranked, ranked.c.id == ConversationMember.id)
+            .filter(ranked.c.rank <= limit)
+            .options(joinedload(ConversationMember.account))
+            .order_by(ConversationMember.conversation_id, ranked.c.rank)
+            .all()
+        )
+
+    def get_by_account_and_conversation_ids(
+        self, db: Session, pairs: List[Tuple[int, int]]
+    ) -> List[ConversationMember]:
+        """Members of (account_id, conversation_id) pairs, with their accounts"""
+        if not pairs:
+            return []
+
+        return (
+            db.query(ConversationMember)
+            .filter(
+                tuple_(
+                    ConversationMember.account_id, ConversationMember.conversation_id
+                ).in_(pairs)
+            )
+            .options(joinedload(ConversationMember.account))
+            .all()
+        )
+
 
 conversation_member = CRUDConversationMember(ConversationMember)
@@ -24,6 +24,7 @@ class CRUDCVApplication(CRUDBase[Job, CVApplicationCreate, CVApplicationUpdate])
         limit=10,
         sort_by: SortBy = SortBy.CREATED_AT,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
         user_id: int,
         status: CVApplicationStatus
     ) -> List[CVApplication]:
@@ -34,16 +35,14 @@ class CRUDCVApplication(CRUDBase[Job, CVApplicationCreate, CVApplicationUpdate])
             )
         else:
             query = query.filter(self.model.user_id == user_id)
-        return (
-            query.order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == OrderType.DESC
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self.paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            order_by=order_by,
+            cursor=cursor,
+        ).all()
 
     def count_by_user_id(
         self, db: Session, user_id: int, status: CVApplicationStatus
@@ -65,6 +64,7 @@ class CRUDCVApplication(CRUDBase[Job, CVApplicationCreate, CVApplicationUpdate])
         limit=10,
         sort_by: SortBy = SortBy.CREATED_AT,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
         campaign_id: int,
         status: CVApplicationStatus
     ) -> List[CVApplication]:
@@ -75,16 +75,14 @@ class CRUDCVApplication(CRUDBase[Job, CVApplicationCreate, CVApplicationUpdate])
             )
         else:
             query = query.filter(self.model.campaign_id == campaign_id)
-        return (
-            query.order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == OrderType.DESC
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self.paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            order_by=order_by,
+            cursor=cursor,
+        ).all()
 
     def count_by_campaign_id(
         self, db: Session, campaign_id: int, status: CVApplicationStatus
@@ -112,21 +110,20 @@ class CRUDCVApplication(CRUDBase[Job, CVApplicationCreate, CVApplicationUpdate])
         limit=10,
         sort_by: SortBy = SortBy.CREATED_AT,
         order_by: OrderType = OrderType.DESC,
+        cursor: str = None,
         status: CVApplicationStatus
     ) -> List[CVApplication]:
         query = db.query(self.model)
         if status:
             query = query.filter(self.model.status == status)
-        return (
-            query.order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == OrderType.DESC
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self.paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            order_by=order_by,
+            cursor=cursor,
+        ).all()
 
     def get_by_user_id_and_campaign_id(
         self,
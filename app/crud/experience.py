@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import List
 
 from app.model.job_experience import JobExperience
 
@@ -10,5 +11,13 @@ class CRUDExperience:
     def get(self, db: Session, id: int) -> JobExperience:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def get_ids(self, db: Session) -> List[int]:
+        return [id for (id,) in db.query(self.model.id).all()]
+
+    def get_existing_ids(self, db: Session, ids: List[int]) -> List[int]:
+        return [
+            id for (id,) in db.query(self.model.id).filter(self.model.id.in_(ids)).all()
+        ]
+
 
 experience = CRUDExperience(JobExperience)
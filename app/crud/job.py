@@ -1,8 +1,11 @@
+import re
 from typing import Type, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from sqlalchemy import distinct
-from sqlalchemy import case, func, or_, and_, text, exists
+from sqlalchemy import case, func, or_, and_, text, exists, select
+from sqlalchemy.dialects.mysql import match
 
 from .base import CRUDBase
 from app.model import (
@@ -17,9 +20,12 @@ from app.model import (
     JobCategory,
     Company,
     CompanyField,
+    JobSkill,
+    Skill,
 )
 from app.schema.job import JobCreate, JobUpdate
-from app.hepler.enum import JobStatus, SalaryType, JobApprovalStatus
+from app.hepler.enum import JobStatus, SalaryType, JobApprovalStatus, SortByJob
+from app.hepler.text_search import TextSearchHelper
 
 
 class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
@@ -35,6 +41,8 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
         self.company = Company
         self.company_field = CompanyField
         self.campaign = Campaign
+        self.job_skill = JobSkill
+        self.skill = Skill
 
     def get_multi(
         self,
@@ -51,19 +59,78 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
             query,
             **kwargs,
         )
-        skip = kwargs.get("skip", 0)
-        limit = kwargs.get("limit", 10)
-        sort_by = kwargs.get("sort_by", "id")
-        order_by = kwargs.get("order_by", "desc")
+        return self.paginate(query, **kwargs).distinct().all()
+
+    def get_multi_by_ids_with_relations(self, db: Session, ids: List[int]) -> List[Job]:
+        return (
+            db.query(self.model)
+            .options(*self.eager_load_options())
+            .filter(self.model.id.in_(ids))
+            .all()
+        )
+
+    def get_published_titles(self, db: Session, ids: List[int] = None) -> List[tuple]:
+        """(id, title, deadline) of every active job, or of the active ones among ids"""
         return (
-            query.order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == "desc"
-                else getattr(self.model, sort_by)
+            db.query(self.model.id, self.model.title, self.model.deadline)
+            .filter(*self.active_job_filters(ids))
+            .all()
+        )
+
+    def active_job_filters(self, ids: List[int] = None) -> list:
+        filters = [
+            self.model.status == JobStatus.PUBLISHED,
+            self.model.deadline >= func.now(),
+        ]
+        if ids is not None:
+            filters.append(self.model.id.in_(ids))
+        return filters
+
+    def get_facet_rows(self, db: Session, ids: List[int] = None) -> List[tuple]:
+        """(id, deadline, min_salary, max_salary, salary_type, company_id, approved_at)
+        of every active job, or of the active ones among ids"""
+        approved_at = (
+            db.query(
+                self.job_approval_request.job_id,
+                func.max(self.job_approval_request.updated_at).label("approved_at"),
             )
-            .offset(skip)
-            .limit(limit)
-            .distinct()
+            .filter(self.job_approval_request.status == JobApprovalStatus.APPROVED)
+            .group_by(self.job_approval_request.job_id)
+            .subquery()
+        )
+        return (
+            db.query(
+                self.model.id,
+                self.model.deadline,
+                self.model.min_salary,
+                self.model.max_salary,
+                self.model.salary_type,
+                self.campaign.company_id,
+                approved_at.c.approved_at,
+            )
+            .join(self.campaign, self.model.campaign_id == self.campaign.id)
+            .outerjoin(approved_at, self.model.id == approved_at.c.job_id)
+            .filter(*self.active_job_filters(ids))
+            .all()
+        )
+
+    def get_facet_categories(self, db: Session, ids: List[int] = None) -> List[tuple]:
+        return (
+            db.query(self.job_category.job_id, self.job_category.category_id)
+            .join(self.model, self.model.id == self.job_category.job_id)
+            .filter(*self.active_job_filters(ids))
+            .all()
+        )
+
+    def get_facet_locations(self, db: Session, ids: List[int] = None) -> List[tuple]:
+        return (
+            db.query(
+                self.work_location.job_id,
+                self.work_location.province_id,
+                self.work_location.district_id,
+            )
+            .join(self.model, self.model.id == self.work_location.job_id)
+            .filter(*self.active_job_filters(ids))
             .all()
         )
 
@@ -75,9 +142,10 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
     def count(
         self,
         db: Session,
+        cap: int = None,
         **kwargs,
     ) -> int:
-        query = db.query(func.count(self.model.id))
+        query = db.query(self.model.id if cap else func.count(self.model.id))
         if kwargs.get("province_id") or kwargs.get("district_id"):
             query = query.join(
                 self.work_location, self.model.id == self.work_location.job_id
@@ -86,6 +154,8 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
             query,
             **kwargs,
         )
+        if cap:
+            return self.capped_count(db, query, cap)
         result = query.scalar()
 
         return result
@@ -95,10 +165,6 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
         db: Session,
         **kwargs,
     ) -> List[Job]:
-        skip = kwargs.get("skip", 0)
-        limit = kwargs.get("limit", 10)
-        sort_by = kwargs.get("sort_by", "id")
-        order_by = kwargs.get("order_by", "desc")
         province_id = kwargs.get("province_id")
         district_id = kwargs.get("district_id")
 
@@ -108,14 +174,7 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
                 self.work_location, self.model.id == self.work_location.job_id
             )
         jobs = (
-            self.apply_filters(jobs_query, **kwargs)
-            .order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == "desc"
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
+            self.paginate(self.apply_filters(jobs_query, **kwargs), **kwargs)
             .distinct()
             .all()
         )
@@ -125,13 +184,16 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
     def user_count(
         self,
         db: Session,
+        cap: int = None,
         **kwargs,
     ) -> int:
-        query = db.query(func.count(self.model.id)).filter(
+        query = db.query(self.model.id if cap else func.count(self.model.id)).filter(
             Job.status == JobStatus.PUBLISHED, Job.deadline >= func.now()
         )
 
         query = self.user_apply_filters(query, **kwargs)
+        if cap:
+            return self.capped_count(db, query, cap)
 
         return query.scalar()
 
@@ -140,28 +202,162 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
         db: Session,
         **kwargs,
     ) -> List[Job]:
-        skip = kwargs.get("skip", 0)
-        limit = kwargs.get("limit", 10)
-        sort_by = kwargs.get("sort_by", "id")
-        order_by = kwargs.get("order_by", "desc")
 
         query = db.query(Job).filter(
             Job.status == JobStatus.PUBLISHED, Job.deadline >= func.now()
         )
 
-        query = (
-            self.user_apply_filters(query, **kwargs)
-            .order_by(
-                getattr(self.model, sort_by).desc()
-                if order_by == "desc"
-                else getattr(self.model, sort_by)
-            )
-            .offset(skip)
-            .limit(limit)
-        )
+        query = self.paginate(self.user_apply_filters(query, **kwargs), **kwargs)
         jobs = query.all()
         return jobs
 
+    async def async_get_multi(
+        self,
+        db: AsyncSession,
+        **kwargs,
+    ) -> List[Job]:
+        query = select(self.model)
+        if kwargs.get("province_id") or kwargs.get("district_id"):
+            query = query.join(
+                self.work_location, self.model.id == self.work_location.job_id
+            )
+
+        query = self.apply_filters(
+            query,
+            **kwargs,
+        )
+        result = await db.execute(self.paginate(query, **kwargs).distinct())
+        return result.scalars().all()
+
+    async def async_count(
+        self,
+        db: AsyncSession,
+        cap: int = None,
+        **kwargs,
+    ) -> int:
+        query = select(self.model.id if cap else func.count(self.model.id))
+        if kwargs.get("province_id") or kwargs.get("district_id"):
+            query = query.join(
+                self.work_location, self.model.id == self.work_location.job_id
+            )
+        query = self.apply_filters(
+            query,
+            **kwargs,
+        )
+        if cap:
+            return await self.async_capped_count(db, query, cap)
+        result = await db.execute(query)
+
+        return result.scalar()
+
+    async def async_user_count(
+        self,
+        db: AsyncSession,
+        cap: int = None,
+        **kwargs,
+    ) -> int:
+        query = select(self.model.id if cap else func.count(self.model.id)).filter(
+            Job.status == JobStatus.PUBLISHED, Job.deadline >= func.now()
+        )
+
+        query = self.user_apply_filters(query, **kwargs)
+        if cap:
+            return await self.async_capped_count(db, query, cap)
+        result = await db.execute(query)
+
+        return result.scalar()
+
+    async def async_user_search(
+        self,
+        db: AsyncSession,
+        **kwargs,
+    ) -> List[Job]:
+
+        query = select(Job).filter(
+            Job.status == JobStatus.PUBLISHED, Job.deadline >= func.now()
+        )
+
+        query = self.paginate(self.user_apply_filters(query, **kwargs), **kwargs)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def async_user_search_ids(
+        self,
+        db: AsyncSession,
+        **kwargs,
+    ) -> List[int]:
+        query = select(Job.id).filter(
+            Job.status == JobStatus.PUBLISHED, Job.deadline >= func.now()
+        )
+
+        query = self.paginate(self.user_apply_filters(query, **kwargs), **kwargs)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    def eager_load_options(self) -> list:
+        # Relationships read by job_helper are loaded up front, batch
+        # hydration avoids one load per job.
+        return [
+            selectinload(self.model.job_categories),
+            selectinload(self.model.must_have_skills),
+            selectinload(self.model.should_have_skills),
+        ]
+
+    def keyword_match(self, keyword: str):
+        against = TextSearchHelper.boolean_query(keyword)
+        if not against:
+            return None
+        return match(self.model.search_text, against=against).in_boolean_mode()
+
+    def keyword_filter(self, query, keyword: str):
+        keyword_match = self.keyword_match(keyword)
+        if keyword_match is None:
+            # Only one letter words, which the ngram index cannot match
+            return query.filter(self.model.title.ilike(f"%{keyword}%"))
+        return query.filter(keyword_match > 0)
+
+    def paginate(self, query, **kwargs):
+        if kwargs.get("sort_by") == SortByJob.RELEVANCE:
+            keyword = kwargs.get("keyword")
+            keyword_match = self.keyword_match(keyword) if keyword else None
+            if keyword_match is None:
+                return super().paginate(
+                    query, **{**kwargs, "sort_by": SortByJob.CREATED_AT}
+                )
+            # Relevance scores are not stable keys, so relevance pages by skip
+            return (
+                query.order_by(keyword_match.desc(), self.model.id.desc())
+                .offset(kwargs.get("skip") or 0)
+                .limit(kwargs.get("limit") or 10)
+            )
+        return super().paginate(query, **kwargs)
+
+    def build_search_text(self, job: Job, skill_names: List[str]) -> str:
+        content = " ".join(
+            [
+                job.title or "",
+                job.job_description or "",
+                job.job_requirement or "",
+                *skill_names,
+            ]
+        )
+        return TextSearchHelper.fold(re.sub(r"<[^>]+>", " ", content))
+
+    def update_search_text(self, db: Session, job: Job, commit: bool = True) -> Job:
+        skill_names = (
+            db.query(self.skill.name)
+            .join(self.job_skill, self.job_skill.skill_id == self.skill.id)
+            .filter(self.job_skill.job_id == job.id)
+            .all()
+        )
+        job.search_text = self.build_search_text(job, [name for (name,) in skill_names])
+        db.add(job)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return job
+
     def user_apply_filters(self, query, **filters):
         company_id = filters.get("company_id")
         field_id = filters.get("field_id")
@@ -221,7 +417,7 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
         if min_salary or max_salary and not salary_type:
             query = query.filter(self.model.salary_type != SalaryType.DEAL)
         if keyword:
-            query = query.filter(self.model.title.ilike(f"%{keyword}%"))
+            query = self.keyword_filter(query, keyword)
         return query
 
     def get_number_job_of_district(self, db: Session, **filters):
@@ -317,7 +513,7 @@ class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
         if deadline:
             query = query.filter(self.model.deadline >= deadline)
         if keyword:
-            query = query.filter(self.model.title.ilike(f"%{keyword}%"))
+            query = self.keyword_filter(query, keyword)
         return query
 
     def count_job_by_category(self, db: Session):
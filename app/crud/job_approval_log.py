@@ -10,7 +10,9 @@ class CRUDJobLogRequest:
     def get(self, db: Session, job_approval_request_id: int) -> Job:
         return db.query(Job).filter(Job.id == job_approval_request_id).first()
 
-    def create(self, db: Session, obj_in: JobApprovalLogCreate) -> ApprovalLog:
+    def create(
+        self, db: Session, obj_in: JobApprovalLogCreate, commit: bool = True
+    ) -> ApprovalLog:
         db_obj = ApprovalLog(
             job_approval_request_id=obj_in.job_approval_request_id,
             admin_id=obj_in.admin_id,
@@ -19,8 +21,11 @@ class CRUDJobLogRequest:
             reason=obj_in.reason,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
         return db_obj
 
 
@@ -1,3 +1,7 @@
+from datetime import datetime
+from typing import Any, Dict, List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from sqlalchemy.sql.expression import select
@@ -5,10 +9,14 @@ from sqlalchemy.orm import aliased
 
 from .base import CRUDBase
 from app.model import Message, ConversationMember
+from app.model.message import set_last_message
+from app.hepler.snowflake import snowflake
 from app.schema.message import MessageCreate, MessageUpdate
 
 
 class MessageCRUD(CRUDBase[Message, MessageCreate, MessageUpdate]):
+    create_attempts = 3
+
     def get_by_conversation_id(
         self,
         db: Session,
@@ -16,16 +24,17 @@ class MessageCRUD(CRUDBase[Message, MessageCreate, MessageUpdate]):
         conversation_id: int,
         limit: int = 20,
         skip: int = 0,
+        cursor: str = None,
         **kwargs
     ):
-        return (
-            db.query(Message)
-            .filter(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.desc())
-            .limit(limit)
-            .offset(skip)
-            .all()
-        )
+        return self.paginate(
+            db.query(Message).filter(Message.conversation_id == conversation_id),
+            skip=skip,
+            limit=limit,
+            sort_by="id",
+            order_by="desc",
+            cursor=cursor,
+        ).all()
 
     def get_count_message_unread_by_account_id_and_conversation_id(
         self, db: Session, account_id: int, conversation_id: int
@@ -52,5 +61,52 @@ class MessageCRUD(CRUDBase[Message, MessageCreate, MessageUpdate]):
             .first()
         )
 
+    def create(
+        self, db: Session, *, obj_in: MessageCreate, commit: bool = True
+    ) -> Message:
+        """Insert a message with an id that needs no worker id lease, so it
+        also works while Redis is down; retried if another process took it"""
+        obj_in_data = jsonable_encoder(obj_in)
+        for attempt in range(self.create_attempts):
+            id = snowflake.next_unleased_id()
+            # Same clock as the write-behind path
+            db_obj = Message(**obj_in_data, id=id, created_at=datetime.now())
+            db.add(db_obj)
+            try:
+                if commit:
+                    db.commit()
+                    db.refresh(db_obj)
+                else:
+                    db.flush()
+                return db_obj
+            except IntegrityError:
+                db.rollback()
+                if attempt == self.create_attempts - 1 or db.get(Message, id) is None:
+                    raise
+
+    def create_many_if_not_exists(
+        self, db: Session, objs_in: List[Dict[str, Any]]
+    ) -> int:
+        """Insert the messages whose id is not stored yet, then point their
+        conversations at the newest; returns the number inserted"""
+        existing = set(
+            db.scalars(
+                select(Message.id).filter(
+                    Message.id.in_([obj_in["id"] for obj_in in objs_in])
+                )
+            )
+        )
+        objs_in = [obj_in for obj_in in objs_in if obj_in["id"] not in existing]
+        # A bulk insert skips the after_insert listener
+        self.create_many(db, objs_in=objs_in, commit=False)
+        latest: Dict[int, int] = {}
+        for obj_in in objs_in:
+            conversation_id = obj_in["conversation_id"]
+            latest[conversation_id] = max(latest.get(conversation_id, 0), obj_in["id"])
+        for conversation_id, message_id in latest.items():
+            set_last_message(db.connection(), conversation_id, message_id)
+        db.commit()
+        return len(objs_in)
+
 
 message = MessageCRUD(Message)
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import List
 
 from .base import CRUDBase
 from app.model import MessageImage
@@ -14,6 +15,17 @@ class CRUDMessageImage:
             db.query(MessageImage).filter(MessageImage.message_id == message_id).all()
         )
 
+    def get_by_message_ids(
+        self, db: Session, message_ids: List[int]
+    ) -> List[MessageImage]:
+        if not message_ids:
+            return []
+        return (
+            db.query(MessageImage)
+            .filter(MessageImage.message_id.in_(message_ids))
+            .all()
+        )
+
     def create(self, db: Session, obj_in: MessageImageCreate) -> MessageImage:
         db_obj = MessageImage(
             message_id=obj_in.message_id, image=obj_in.url, position=obj_in.position
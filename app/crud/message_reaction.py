@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import List
 
 from .base import CRUDBase
 from app.model import MessageReaction
@@ -24,6 +25,20 @@ class CRUDMessageReaction:
             .first()
         )
 
+    def get_by_account_id_and_message_ids(
+        self, db: Session, account_id: int, message_ids: List[int]
+    ) -> List[MessageReaction]:
+        if not message_ids:
+            return []
+        return (
+            db.query(MessageReaction)
+            .filter(
+                MessageReaction.account_id == account_id,
+                MessageReaction.message_id.in_(message_ids),
+            )
+            .all()
+        )
+
     def create(self, db: Session, obj_in: MessageReactionCreate) -> MessageReaction:
         db_obj = MessageReaction(
             message_id=obj_in.message_id, account_id=obj_in.account_id, type=obj_in.type
@@ -73,10 +73,15 @@ class CRUDUser(CRUDBase[User, schema_user.UserCreate, schema_user.UserUpdate]):
         db.refresh(account)
         return db_obj
 
-    def increase_count_job_apply(self, db: Session, db_obj: User) -> User:
+    def increase_count_job_apply(
+        self, db: Session, db_obj: User, commit: bool = True
+    ) -> User:
         db_obj.count_job_apply += 1
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
+        else:
+            db.flush()
         return db_obj
 
     def get_multi(
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from .base import CRUDBase
@@ -11,6 +11,16 @@ class CRUDWorkLocation(CRUDBase[WorkLocation, WorkLocatioCreate, WorkLocatioUpda
         work_locations = db.query(self.model).filter(self.model.job_id == job_id).all()
         return work_locations
 
+    def get_by_job_ids(self, db: Session, job_ids: List[int]) -> List[WorkLocation]:
+        return (
+            db.query(self.model)
+            .options(
+                selectinload(self.model.province), selectinload(self.model.district)
+            )
+            .filter(self.model.job_id.in_(job_ids))
+            .all()
+        )
+
     def remove_by_job_id(self, db: Session, job_id: int) -> None:
         db.query(self.model).filter(self.model.job_id == job_id).delete()
         db.commit()
@@ -10,6 +10,9 @@ class CRUDWorkingTime(CRUDBase[WorkingTime, WorkingTimeCreate, WorkingTimeUpdate
     def get_by_job_id(self, db: Session, job_id: int) -> List[WorkingTime]:
         return db.query(self.model).filter(self.model.job_id == job_id).all()
 
+    def get_by_job_ids(self, db: Session, job_ids: List[int]) -> List[WorkingTime]:
+        return db.query(self.model).filter(self.model.job_id.in_(job_ids)).all()
+
     def remove_by_job_id(self, db: Session, job_id: int) -> bool:
         db.query(self.model).filter(self.model.job_id == job_id).delete()
         db.commit()
@@ -1,7 +1,14 @@
 import sys
+from contextlib import contextmanager
 from sqlalchemy import create_engine, Engine
-from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    async_sessionmaker,
+    AsyncEngine,
+    AsyncSession,
+)
+from typing import Generator, AsyncGenerator, Iterator
 
 
 from app.core.config import settings
@@ -32,9 +39,36 @@ def create_engine_and_session(url: str) -> Engine:
         return engine, db_session
 
 
+def create_async_engine_and_session(url: str) -> AsyncEngine:
+    try:
+        engine = create_async_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=20,
+            max_overflow=100,
+            connect_args={"connect_timeout": 10},
+        )
+    except Exception as e:
+        logger.error(f"Failed to connect to Database: {e}")
+        sys.exit(1)
+
+    else:
+        engine.dialect.supports_sane_rowcount = (
+            engine.dialect.supports_sane_multi_rowcount
+        ) = False
+        db_session = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        return engine, db_session
+
+
 MYSQL_URL = f"mysql+pymysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}"
+MYSQL_ASYNC_URL = f"mysql+aiomysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}"
 
 engine, SessionLocal = create_engine_and_session(MYSQL_URL)
+async_engine, AsyncSessionLocal = create_async_engine_and_session(MYSQL_ASYNC_URL)
 
 
 def get_db() -> Generator:
@@ -46,3 +80,26 @@ def get_db() -> Generator:
         raise e
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Commit once when the block exits, roll back if it raises.
+
+    CRUD calls inside the block should pass commit=False so they only flush.
+    """
+    try:
+        yield db
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from typing import Any
 import datetime
@@ -27,6 +28,18 @@ class CommonHelper:
         """
         return json.dumps(v, cls=default)
 
+    @staticmethod
+    def cache_key(data: dict) -> str:
+        """Canonical, compact cache key for a set of filters.
+
+        None values are dropped and keys sorted before hashing, so the same
+        filters always give the same key whatever their order.
+        """
+        data = {k: v for k, v in data.items() if v is not None}
+        return hashlib.sha1(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
     @staticmethod
     def json_loads(v: str, *, cls: json.JSONDecoder = json.JSONDecoder) -> Any:
         """Transform JSON-like string to python-data.
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+
+class CursorHelper:
+    @staticmethod
+    def encode(value: Any, id: int) -> str:
+        """Encode the (sort value, id) of the last row into an opaque cursor."""
+        if isinstance(value, datetime):
+            value = {"datetime": value.isoformat()}
+        elif isinstance(value, date):
+            value = {"date": value.isoformat()}
+        elif isinstance(value, Enum):
+            value = value.value
+        data = json.dumps([value, id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> Tuple[Any, int]:
+        """Decode a cursor back into (sort value, id), raise ValueError if invalid."""
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            value, id = json.loads(data)
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(id, int):
+            raise ValueError("Invalid cursor")
+        if isinstance(value, dict):
+            if "datetime" in value:
+                value = datetime.fromisoformat(value["datetime"])
+            elif "date" in value:
+                value = date.fromisoformat(value["date"])
+            else:
+                raise ValueError("Invalid cursor")
+        return value, id
+
+    @staticmethod
+    def validate(cursor: Optional[str]) -> Optional[str]:
+        if cursor:
+            CursorHelper.decode(cursor)
+        return cursor or None
+
+    @staticmethod
+    def next_cursor(items: List[Any], sort_by: Any, limit: int) -> Optional[str]:
+        """Cursor of the last item when the page is full, else None."""
+        if not items or len(items) < limit:
+            return None
+        sort_by = sort_by.value if isinstance(sort_by, Enum) else sort_by or "id"
+        last = items[-1]
+        if isinstance(last, dict):
+            return CursorHelper.encode(last.get(sort_by), last["id"])
+        if not hasattr(last, sort_by):
+            return None
+        return CursorHelper.encode(getattr(last, sort_by), last.id)
@@ -34,6 +34,7 @@ class SortByJob(str, Enum):
     DEADLINE = "deadline"
     QUANTITY = "quantity"
     SALARY = "salary"
+    RELEVANCE = "relevance"
 
 
 class Provider(str, Enum):
@@ -220,3 +221,10 @@ class WebsocketActionType(str, Enum):
     ADD_MEMBER = "add_member"
     UPDATE_CONVERSATION = "update_conversation"
     UPDATE_AVATAR_CONVERSATION = "update_avatar_conversation"
+
+
+class SuggestType(str, Enum):
+    COMPANY = "company"
+    JOB = "job"
+    SKILL = "skill"
+    POSITION = "position"
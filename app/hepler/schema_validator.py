@@ -5,6 +5,7 @@ from fastapi import UploadFile
 from typing import List
 
 from app.hepler.common import CommonHelper
+from app.hepler.cursor import CursorHelper
 from app.hepler.enum import (
     Gender,
     FolderBucket,
@@ -223,6 +224,23 @@ class SchemaValidator:
             raise ValueError("Invalid skip")
         return v or 0
 
+    @staticmethod
+    def validate_cursor(v):
+        try:
+            return CursorHelper.validate(v)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def validate_score_cursor(v):
+        """A cursor whose sort value is a number, like a sorted set score"""
+        v = SchemaValidator.validate_cursor(v)
+        if v:
+            value, _ = CursorHelper.decode(v)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError("Invalid cursor")
+        return v
+
     @staticmethod
     def validate_job_sort_by(v):
         if v and v == SortByJob.SALARY:
@@ -0,0 +1,81 @@
+import random
+import threading
+import time
+from typing import Optional
+
+
+class Snowflake:
+    """Time ordered ids: milliseconds since the epoch, worker id and sequence.
+
+    The layout fits in 53 bits so ids stay exact as JavaScript numbers:
+    41 bits of time (69 years), 5 of worker and 7 of sequence, that is 128
+    ids per millisecond on each of 32 workers. The last worker id is never
+    leased, it is shared by processes that generate ids without a lease.
+    """
+
+    epoch = 1704067200000  # 2024-01-01 UTC
+    worker_bits = 5
+    sequence_bits = 7
+
+    def __init__(self, worker_id: Optional[int] = None):
+        self.worker_id = worker_id
+        # Monotonic deadline of the worker id lease, None if it never expires
+        self.valid_until: Optional[float] = None
+        self.last_timestamp = -1
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    @property
+    def max_worker_id(self) -> int:
+        return (1 << self.worker_bits) - 1
+
+    @property
+    def unleased_worker_id(self) -> int:
+        return self.max_worker_id
+
+    def compose(self, timestamp: int, worker_id: int, sequence: int) -> int:
+        return (
+            (timestamp << (self.worker_bits + self.sequence_bits))
+            | (worker_id << self.sequence_bits)
+            | sequence
+        )
+
+    def get_timestamp(self) -> int:
+        return int(time.time() * 1000) - self.epoch
+
+    def set_worker_id(
+        self, worker_id: Optional[int], valid_until: Optional[float] = None
+    ) -> None:
+        with self.lock:
+            self.worker_id = worker_id
+            self.valid_until = valid_until
+
+    def next_id(self) -> int:
+        with self.lock:
+            # Two processes sharing a worker id would generate the same ids
+            if self.worker_id is None or (
+                self.valid_until is not None and time.monotonic() > self.valid_until
+            ):
+                raise RuntimeError("Snowflake worker id is not leased")
+            timestamp = self.get_timestamp()
+            # Never go back in time, even if the clock does
+            if timestamp < self.last_timestamp:
+                timestamp = self.last_timestamp
+            if timestamp == self.last_timestamp:
+                self.sequence = (self.sequence + 1) & ((1 << self.sequence_bits) - 1)
+                if self.sequence == 0:
+                    timestamp += 1
+            else:
+                self.sequence = 0
+            self.last_timestamp = timestamp
+            return self.compose(timestamp, self.worker_id, self.sequence)
+
+    def next_unleased_id(self) -> int:
+        """An id under the unleased worker id with a random sequence. Other
+        processes may generate the same one, so it must be inserted where a
+        duplicate key is detected and retried"""
+        sequence = random.getrandbits(self.sequence_bits)
+        return self.compose(self.get_timestamp(), self.unleased_worker_id, sequence)
+
+
+snowflake = Snowflake()
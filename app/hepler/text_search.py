@@ -0,0 +1,33 @@
+import re
+import unicodedata
+from typing import List
+
+
+class TextSearchHelper:
+    @staticmethod
+    def fold(v: str) -> str:
+        """Lowercase, strip Vietnamese diacritics and collapse punctuation.
+
+        "Kế toán tổng hợp - Đà Nẵng" -> "ke toan tong hop da nang"
+        """
+        if not v:
+            return ""
+        v = unicodedata.normalize("NFD", v.replace("đ", "d").replace("Đ", "D"))
+        v = "".join(c for c in v if unicodedata.category(c) != "Mn")
+        return " ".join(re.split(r"[^0-9a-z]+", v.lower())).strip()
+
+    @staticmethod
+    def tokenize(v: str) -> List[str]:
+        return TextSearchHelper.fold(v).split()
+
+    @staticmethod
+    def boolean_query(v: str, min_token_size: int = 2) -> str:
+        """Build a MySQL boolean mode query requiring every folded token.
+
+        Tokens shorter than the ngram token size can never match, so they are dropped.
+        """
+        return " ".join(
+            f'+"{token}"'
+            for token in TextSearchHelper.tokenize(v)
+            if len(token) >= min_token_size
+        )
@@ -11,4 +11,6 @@ def register_middleware(app: FastAPI) -> None:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
+        # Cursor paged lists return the next cursor in this header
+        expose_headers=["X-Next-Cursor"],
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Enum, ForeignKey, String, DateTime
+from sqlalchemy import BigInteger, Column, Integer, Enum, ForeignKey, String, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -28,6 +28,9 @@ class Conversation(Base):
         DateTime(timezone=True), default=func.now(), onupdate=func.now()
     )
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Kept in step with message inserts so the inbox needs no aggregate
+    last_message_id = Column(BigInteger, nullable=True)
+    last_message_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     messages = relationship(
         "Message", back_populates="conversation", lazy=True, passive_deletes=True
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index, DateTime, event
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Enum,
+    Index,
+    DateTime,
+    event,
+)
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 
@@ -19,7 +29,7 @@ class ConversationMember(Base):
         nullable=False,
         index=True,
     )
-    last_read_message_id = Column(Integer, nullable=True)
+    last_read_message_id = Column(BigInteger, nullable=True)
     last_read_at = Column(DateTime(timezone=True), nullable=True)
     type = Column(Enum(MemberType), default=MemberType.MEMBER, nullable=False)
     nickname = Column(String(50), nullable=True)
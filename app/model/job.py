@@ -13,7 +13,7 @@ from sqlalchemy import (
     Index,
 )
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship, Session
+from sqlalchemy.orm import relationship, Session, deferred
 
 from app.db.base_class import Base
 from app.hepler.enum import JobStatus, Gender, JobType, SalaryType
@@ -64,6 +64,8 @@ class Job(Base):
     is_diamond_employer = Column(Boolean, default=False)
     is_job_flash = Column(Boolean, default=False)
     working_time_text = Column(Text, nullable=True)
+    # Accent folded title, description, requirement and skills for full-text search
+    search_text = deferred(Column(Text, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -110,6 +112,12 @@ class Job(Base):
         Index(
             "idx_job_salary_status_dealine", min_salary, max_salary, status, deadline
         ),
+        Index(
+            "idx_job_search_text",
+            search_text,
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
     )
 
 
@@ -125,52 +133,35 @@ def receive_after_insert(mapper, connection, target):
 
 @event.listens_for(Job.status, "set")
 def receive_after_update(target, value, oldvalue, initiator):
+    """Count published jobs per position and category.
+
+    The counters change in the session of the job, so they are committed or
+    rolled back together with the status by whoever owns the transaction.
+    """
     session = Session.object_session(target)
 
     if session is None:
         return
 
-    try:
-        if oldvalue == JobStatus.PUBLISHED and value != JobStatus.PUBLISHED:
-            job_position = (
-                session.query(JobPosition).filter_by(id=target.job_position_id).first()
-            )
-            if job_position.count is not None:
-                job_position.count -= 1
-
-            job_categories = (
-                session.query(JobCategory).filter_by(job_id=target.id).all()
-            )
-            for item in job_categories:
-                category = (
-                    session.query(Category).filter_by(id=item.category_id).first()
-                )
-                if category:
-                    category.count -= 1
-
-        elif value == JobStatus.PUBLISHED and oldvalue != JobStatus.PUBLISHED:
-            job_position = (
-                session.query(JobPosition).filter_by(id=target.job_position_id).first()
-            )
-
-            if job_position.count is not None:
-                job_position.count += 1
-
-            job_categories = (
-                session.query(JobCategory).filter_by(job_id=target.id).all()
-            )
-            for item in job_categories:
-                category = (
-                    session.query(Category).filter_by(id=item.category_id).first()
-                )
-                if category:
-                    category.count += 1
-
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.commit()
+    if oldvalue == JobStatus.PUBLISHED and value != JobStatus.PUBLISHED:
+        delta = -1
+    elif value == JobStatus.PUBLISHED and oldvalue != JobStatus.PUBLISHED:
+        delta = 1
+    else:
+        return
+
+    with session.no_autoflush:
+        job_position = (
+            session.query(JobPosition).filter_by(id=target.job_position_id).first()
+        )
+        if job_position and job_position.count is not None:
+            job_position.count += delta
+
+        job_categories = session.query(JobCategory).filter_by(job_id=target.id).all()
+        for item in job_categories:
+            category = session.query(Category).filter_by(id=item.category_id).first()
+            if category:
+                category.count += delta
 
 
 @event.listens_for(Job, "before_delete")
@@ -1,12 +1,28 @@
-from sqlalchemy import Column, Integer, Enum, ForeignKey, String, DateTime
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    Enum,
+    ForeignKey,
+    String,
+    DateTime,
+    event,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.base_class import Base
 from app.hepler.enum import MessageType
+from app.model.conversation import Conversation
 
 
 class Message(Base):
+    # Snowflake ids generated in the app so a message can be broadcast before
+    # it is stored, see messageCRUD.create and message_queue_service
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
     conversation_id = Column(
         Integer,
         ForeignKey("conversation.id", ondelete="CASCADE"),
@@ -24,7 +40,7 @@ class Message(Base):
     )
     content = Column(String(255), nullable=False)
     is_pinned = Column(Integer, default=0, nullable=False)
-    parent_id = Column(Integer, ForeignKey("message.id"), nullable=True, index=True)
+    parent_id = Column(BigInteger, ForeignKey("message.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), default=func.now(), onupdate=func.now()
@@ -44,3 +60,29 @@ class Message(Base):
     pinned_message = relationship(
         "PinnedMessage", back_populates="message", uselist=False
     )
+
+
+def set_last_message(connection, conversation_id: int, message_id: int):
+    """Point the conversation at the message unless a newer one is set"""
+    connection.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .where(
+            or_(
+                Conversation.last_message_id.is_(None),
+                Conversation.last_message_id < message_id,
+            )
+        )
+        .values(
+            last_message_id=message_id,
+            updated_at=Conversation.updated_at,
+            last_message_at=select(Message.created_at)
+            .where(Message.id == message_id)
+            .scalar_subquery(),
+        )
+    )
+
+
+@event.listens_for(Message, "after_insert")
+def receive_after_insert(mapper, connection, target):
+    set_last_message(connection, target.conversation_id, target.id)
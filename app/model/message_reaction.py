@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Enum, ForeignKey, String, DateTime
+from sqlalchemy import BigInteger, Column, Integer, Enum, ForeignKey, String, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,7 +8,7 @@ from app.hepler.enum import ReactionType
 
 class MessageReaction(Base):
     message_id = Column(
-        Integer,
+        BigInteger,
         ForeignKey("message.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,7 +13,7 @@ class PinnedMessage(Base):
         index=True,
     )
     message_id = Column(
-        Integer,
+        BigInteger,
         ForeignKey("message.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
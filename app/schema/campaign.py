@@ -3,7 +3,7 @@ from typing import Optional
 from datetime import datetime
 
 from app.hepler.enum import CampaignStatus, FilterCampaign
-from app.schema.page import Pagination
+from app.schema.page import Pagination, CursorPagination
 from app.hepler.schema_validator import SchemaValidator
 
 
@@ -37,7 +37,7 @@ class CampaignUpdateRequest(CampaignBase):
         return v or 0
 
 
-class CampaignGetListPagination(Pagination):
+class CampaignGetListPagination(CursorPagination):
     # business_id: Optional[int] = None
     # company_id: Optional[int] = None
     # status: Optional[CampaignStatus] = None
@@ -66,22 +66,22 @@ class CampaignFilterListPagination(Pagination):
         return SchemaValidator.validate_filter_campaign(v)
 
 
-class CampaignGetOnlyOpenPagination(Pagination):
+class CampaignGetOnlyOpenPagination(CursorPagination):
     business_id: Optional[int] = None
     company_id: Optional[int] = None
 
 
-class CampaignGetHasNewApplicationPagination(Pagination):
+class CampaignGetHasNewApplicationPagination(CursorPagination):
     business_id: Optional[int] = None
     company_id: Optional[int] = None
 
 
-class CampaignGetHasPublishedJobPagination(Pagination):
+class CampaignGetHasPublishedJobPagination(CursorPagination):
     business_id: Optional[int] = None
     company_id: Optional[int] = None
 
 
-class CampaignGetHasPublishedJobExpiredPagination(Pagination):
+class CampaignGetHasPublishedJobExpiredPagination(CursorPagination):
     business_id: Optional[int] = None
     company_id: Optional[int] = None
 
@@ -90,7 +90,7 @@ class CampaignGetHasPendingJobPagination(CampaignGetHasNewApplicationPagination)
     pass
 
 
-class CampaignGetMutilPagination(Pagination):
+class CampaignGetMutilPagination(CursorPagination):
     business_id: Optional[int] = None
     company_id: Optional[int] = None
     status: Optional[CampaignStatus] = None
@@ -8,6 +8,7 @@ from app.hepler.enum import ConversationType
 from app.hepler.schema_validator import SchemaValidator
 from app.schema.account import AccountBasicResponse
 from app.schema.message import MessageBasicResponse
+from app.schema.page import CursorPagination
 
 
 # request
@@ -50,6 +51,13 @@ class ConversationUpdateAvatarRequest(BaseModel):
 
 
 # schema
+class ConversationInboxPagination(CursorPagination):
+    # Inbox cursors are (last activity score, conversation id)
+    @validator("cursor")
+    def validate_cursor(cls, v):
+        return SchemaValidator.validate_score_cursor(v)
+
+
 class ConversationCreate(BaseModel):
     type: ConversationType = ConversationType.PRIVATE
     name: Optional[str] = None
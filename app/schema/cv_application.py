@@ -4,7 +4,7 @@ from typing import Optional, Union
 from datetime import datetime
 
 from app.hepler.enum import CVApplicationStatus, CVApplicationUpdateStatus
-from app.schema.page import Pagination
+from app.schema.page import CursorPagination
 from app.hepler.schema_validator import SchemaValidator
 from app.schema.job import JobItemResponseGeneral
 from app.schema.company import CompanyItemGeneralResponse
@@ -20,7 +20,7 @@ class CVApplicationBase(BaseModel):
 
 
 # request
-class CVApplicationUserFilter(Pagination):
+class CVApplicationUserFilter(CursorPagination):
     status: Optional[CVApplicationStatus] = None
 
     def get_key(self, user_id: int) -> str:
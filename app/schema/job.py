@@ -13,6 +13,8 @@ from app.hepler.enum import (
     AdminJobApprovalStatus,
 )
 from app.hepler.schema_validator import SchemaValidator
+from app.hepler.text_search import TextSearchHelper
+from app.hepler.common import CommonHelper
 from app.schema.skill import SkillItemResponse
 from app.schema.category import CategoryItemResponse
 from app.schema.working_time import WorkingTimeResponse
@@ -149,6 +151,7 @@ class PaginationJob(BaseModel):
     limit: Optional[int] = 10
     sort_by: Optional[SortByJob] = SortByJob.CREATED_AT
     order_by: Optional[OrderType] = OrderType.DESC
+    cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attribute=True, extra="ignore")
 
@@ -156,6 +159,10 @@ class PaginationJob(BaseModel):
     def validate_limit(cls, v):
         return SchemaValidator.validate_limit(v)
 
+    @validator("cursor")
+    def validate_cursor(cls, v):
+        return SchemaValidator.validate_cursor(v)
+
     @validator("skip")
     def validate_skip(cls, v):
         return SchemaValidator.validate_skip(v)
@@ -223,6 +230,11 @@ class JobCount(BaseModel):
     def validate_deadline(cls, v):
         return v or datetime.now().date()
 
+    def get_key(self) -> str:
+        data = self.model_dump()
+        data["keyword"] = TextSearchHelper.fold(self.keyword) or None
+        return CommonHelper.cache_key(data)
+
 
 class JobSearchByUser(PaginationJob):
     job_status: Optional[JobStatus] = JobStatus.PUBLISHED
@@ -255,11 +267,17 @@ class JobSearchByUser(PaginationJob):
     def validate_job_status(cls, v):
         return v or JobStatus.PUBLISHED
 
-    def get_count_job_user_search_key(self):
-        return f"{self.province_id}_{self.district_id}_{self.province_id}_{self.category_id}_{self.field_id}_{self.employment_type}_{self.job_experience_id}_{self.job_position_id}_{self.min_salary}_{self.max_salary}_{self.salary_type}_{self.deadline}_{self.keyword}_{self.suggest}_{self.updated_at}_{self.sort_by}_{self.order_by}_{self.skip}_{self.limit}"
+    def get_filter_key(self, exclude: set) -> str:
+        data = self.model_dump(exclude={"skip", "limit", "cursor", "suggest", *exclude})
+        data["keyword"] = TextSearchHelper.fold(self.keyword) or None
+        return CommonHelper.cache_key(data)
+
+    def get_query_key(self) -> str:
+        """Key of the ordered result set, shared by every page of the query"""
+        return self.get_filter_key(set())
 
-    def get_jobs_of_district_key(self):
-        return f"{self.province_id}_{self.district_id}_{self.province_id}_{self.category_id}_{self.field_id}_{self.employment_type}_{self.job_experience_id}_{self.job_position_id}_{self.min_salary}_{self.max_salary}_{self.salary_type}_{self.deadline}_{self.keyword}_{self.suggest}_{self.updated_at}"
+    def get_jobs_of_district_key(self) -> str:
+        return self.get_filter_key({"sort_by", "order_by"})
 
 
 class JobSearchByBusiness(PaginationJob):
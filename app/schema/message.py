@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import List
 
 from app.hepler.enum import MessageType
+from app.hepler.schema_validator import SchemaValidator
 from app.schema.message_reaction import MessageReactionResponse
 from app.schema.user import UserBasicResponse
 from app.schema.account import AccountBasicResponse
@@ -16,6 +17,7 @@ class GetMessagesRequest(BaseModel):
     conversation_id: int
     limit: Optional[int] = Field(10, ge=1, le=20)
     skip: int = Field(0, ge=0)
+    cursor: Optional[str] = None
 
     @validator("limit")
     def validate_limit(cls, v):
@@ -25,6 +27,10 @@ class GetMessagesRequest(BaseModel):
     def validate_skip(cls, v):
         return v or 0
 
+    @validator("cursor")
+    def validate_cursor(cls, v):
+        return SchemaValidator.validate_cursor(v)
+
     model_config = ConfigDict(from_attribute=True, extra="ignore")
 
 
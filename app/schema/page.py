@@ -2,6 +2,7 @@ from pydantic import BaseModel, validator, ConfigDict, field_validator, Field
 from typing import Optional
 
 from app.hepler.enum import SortBy, OrderType
+from app.hepler.schema_validator import SchemaValidator
 
 
 class Pagination(BaseModel):
@@ -30,3 +31,11 @@ class Pagination(BaseModel):
 
     def get_key(self) -> str:
         return f"{self.skip}_{self.limit}_{self.sort_by}_{self.order_by}"
+
+
+class CursorPagination(Pagination):
+    cursor: Optional[str] = None
+
+    @validator("cursor")
+    def validate_cursor(cls, v):
+        return SchemaValidator.validate_cursor(v)
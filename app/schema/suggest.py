@@ -0,0 +1,32 @@
+from pydantic import BaseModel, validator, ConfigDict
+from typing import Optional, List
+
+from app.hepler.enum import SuggestType
+
+
+# request
+class SuggestRequest(BaseModel):
+    keyword: str
+    type: Optional[SuggestType] = None
+    limit: Optional[int] = 5
+
+    model_config = ConfigDict(from_attribute=True, extra="ignore")
+
+    @validator("limit")
+    def validate_limit(cls, v):
+        if v is not None and (v < 1 or v > 20):
+            raise ValueError("Invalid limit")
+        return v or 5
+
+
+# response
+class SuggestItemResponse(BaseModel):
+    id: int
+    name: str
+
+
+class SuggestResponse(BaseModel):
+    company: List[SuggestItemResponse] = []
+    job: List[SuggestItemResponse] = []
+    skill: List[SuggestItemResponse] = []
+    position: List[SuggestItemResponse] = []
@@ -1,14 +1,45 @@
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+import asyncio
+import inspect
 import json
-from typing import Any, Set
+import uuid
+from typing import Any, Awaitable, Callable, Set, List, Dict, Optional, Union
 
-from app.storage.redis import redis_dependency
+from app.storage.redis import redis_dependency, get_redis
+from app.storage.local_cache import LocalCache, local_cache_invalidator
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class BaseCache:
-    def __init__(self, key_prefix: str, expire: int):
+    def __init__(self, key_prefix: str, expire: int, local_cache: LocalCache = None):
         self.key_prefix = key_prefix
         self.expire = expire
+        self.local_cache = (
+            local_cache_invalidator.register(local_cache) if local_cache else None
+        )
+        self.flights: Dict[str, asyncio.Future] = {}
+
+    def get_local(self, key: str) -> Any:
+        """Get Value from Key in the in-process cache"""
+        return self.local_cache.get(key) if self.local_cache else None
+
+    def set_local(self, key: str, value: Any, expire: int = None):
+        """Set Value to Key in the in-process cache"""
+        if self.local_cache:
+            self.local_cache.set(key, value, expire)
+
+    async def invalidate_local(self, redis: Redis = None):
+        """Clear the in-process cache on every worker"""
+        if self.local_cache:
+            redis = redis or await get_redis()
+            await local_cache_invalidator.invalidate(redis, self.local_cache.name)
 
     async def get(self, redis: Redis, key: str) -> Any:
         """Get Value from Key"""
@@ -25,11 +56,35 @@ class BaseCache:
         """Get Keys by Pattern"""
         return await redis.keys(self.key_prefix + pattern)
 
+    def pipeline(self, redis: Redis, transaction: bool = True) -> Pipeline:
+        """Get Pipeline, use as `async with self.pipeline(redis) as pipe`"""
+        return redis.pipeline(transaction=transaction)
+
+    async def mget(self, redis: Redis, keys: List[str]) -> List[Optional[Any]]:
+        """Get Values from Keys in one round trip"""
+        if not keys:
+            return []
+        return await redis.mget([self.key_prefix + key for key in keys])
+
+    async def mset_with_ttl(
+        self, redis: Redis, mapping: Dict[str, Any], expire: int = None
+    ):
+        """Set Values to Keys with the same TTL in one round trip"""
+        if not mapping:
+            return
+        async with self.pipeline(redis) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self.key_prefix + key, value, expire or self.expire)
+            await pipe.execute()
+
     async def set_list(self, redis: Redis, key: str, value: list, expire: int = None):
         """Set Value to Key"""
-        for v in value:
-            await redis.rpush(self.key_prefix + key, json.dumps(v))
-        await redis.expire(self.key_prefix + key, expire or self.expire)
+        async with self.pipeline(redis) as pipe:
+            pipe.delete(self.key_prefix + key)
+            if value:
+                pipe.rpush(self.key_prefix + key, *[json.dumps(v) for v in value])
+                pipe.expire(self.key_prefix + key, expire or self.expire)
+            await pipe.execute()
 
     async def get_list(self, redis: Redis, key: str) -> list:
         """Get Value from Key"""
@@ -45,8 +100,12 @@ class BaseCache:
 
     async def set_dict(self, redis: Redis, key: str, value: dict, expire: int = None):
         """Set Value to Key"""
-        await redis.hmset(self.key_prefix + key, value)
-        await redis.expire(self.key_prefix + key, expire or self.expire)
+        async with self.pipeline(redis) as pipe:
+            pipe.delete(self.key_prefix + key)
+            if value:
+                pipe.hset(self.key_prefix + key, mapping=value)
+                pipe.expire(self.key_prefix + key, expire or self.expire)
+            await pipe.execute()
 
     async def get_dict(self, redis: Redis, key: str) -> dict:
         """Get Value from Key"""
@@ -72,3 +131,165 @@ class BaseCache:
     async def delete(self, redis: Redis, key: str):
         """Delete Key"""
         await redis.delete(self.key_prefix + key)
+
+    async def delete_many(self, redis: Redis, keys: List[str]):
+        """Delete Keys in one round trip"""
+        if keys:
+            await redis.delete(*[self.key_prefix + key for key in keys])
+
+    async def get_or_compute(
+        self,
+        redis: Redis,
+        key: str,
+        compute: Callable[[], Union[Any, Awaitable[Any]]],
+        expire: Union[int, Callable[[Any], int]] = None,
+        stale: int = 0,
+        dumps: Callable[[Any], str] = json.dumps,
+        loads: Callable[[str], Any] = json.loads,
+        lease: int = 10,
+    ) -> Any:
+        """Cache-aside read where only one caller recomputes a missing key.
+
+        Callers in this process share one in-flight future per key. Across
+        workers a Redis lock with a short lease elects the one that recomputes
+        while the others wait for its value. Keys live stale seconds past
+        expire; in that window one caller refreshes and the rest serve the old
+        value. expire may be a function of the computed value.
+        """
+        flight = self.flights.get(key)
+        if flight is not None:
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+            # The caller computing it was cancelled, take over
+            return await self.get_or_compute(
+                redis, key, compute, expire, stale, dumps, loads, lease
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self.flights[key] = future
+        try:
+            value = await self.load_or_compute(
+                redis, key, compute, expire, stale, dumps, loads, lease
+            )
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved, waiters still receive it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            # Cancelled before settling the future, waiters must not hang on it
+            if not future.done():
+                future.cancel()
+            self.flights.pop(key, None)
+
+    async def load_or_compute(
+        self,
+        redis: Redis,
+        key: str,
+        compute: Callable[[], Union[Any, Awaitable[Any]]],
+        expire: Union[int, Callable[[Any], int]],
+        stale: int,
+        dumps: Callable[[Any], str],
+        loads: Callable[[str], Any],
+        lease: int,
+    ) -> Any:
+        try:
+            async with self.pipeline(redis, transaction=False) as pipe:
+                pipe.get(self.key_prefix + key)
+                pipe.ttl(self.key_prefix + key)
+                cached, ttl = await pipe.execute()
+        except Exception as e:
+            print(e)
+            return await self.compute(compute)
+
+        if cached is not None:
+            if ttl < 0 or ttl > stale:
+                return loads(cached)
+            token = await self.acquire_lease(redis, key, lease)
+            if token is None:
+                return loads(cached)
+            return await self.refresh(redis, key, compute, expire, stale, dumps, token)
+
+        token = await self.acquire_lease(redis, key, lease)
+        if token is not None:
+            return await self.refresh(redis, key, compute, expire, stale, dumps, token)
+
+        # Another worker is computing it, wait for its value while it holds the lease
+        for _ in range(lease * 20):
+            await asyncio.sleep(0.05)
+            try:
+                async with self.pipeline(redis, transaction=False) as pipe:
+                    pipe.get(self.key_prefix + key)
+                    pipe.exists(self.get_lease_key(key))
+                    cached, leased = await pipe.execute()
+            except Exception as e:
+                print(e)
+                break
+            if cached is not None:
+                return loads(cached)
+            # Released or expired without a value, the computing worker failed
+            if not leased:
+                break
+        token = await self.acquire_lease(redis, key, lease)
+        return await self.refresh(redis, key, compute, expire, stale, dumps, token)
+
+    async def compute(self, compute: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+        value = compute()
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    async def refresh(
+        self,
+        redis: Redis,
+        key: str,
+        compute: Callable[[], Union[Any, Awaitable[Any]]],
+        expire: Union[int, Callable[[Any], int]],
+        stale: int,
+        dumps: Callable[[Any], str],
+        token: Optional[str] = None,
+    ) -> Any:
+        """Compute and cache Key, then release the lease if Token holds it"""
+        try:
+            value = await self.compute(compute)
+            expire_time = expire(value) if callable(expire) else expire or self.expire
+            if expire_time > 0:
+                try:
+                    await redis.set(
+                        self.key_prefix + key, dumps(value), expire_time + stale
+                    )
+                except Exception as e:
+                    print(e)
+            return value
+        finally:
+            if token is not None:
+                await self.release_lease(redis, key, token)
+
+    def get_lease_key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}:lease"
+
+    async def acquire_lease(self, redis: Redis, key: str, lease: int) -> Optional[str]:
+        """Take the right to recompute Key for lease seconds, returns the token
+        that releases it or None if another caller holds it"""
+        token = uuid.uuid4().hex
+        try:
+            if await redis.set(self.get_lease_key(key), token, ex=lease, nx=True):
+                return token
+            return None
+        except Exception as e:
+            print(e)
+            return token
+
+    async def release_lease(self, redis: Redis, key: str, token: str):
+        """Delete the lease of Key only if Token still holds it, it may have
+        expired and been taken by another caller meanwhile"""
+        try:
+            await redis.eval(RELEASE_LEASE_SCRIPT, 1, self.get_lease_key(key), token)
+        except Exception as e:
+            print(e)
@@ -3,6 +3,7 @@ from typing import List
 import json
 
 from app.storage.base_cache import BaseCache
+from app.storage.local_cache import LocalCache
 from app.schema.category import CategoryItemResponse
 from app.schema.field import FieldItemResponse
 from app.schema.job_position import JobPositionItemResponse
@@ -12,7 +13,11 @@ from app.schema.skill import SkillItemResponse
 
 class ConfigCacheService(BaseCache):
     def __init__(self):
-        super().__init__("config_cache_", 86400)
+        super().__init__(
+            "config_cache_",
+            86400,
+            local_cache=LocalCache("config_cache_", maxsize=4096, expire=60 * 10),
+        )
         self.category_key = "category"
         self.field_key = "field"
         self.position_key = "position"
@@ -103,5 +108,17 @@ class ConfigCacheService(BaseCache):
             else None
         )
 
+    def set_local_category(self, key: int, value: CategoryItemResponse):
+        self.set_local(self.category_key + str(key), value)
+
+    def get_local_category(self, key: int) -> CategoryItemResponse:
+        return self.get_local(self.category_key + str(key))
+
+    def set_local_skill(self, key: int, value: SkillItemResponse):
+        self.set_local(self.skill_key + str(key), value)
+
+    def get_local_skill(self, key: int) -> SkillItemResponse:
+        return self.get_local(self.skill_key + str(key))
+
 
 config_cache_service = ConfigCacheService()
@@ -36,11 +36,13 @@ class FileUrlCacheService(BaseCache):
         user_id: int,
         conversation_id: int,
     ):
-        for upload_filename in upload_filenames:
-            await self.delete(
-                redis,
-                f"{self.image_url_message_key}:{user_id}:{conversation_id}:{upload_filename}",
-            )
+        await self.delete_many(
+            redis,
+            [
+                f"{self.image_url_message_key}:{user_id}:{conversation_id}:{upload_filename}"
+                for upload_filename in upload_filenames
+            ],
+        )
 
 
 file_url_cache_service = FileUrlCacheService()
@@ -2,32 +2,36 @@ import json
 from redis.asyncio import Redis
 from datetime import datetime, date
 from enum import Enum
-from typing import List
+from sqlalchemy import select
+from typing import Any, Callable, List, Dict, Tuple
 
 from app.storage.base_cache import BaseCache
+from app.storage.cache_invalidation import cache_invalidation_bus
 from app.schema.job import JobItemResponse
+from app.model import Job, Company, WorkLocation, JobCategory
 
 
 class JobCacheService(BaseCache):
     def __init__(self):
         super().__init__("job_cache_", 86400)
-        self.user_search_count_key = "user_search_count"
+        self.count_key = "count"
         self.province_district_search_key = "province_district_search"
-        self.count_job_by_salary_key = "count_job_by_salary"
-        self.count_job_by_category_key = "count_job_by_category"
-        self.count_job_active_key = "count_job_active"
-        self.count_job_24h_key = "count_job_24h"
-        self.job_cruiment_demand_key = "job_cruiment_demand"
         self.job_info_key = "job_info"
-        self.user_search_key = "user_search"
+        self.search_ids_key = "search_ids"
+        self.statistics_key = "statistics_"
 
-    async def cache_count_search_by_user(self, redis: Redis, key: str, value: int):
-        expire_time = 60 * 60
-        await self.set(redis, self.user_search_count_key + key, value, expire_time)
-
-    async def get_cache_count_search_by_user(self, redis: Redis, key: str) -> int:
-        response = await self.get(redis, self.user_search_count_key + key)
-        return int(response) if response else None
+    async def get_or_compute_count(
+        self, redis: Redis, key: str, compute: Callable[[], Tuple[int, bool]]
+    ) -> Tuple[int, bool]:
+        count, exact = await self.get_or_compute(
+            redis,
+            self.count_key + key,
+            compute,
+            # Capped counts barely move, exact ones are kept short to stay accurate
+            expire=lambda value: 60 * 5 if value[1] else 60 * 60,
+            stale=30,
+        )
+        return count, exact
 
     async def cache_province_district_search_by_user(
         self, redis: Redis, key: str, value: list
@@ -43,87 +47,98 @@ class JobCacheService(BaseCache):
         response = await self.get_list(redis, self.province_district_search_key + key)
         return response if response else None
 
-    async def cache_count_job_by_salary(self, redis: Redis, value: list):
-        expire_time = 60 * 60 * 12
-        value = [(idx, count) for (idx, count) in value]
-        await self.set_list(redis, self.count_job_by_salary_key, value, expire_time)
-
-    async def get_cache_count_job_by_salary(self, redis: Redis) -> list:
-        response = await self.get_list(redis, self.count_job_by_salary_key)
-        return response if response else None
-
-    async def cache_count_job_by_category(self, redis: Redis, value: list):
-        expire_time = 60 * 60 * 12
-        await self.set_list(redis, self.count_job_by_category_key, value, expire_time)
-
-    async def get_cache_count_job_by_category(self, redis: Redis) -> list:
-        response = await self.get_list(redis, self.count_job_by_category_key)
-        return response if response else None
-
-    async def cache_count_job_active(self, redis: Redis, value: int):
-        expire_time = 60 * 60 * 12
-        await self.set(redis, self.count_job_active_key, value, expire_time)
-
-    async def get_cache_count_job_active(self, redis: Redis) -> int:
-        response = await self.get(redis, self.count_job_active_key)
-        return int(response) if response else None
-
-    async def cache_count_job_24h(self, redis: Redis, value: int):
-        expire_time = 60 * 60 * 12
-        await self.set(redis, self.count_job_active_key, value, expire_time)
-
-    async def get_cache_count_job_24h(self, redis: Redis) -> int:
-        response = await self.get(redis, self.count_job_active_key)
-        return int(response) if response else None
-
-    async def cache_job_cruiment_demand(self, redis: Redis, value: object):
-        expire_time = 60 * 60 * 12
-        await self.set(
-            redis, self.job_cruiment_demand_key, json.dumps(value), expire_time
+    def get_job_info_expire(self, value: JobItemResponse) -> int:
+        """Job info is kept until the job deadline"""
+        return int(
+            (
+                datetime.fromisoformat(str(value.deadline)) - datetime.now()
+            ).total_seconds()
         )
 
-    async def get_cache_job_cruiment_demand(self, redis: Redis) -> object:
-        response = await self.get(redis, self.job_cruiment_demand_key)
-        return json.loads(response) if response else None
-
-    async def cache_job_info(self, redis: Redis, key: int, value: JobItemResponse):
-        deadline = str(value.deadline)
-        value = json.dumps(value.model_dump(), default=str)
-        expire_time = int(
-            (datetime.fromisoformat(deadline) - datetime.now()).total_seconds()
-        )
-        await self.set(
+    async def get_or_compute_job_info(
+        self, redis: Redis, key: int, compute: Callable[[], JobItemResponse]
+    ) -> JobItemResponse:
+        return await self.get_or_compute(
             redis,
             self.job_info_key + str(key),
-            value,
-            expire_time,
+            compute,
+            expire=self.get_job_info_expire,
+            dumps=lambda value: json.dumps(value.model_dump(), default=str),
+            loads=lambda value: JobItemResponse(**json.loads(value)),
         )
 
-    async def get_cache_job_info(self, redis: Redis, key: int) -> JobItemResponse:
-        response = await self.get(redis, self.job_info_key + str(key))
-        return JobItemResponse(**json.loads(response)) if response else None
+    async def get_many_job_info(
+        self, redis: Redis, keys: List[int]
+    ) -> Dict[int, JobItemResponse]:
+        if not keys:
+            return {}
 
-    async def cache_user_search(
-        self, redis: Redis, key: str, value: List[JobItemResponse]
-    ):
-        expire_time = 60
-        serialized_value = [job.model_dump() for job in value]
-        await self.set(
-            redis,
-            self.user_search_key + key,
-            json.dumps(serialized_value, default=str),
-            expire_time,
+        response = await self.mget(
+            redis, [self.job_info_key + str(key) for key in keys]
+        )
+        return {
+            key: JobItemResponse(**json.loads(value))
+            for key, value in zip(keys, response)
+            if value
+        }
+
+    async def set_many_job_info(self, redis: Redis, values: List[JobItemResponse]):
+        async with self.pipeline(redis, transaction=False) as pipe:
+            for value in values:
+                expire_time = self.get_job_info_expire(value)
+                if expire_time <= 0:
+                    continue
+                pipe.set(
+                    self.key_prefix + self.job_info_key + str(value.id),
+                    json.dumps(value.model_dump(), default=str),
+                    expire_time,
+                )
+            await pipe.execute()
+
+    async def delete_many_job_info(self, redis: Redis, keys: List[int]):
+        await self.delete_many(redis, [self.job_info_key + str(key) for key in keys])
+
+    async def get_or_compute_search_ids(
+        self, redis: Redis, key: str, compute: Callable[[], List[int]]
+    ) -> List[int]:
+        return await self.get_or_compute(
+            redis, self.search_ids_key + key, compute, expire=60, stale=30
         )
 
-    async def get_cache_user_search(
-        self, redis: Redis, key: str
-    ) -> List[JobItemResponse]:
-        response = await self.get(redis, self.user_search_key + key)
-        return (
-            [JobItemResponse(**job) for job in json.loads(response)]
-            if response
-            else None
+    async def get_or_compute_statistics(
+        self, redis: Redis, key: str, compute: Callable[[], Any]
+    ) -> Any:
+        """Aggregates used until the job facets are built"""
+        return await self.get_or_compute(
+            redis,
+            self.statistics_key + key,
+            compute,
+            expire=60 * 5,
+            stale=60,
+            # Result rows are tuple-like but not JSON serializable
+            dumps=lambda value: json.dumps(value, default=list),
         )
 
 
 job_cache_service = JobCacheService()
+
+# Job info embeds the company, locations and categories, so a change to any
+# of them drops the cached info of the jobs it belongs to
+cache_invalidation_bus.register("job_info", job_cache_service.delete_many_job_info)
+cache_invalidation_bus.watch(Job, "job_info", lambda connection, job: [job.id])
+cache_invalidation_bus.watch(
+    Company,
+    "job_info",
+    lambda connection, company: connection.execute(
+        select(Job.id).where(Job.business_id == company.business_id)
+    )
+    .scalars()
+    .all(),
+)
+for model in [WorkLocation, JobCategory]:
+    cache_invalidation_bus.watch(
+        model,
+        "job_info",
+        lambda connection, target: [target.job_id],
+        events=("after_insert", "after_update", "after_delete"),
+    )
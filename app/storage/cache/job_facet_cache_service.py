@@ -0,0 +1,161 @@
+import json
+from redis.asyncio import Redis
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from app.storage.base_cache import BaseCache
+
+
+class JobFacetCacheService(BaseCache):
+    """Counters of active jobs per facet value.
+
+    Every counted job is kept in a member hash with the facet values it was
+    counted under, so adding and removing a job are idempotent and a removal
+    always decrements exactly what was incremented.
+    """
+
+    def __init__(self):
+        super().__init__("job_facet_", 60 * 60 * 24)
+        self.member_key = "member"
+        self.deadline_key = "deadline"
+        self.published_key = "published"
+        self.total_key = "total"
+        self.company_key = "company"
+        self.companies_key = "companies"
+        self.built_key = "built"
+        self.facets = ["category", "salary", "province", "district"]
+
+    def get_key(self, key: str) -> str:
+        return self.key_prefix + key
+
+    async def add(
+        self,
+        redis: Redis,
+        job_id: int,
+        facets: Dict[str, List[int]],
+        company_id: int,
+        deadline: float,
+        published: float,
+    ) -> bool:
+        """Count a job under its facets, a job already counted is left as is"""
+        member = json.dumps({**facets, self.company_key: company_id})
+        if not await redis.hsetnx(self.get_key(self.member_key), job_id, member):
+            return False
+        async with self.pipeline(redis) as pipe:
+            for facet, values in facets.items():
+                for value in values:
+                    pipe.hincrby(self.get_key(facet), value, 1)
+            pipe.incr(self.get_key(self.total_key))
+            pipe.zadd(self.get_key(self.deadline_key), {job_id: deadline})
+            pipe.zadd(self.get_key(self.published_key), {job_id: published})
+            await pipe.execute()
+        # The first active job of a company makes it an active company
+        if await redis.hincrby(self.get_key(self.company_key), company_id, 1) == 1:
+            await redis.incr(self.get_key(self.companies_key))
+        return True
+
+    async def remove(self, redis: Redis, job_id: int) -> bool:
+        """Stop counting a job, a job not counted is ignored"""
+        member = await redis.hget(self.get_key(self.member_key), job_id)
+        if not member or not await redis.hdel(self.get_key(self.member_key), job_id):
+            return False
+        facets = json.loads(member)
+        company_id = facets.pop(self.company_key)
+        async with self.pipeline(redis) as pipe:
+            for facet, values in facets.items():
+                for value in values:
+                    pipe.hincrby(self.get_key(facet), value, -1)
+            pipe.decr(self.get_key(self.total_key))
+            pipe.zrem(self.get_key(self.deadline_key), job_id)
+            pipe.zrem(self.get_key(self.published_key), job_id)
+            await pipe.execute()
+        if await redis.hincrby(self.get_key(self.company_key), company_id, -1) == 0:
+            await redis.decr(self.get_key(self.companies_key))
+        return True
+
+    async def get_expired(self, redis: Redis, now: float) -> List[int]:
+        response = await redis.zrangebyscore(
+            self.get_key(self.deadline_key), "-inf", now
+        )
+        return [int(id) for id in response]
+
+    async def get_counts(self, redis: Redis, facet: str) -> Dict[int, int]:
+        response = await redis.hgetall(self.get_key(facet))
+        return {
+            int(value): int(count) for value, count in response.items() if int(count)
+        }
+
+    async def get_total(self, redis: Redis) -> int:
+        return int(await redis.get(self.get_key(self.total_key)) or 0)
+
+    async def get_companies(self, redis: Redis) -> int:
+        return int(await redis.get(self.get_key(self.companies_key)) or 0)
+
+    async def count_published_since(self, redis: Redis, since: float) -> int:
+        return await redis.zcount(self.get_key(self.published_key), since, "+inf")
+
+    async def replace(
+        self,
+        redis: Redis,
+        members: List[Tuple[int, Dict[str, List[int]], int, float, float]],
+    ):
+        """Swap every counter for ones computed from (job_id, facets, company_id,
+        deadline, published) in a single transaction"""
+        counts = {facet: Counter() for facet in self.facets}
+        companies = Counter()
+        for _, facets, company_id, _, _ in members:
+            for facet, values in facets.items():
+                counts[facet].update(values)
+            companies[company_id] += 1
+
+        async with self.pipeline(redis) as pipe:
+            pipe.delete(
+                *[
+                    self.get_key(key)
+                    for key in [
+                        self.member_key,
+                        self.deadline_key,
+                        self.published_key,
+                        self.total_key,
+                        self.company_key,
+                        self.companies_key,
+                        *self.facets,
+                    ]
+                ]
+            )
+            if members:
+                pipe.hset(
+                    self.get_key(self.member_key),
+                    mapping={
+                        job_id: json.dumps({**facets, self.company_key: company_id})
+                        for job_id, facets, company_id, _, _ in members
+                    },
+                )
+                pipe.zadd(
+                    self.get_key(self.deadline_key),
+                    {job_id: deadline for job_id, _, _, deadline, _ in members},
+                )
+                pipe.zadd(
+                    self.get_key(self.published_key),
+                    {job_id: published for job_id, _, _, _, published in members},
+                )
+                pipe.hset(self.get_key(self.company_key), mapping=dict(companies))
+            for facet, counter in counts.items():
+                if counter:
+                    pipe.hset(self.get_key(facet), mapping=dict(counter))
+            pipe.set(self.get_key(self.total_key), len(members))
+            pipe.set(self.get_key(self.companies_key), len(companies))
+            pipe.set(self.get_key(self.built_key), 1, self.expire)
+            await pipe.execute()
+
+    async def is_built(self, redis: Redis) -> bool:
+        return bool(await redis.exists(self.get_key(self.built_key)))
+
+    async def lock(self, redis: Redis, name: str, expire: int) -> bool:
+        """Let only one worker run a periodic task per interval"""
+        return bool(
+            await redis.set(self.get_key(f"lock:{name}"), 1, ex=expire, nx=True)
+        )
+
+
+job_facet_cache_service = JobFacetCacheService()
@@ -3,13 +3,18 @@ from typing import List
 import json
 
 from app.storage.base_cache import BaseCache
+from app.storage.local_cache import LocalCache
 from app.schema.province import ProvinceItemResponse
 from app.schema.district import DistrictItemResponse
 
 
 class LocationCacheService(BaseCache):
     def __init__(self):
-        super().__init__("location_cache_", 86400)
+        super().__init__(
+            "location_cache_",
+            86400,
+            local_cache=LocalCache("location_cache_", maxsize=2048, expire=60 * 60),
+        )
         self.province_key = "province"
         self.district_key = "district"
         self.province_district_key = "province_district"
@@ -33,6 +38,7 @@ class LocationCacheService(BaseCache):
 
     async def cache_province(self, redis: Redis, key: int, value: ProvinceItemResponse):
         expire_time = 60 * 60 * 24
+        self.set_local_province(key, value)
         await self.set(
             redis,
             self.province_key + str(key),
@@ -41,8 +47,23 @@ class LocationCacheService(BaseCache):
         )
 
     async def get_cache_province(self, redis: Redis, key: int) -> ProvinceItemResponse:
+        local_response = self.get_local_province(key)
+        if local_response:
+            return local_response
+
         response = await self.get(redis, self.province_key + str(key))
-        return ProvinceItemResponse(**json.loads(response)) if response else None
+        if not response:
+            return None
+
+        response = ProvinceItemResponse(**json.loads(response))
+        self.set_local_province(key, response)
+        return response
+
+    def set_local_province(self, key: int, value: ProvinceItemResponse):
+        self.set_local(self.province_key + str(key), value)
+
+    def get_local_province(self, key: int) -> ProvinceItemResponse:
+        return self.get_local(self.province_key + str(key))
 
     async def cache_district_of_province(
         self, redis: Redis, key: str, value: List[DistrictItemResponse]
@@ -63,6 +84,7 @@ class LocationCacheService(BaseCache):
 
     async def cache_district(self, redis: Redis, key: int, value: DistrictItemResponse):
         expire_time = 60 * 60 * 24
+        self.set_local_district(key, value)
         await self.set(
             redis,
             self.district_key + str(key),
@@ -71,8 +93,23 @@ class LocationCacheService(BaseCache):
         )
 
     async def get_cache_district(self, redis: Redis, key: int) -> DistrictItemResponse:
+        local_response = self.get_local_district(key)
+        if local_response:
+            return local_response
+
         response = await self.get(redis, self.district_key + str(key))
-        return DistrictItemResponse(**json.loads(response)) if response else None
+        if not response:
+            return None
+
+        response = DistrictItemResponse(**json.loads(response))
+        self.set_local_district(key, response)
+        return response
+
+    def set_local_district(self, key: int, value: DistrictItemResponse):
+        self.set_local(self.district_key + str(key), value)
+
+    def get_local_district(self, key: int) -> DistrictItemResponse:
+        return self.get_local(self.district_key + str(key))
 
 
 location_cache_service = LocationCacheService()
@@ -1,14 +1,24 @@
+import json
 from redis.asyncio import Redis
-from typing import List
+from redis.exceptions import WatchError
+from typing import List, Optional, Tuple
 
+from app.core import constant
+from app.model import Message
 from app.storage.base_cache import BaseCache
+from app.storage.cache_invalidation import cache_invalidation_bus
 
 
 class MessageCacheService(BaseCache):
     def __init__(self):
         super().__init__("message_cache_", 86400)
         self.unread_count = "unread_count"
-        self.list_conversation_id = "list_conversation_id"
+        self.inbox = "inbox"
+        # Marks an inbox as complete, a key created by touch_inbox alone is not
+        self.inbox_built = "built"
+        self.inbox_expire = 60 * 60 * 24 * 30
+        self.recent = "recent"
+        self.recent_size = constant.MESSAGE_RECENT_SIZE
 
     async def cache_unread_count_message(
         self, redis: Redis, *, user_id: int, conversation_id: int, count: int
@@ -45,53 +55,196 @@ class MessageCacheService(BaseCache):
     ) -> None:
         await self.delete(redis, f"{self.unread_count}:{user_id}:{conversation_id}")
 
-    async def cache_list_conversation_id(
-        self, redis: Redis, *, user_id: int, conversation_ids: List[int]
-    ) -> None:
-        await self.set_list(
-            redis,
-            f"{self.list_conversation_id}:{user_id}",
-            conversation_ids,
-        )
+    def get_inbox_key(self, user_id: int) -> str:
+        return self.key_prefix + f"{self.inbox}:{user_id}"
 
-    async def get_cache_list_conversation_id(
-        self, redis: Redis, *, user_id: int
-    ) -> List[int]:
-        response = await self.get_list(
-            redis,
-            f"{self.list_conversation_id}:{user_id}",
-        )
-        return response if response else None
+    def get_inbox_member(self, conversation_id: int) -> str:
+        # Zero padded so members tied on score sort like their ids
+        return f"{conversation_id:012d}"
 
-    async def delete_cache_list_conversation_id(
-        self, redis: Redis, *, user_id: int
+    async def build_inbox(
+        self, redis: Redis, *, user_id: int, conversations: List[Tuple[int, float]]
     ) -> None:
-        await self.delete(redis, f"{self.list_conversation_id}:{user_id}")
-
-    async def add_conversation_id_to_list(
-        self, redis: Redis, *, user_id: int, conversation_id: int
+        """Replace the inbox of a user with (conversation_id, last activity)"""
+        key = self.get_inbox_key(user_id)
+        async with self.pipeline(redis) as pipe:
+            pipe.delete(key)
+            pipe.zadd(
+                key,
+                {
+                    self.inbox_built: -1,
+                    **{
+                        self.get_inbox_member(conversation_id): score
+                        for conversation_id, score in conversations
+                    },
+                },
+            )
+            pipe.expire(key, self.inbox_expire)
+            await pipe.execute()
+
+    async def touch_inbox(
+        self, redis: Redis, *, user_ids: List[int], conversation_id: int, score: float
     ) -> None:
-        await self.add_to_list(
-            redis,
-            f"{self.list_conversation_id}:{user_id}",
-            conversation_id,
-        )
-
-    async def remove_conversation_id_from_list(
+        """Move a conversation up in the inbox of its members"""
+        member = self.get_inbox_member(conversation_id)
+        async with self.pipeline(redis, transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.zadd(self.get_inbox_key(user_id), {member: score}, gt=True)
+            await pipe.execute()
+
+    async def get_inbox(
+        self,
+        redis: Redis,
+        *,
+        user_id: int,
+        limit: int,
+        skip: int = 0,
+        cursor: Tuple[float, int] = None,
+    ) -> Optional[List[Tuple[int, float]]]:
+        """(conversation_id, last activity) latest first, None if not built.
+
+        A cursor (score, conversation_id) continues after that conversation;
+        conversations tied on its score are fetched too and skipped here.
+        """
+        key = self.get_inbox_key(user_id)
+        async with self.pipeline(redis, transaction=False) as pipe:
+            pipe.zscore(key, self.inbox_built)
+            if cursor:
+                pipe.zcount(key, cursor[0], cursor[0])
+            else:
+                pipe.zrevrangebyscore(
+                    key, "+inf", 0, start=skip, num=limit, withscores=True
+                )
+            built, response = await pipe.execute()
+        if built is None:
+            return None
+
+        if cursor:
+            score, conversation_id = cursor
+            response = await redis.zrevrangebyscore(
+                key, score, 0, start=0, num=response + limit, withscores=True
+            )
+            member = self.get_inbox_member(conversation_id).encode()
+            response = [
+                (value, value_score)
+                for value, value_score in response
+                if value_score < score or value < member
+            ][:limit]
+        return [(int(value), value_score) for value, value_score in response]
+
+    async def get_inbox_ids(self, redis: Redis, *, user_id: int) -> Optional[List[int]]:
+        """Every conversation id in the inbox, None if not built"""
+        response = await redis.zrevrangebyscore(self.get_inbox_key(user_id), "+inf", -1)
+        built = self.inbox_built.encode()
+        if built not in response:
+            return None
+        return [int(value) for value in response if value != built]
+
+    async def exists_in_inbox(
         self, redis: Redis, *, user_id: int, conversation_id: int
+    ) -> Optional[bool]:
+        """Whether the user is in the conversation, None if not built"""
+        key = self.get_inbox_key(user_id)
+        async with self.pipeline(redis, transaction=False) as pipe:
+            pipe.zscore(key, self.inbox_built)
+            pipe.zscore(key, self.get_inbox_member(conversation_id))
+            built, score = await pipe.execute()
+        if built is None:
+            return None
+        return score is not None
+
+    def get_recent_key(self, conversation_id: int) -> str:
+        return self.key_prefix + f"{self.recent}:{conversation_id}"
+
+    def get_recent_complete_key(self, conversation_id: int) -> str:
+        return self.get_recent_key(conversation_id) + ":complete"
+
+    async def append_recent(
+        self, redis: Redis, *, conversation_id: int, value: str
     ) -> None:
-        await self.remove_from_list(
-            redis,
-            f"{self.list_conversation_id}:{user_id}",
-            conversation_id,
-        )
-
-    async def exists_conversation_id_in_list(
-        self, redis: Redis, *, user_id: int, conversation_id: int
+        """Push the newest message, keeping the last recent_size"""
+        key = self.get_recent_key(conversation_id)
+        async with self.pipeline(redis) as pipe:
+            pipe.lpush(key, value)
+            pipe.ltrim(key, 0, self.recent_size - 1)
+            pipe.expire(key, self.expire)
+            pipe.expire(self.get_recent_complete_key(conversation_id), self.expire)
+            await pipe.execute()
+
+    async def get_recent(
+        self, redis: Redis, *, conversation_id: int, limit: int
+    ) -> Optional[List[str]]:
+        """The newest messages, None unless the buffer is known to hold them"""
+        async with self.pipeline(redis, transaction=False) as pipe:
+            pipe.get(self.get_recent_complete_key(conversation_id))
+            pipe.lrange(self.get_recent_key(conversation_id), 0, -1)
+            complete, response = await pipe.execute()
+        if complete is None:
+            return None
+        # A message appended after a seed that already read it is held twice
+        values = {}
+        for value in response:
+            values.setdefault(json.loads(value)["id"], value)
+        response = [values[id] for id in sorted(values, reverse=True)[:limit]]
+        # Fewer than limit is only the whole conversation if it was seeded so
+        if len(response) < limit and complete != b"1":
+            return None
+        return [value.decode() for value in response]
+
+    async def seed_recent(
+        self,
+        redis: Redis,
+        *,
+        conversation_id: int,
+        values: List[Tuple[int, str]],
+        complete: bool,
     ) -> bool:
-        return conversation_id in await self.get_cache_list_conversation_id(
-            redis, user_id=user_id
-        )
+        """Fill the buffer with (message_id, value) newest first, merged with
+        messages appended meanwhile; False if it changed while seeding"""
+        key = self.get_recent_key(conversation_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                appended = await pipe.lrange(key, 0, -1)
+                merged = dict(values)
+                for value in appended:
+                    merged[json.loads(value)["id"]] = value.decode()
+                merged = [
+                    merged[id]
+                    for id in sorted(merged, reverse=True)[: self.recent_size]
+                ]
+                pipe.multi()
+                pipe.delete(key)
+                if merged:
+                    pipe.rpush(key, *merged)
+                    pipe.expire(key, self.expire)
+                pipe.set(
+                    self.get_recent_complete_key(conversation_id),
+                    1 if complete and len(merged) < self.recent_size else 0,
+                    self.expire,
+                )
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def delete_many_recent(self, redis: Redis, conversation_ids: List[int]):
+        keys = []
+        for conversation_id in conversation_ids:
+            keys += [
+                self.get_recent_key(conversation_id),
+                self.get_recent_complete_key(conversation_id),
+            ]
+        if keys:
+            await redis.delete(*keys)
 
 
 message_cache_service = MessageCacheService()
+
+# Edited or deleted messages drop the buffer of their conversation
+cache_invalidation_bus.register(
+    "recent_messages", message_cache_service.delete_many_recent
+)
+cache_invalidation_bus.watch(
+    Message, "recent_messages", lambda connection, target: [target.conversation_id]
+)
@@ -0,0 +1,123 @@
+from redis.asyncio import Redis
+from typing import Dict, List, Set, Tuple
+
+from app.storage.base_cache import BaseCache
+from app.hepler.text_search import TextSearchHelper
+
+
+class SuggestCacheService(BaseCache):
+    def __init__(self):
+        super().__init__("suggest_cache_", 60 * 60 * 24)
+        self.item_key = "item:"
+        self.prefix_key = "prefix:"
+        self.deadline_key = "deadline:"
+        self.max_prefix_length = 20
+
+    def get_item_key(self, type: str) -> str:
+        return f"{self.key_prefix}{self.item_key}{type}"
+
+    def get_prefix_key(self, type: str, prefix: str) -> str:
+        return f"{self.key_prefix}{self.prefix_key}{type}:{prefix}"
+
+    def get_deadline_key(self, type: str) -> str:
+        return f"{self.key_prefix}{self.deadline_key}{type}"
+
+    def get_prefixes(self, name: str) -> Set[str]:
+        """Every prefix of every accent folded token of Name"""
+        return {
+            token[:i]
+            for token in TextSearchHelper.tokenize(name)
+            for i in range(1, min(len(token), self.max_prefix_length) + 1)
+        }
+
+    async def add_items(
+        self,
+        redis: Redis,
+        type: str,
+        items: List[Tuple[int, str]],
+        deadlines: Dict[int, float] = None,
+    ):
+        """Index (id, name) Items, newest first, dropping stale prefixes.
+        Items with a deadline timestamp are returned by get_expired after it"""
+        if not items:
+            return
+        item_key = self.get_item_key(type)
+        old_names = await redis.hmget(item_key, [id for id, _ in items])
+        async with self.pipeline(redis, transaction=False) as pipe:
+            for (id, name), old_name in zip(items, old_names):
+                prefixes = self.get_prefixes(name)
+                if old_name:
+                    for prefix in self.get_prefixes(old_name.decode()) - prefixes:
+                        pipe.zrem(self.get_prefix_key(type, prefix), id)
+                for prefix in prefixes:
+                    pipe.zadd(self.get_prefix_key(type, prefix), {id: id})
+                pipe.hset(item_key, id, name)
+            if deadlines:
+                pipe.zadd(self.get_deadline_key(type), deadlines)
+            await pipe.execute()
+
+    async def remove_items(self, redis: Redis, type: str, ids: List[int]):
+        """Remove Items by id"""
+        if not ids:
+            return
+        item_key = self.get_item_key(type)
+        old_names = await redis.hmget(item_key, ids)
+        async with self.pipeline(redis, transaction=False) as pipe:
+            for id, old_name in zip(ids, old_names):
+                if old_name:
+                    for prefix in self.get_prefixes(old_name.decode()):
+                        pipe.zrem(self.get_prefix_key(type, prefix), id)
+            pipe.hdel(item_key, *ids)
+            pipe.zrem(self.get_deadline_key(type), *ids)
+            await pipe.execute()
+
+    async def get_ids(self, redis: Redis, type: str) -> List[int]:
+        return [int(id) for id in await redis.hkeys(self.get_item_key(type))]
+
+    async def get_expired(self, redis: Redis, type: str, now: float) -> List[int]:
+        ids = await redis.zrangebyscore(self.get_deadline_key(type), "-inf", now)
+        return [int(id) for id in ids]
+
+    async def search(
+        self, redis: Redis, type: str, keyword: str, limit: int
+    ) -> List[Tuple[int, str]]:
+        """Items whose folded name has a token starting with every keyword token"""
+        tokens = [
+            token[: self.max_prefix_length]
+            for token in TextSearchHelper.tokenize(keyword)
+        ]
+        if not tokens:
+            return []
+
+        # Scan the most selective prefix set and check the other tokens on names
+        longest = max(tokens, key=len)
+        ids = await redis.zrevrange(
+            self.get_prefix_key(type, longest), 0, limit * 10 - 1
+        )
+        if not ids:
+            return []
+        names = await redis.hmget(self.get_item_key(type), ids)
+
+        items = []
+        for id, name in zip(ids, names):
+            if not name:
+                continue
+            name = name.decode()
+            name_tokens = TextSearchHelper.tokenize(name)
+            if all(
+                any(name_token.startswith(token) for name_token in name_tokens)
+                for token in tokens
+            ):
+                items.append((int(id), name))
+            if len(items) >= limit:
+                break
+        return items
+
+    async def lock(self, redis: Redis, name: str, expire: int) -> bool:
+        """Let only one worker run a periodic task per interval"""
+        return bool(
+            await redis.set(f"{self.key_prefix}lock:{name}", 1, ex=expire, nx=True)
+        )
+
+
+suggest_cache_service = SuggestCacheService()
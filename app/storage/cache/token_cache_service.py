@@ -0,0 +1,51 @@
+import json
+from redis.asyncio import Redis
+from typing import List, Optional
+
+from app.storage.base_cache import BaseCache
+from app.storage.cache_invalidation import cache_invalidation_bus
+from app.model import Account, User, SocialNetwork, Manager, Business
+
+
+class TokenCacheService(BaseCache):
+    def __init__(self):
+        super().__init__("token_", 60)
+        self.revoked_key = "revoked:"
+        self.identity_key = "identity:"
+
+    async def revoke(self, redis: Redis, token_hash: str, expire: int):
+        """Keep a revoked token until it would have expired anyway"""
+        if expire > 0:
+            await self.set(redis, self.revoked_key + token_hash, 1, expire)
+
+    async def is_revoked(self, redis: Redis, token_hash: str) -> bool:
+        return bool(await redis.exists(self.key_prefix + self.revoked_key + token_hash))
+
+    async def get_revoked(self, redis: Redis) -> List[str]:
+        prefix = self.key_prefix + self.revoked_key
+        return [
+            key.decode()[len(prefix) :]
+            async for key in redis.scan_iter(match=prefix + "*", count=1000)
+        ]
+
+    async def get_identity(self, redis: Redis, account_id: int) -> Optional[dict]:
+        response = await self.get(redis, self.identity_key + str(account_id))
+        return json.loads(response) if response else None
+
+    async def set_identity(self, redis: Redis, account_id: int, value: dict):
+        await self.set(redis, self.identity_key + str(account_id), json.dumps(value))
+
+    async def delete_many_identity(self, redis: Redis, account_ids: List[int]):
+        await self.delete_many(
+            redis, [self.identity_key + str(account_id) for account_id in account_ids]
+        )
+
+
+token_cache_service = TokenCacheService()
+
+# User, social network, manager and business rows share the id of their account
+cache_invalidation_bus.register("identity", token_cache_service.delete_many_identity)
+for model in [Account, User, SocialNetwork, Manager, Business]:
+    cache_invalidation_bus.watch(
+        model, "identity", lambda connection, target: [target.id]
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from collections import defaultdict
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.storage.redis import get_redis
+from app.core.loggers import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheInvalidationBus:
+    """Publishes ids of changed rows once their transaction commits.
+
+    Models are watched with SQLAlchemy mapper events that collect
+    (topic, ids) on the session; after commit they are published on one
+    Redis channel and every worker runs the handlers registered for the
+    topic, e.g. deleting the cached entries.
+    """
+
+    def __init__(self):
+        self.channel = "cache_invalidate"
+        self.handlers: Dict[str, List[Callable[[Redis, List[Any]], Awaitable]]] = {}
+        self.pubsub: Optional[PubSub] = None
+        self.task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Pub/sub drops messages while disconnected, subscribers may resync
+        self.connected = False
+        self.subscribed_once = False
+        self.reconnect_handlers: List[Callable[[Redis], Awaitable]] = []
+
+    def register(
+        self, topic: str, handler: Callable[[Redis, List[Any]], Awaitable]
+    ) -> None:
+        self.handlers.setdefault(topic, []).append(handler)
+
+    def on_reconnect(self, handler: Callable[[Redis], Awaitable]) -> None:
+        """Run handler(redis) each time the listener subscribes again"""
+        self.reconnect_handlers.append(handler)
+
+    async def handle_subscribe(self, redis: Redis) -> None:
+        self.connected = True
+        if not self.subscribed_once:
+            self.subscribed_once = True
+            return
+        logger.warning("Cache invalidation listener reconnected")
+        for handler in self.reconnect_handlers:
+            try:
+                await handler(redis)
+            except Exception as e:
+                logger.error(f"Cache invalidation reconnect handler failed: {e}")
+
+    def watch(
+        self,
+        model: Any,
+        topic: str,
+        get_ids: Callable[[Any, Any], Iterable[Any]],
+        events: Iterable[str] = ("after_update", "after_delete"),
+    ) -> None:
+        """Invalidate get_ids(connection, target) of topic when model changes"""
+
+        def receive(mapper, connection, target):
+            session = object_session(target)
+            if session is not None:
+                pending = session.info.setdefault(self.channel, defaultdict(set))
+                pending[topic].update(get_ids(connection, target))
+
+        for name in events:
+            event.listen(model, name, receive)
+
+    async def publish(self, redis: Redis, topic: str, ids: Iterable[Any]) -> None:
+        ids = sorted(ids)
+        if ids:
+            await redis.publish(self.channel, json.dumps({"topic": topic, "ids": ids}))
+
+    async def publish_pending(self, pending: Dict[str, set]) -> None:
+        try:
+            redis = await get_redis()
+            for topic, ids in pending.items():
+                await self.publish(redis, topic, ids)
+        except Exception as e:
+            logger.error(f"Cache invalidation publish failed: {e}")
+
+    def after_commit(self, session: Session) -> None:
+        pending = session.info.pop(self.channel, None)
+        if not pending or self.loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.loop.create_task(self.publish_pending(pending))
+        else:
+            asyncio.run_coroutine_threadsafe(self.publish_pending(pending), self.loop)
+
+    def after_rollback(self, session: Session) -> None:
+        session.info.pop(self.channel, None)
+
+    async def handle_message(self, redis: Redis, data: bytes) -> None:
+        message = json.loads(data)
+        for handler in self.handlers.get(message["topic"], []):
+            try:
+                await handler(redis, message["ids"])
+            except Exception as e:
+                logger.error(f"Cache invalidation handler failed: {e}")
+
+    async def listen(self, redis: Redis) -> None:
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    if message["type"] == "message":
+                        await self.handle_message(redis, message["data"])
+                    elif message["type"] == "subscribe":
+                        await self.handle_subscribe(redis)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.connected = False
+                logger.error(f"Cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+
+    async def start(self, redis: Redis) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.pubsub = redis.pubsub()
+        await self.pubsub.subscribe(self.channel)
+        self.task = asyncio.create_task(self.listen(redis))
+
+    async def stop(self) -> None:
+        self.loop = None
+        self.connected = False
+        self.subscribed_once = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if self.pubsub:
+            await self.pubsub.close()
+            self.pubsub = None
+
+
+cache_invalidation_bus = CacheInvalidationBus()
+event.listen(Session, "after_commit", cache_invalidation_bus.after_commit)
+event.listen(Session, "after_rollback", cache_invalidation_bus.after_rollback)
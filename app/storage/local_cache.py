@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from typing import Any, Dict, List, Optional
+
+from app.core.loggers import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalCache:
+    def __init__(self, name: str, maxsize: int = 4096, expire: int = 300):
+        self.name = name
+        self.maxsize = maxsize
+        self.expire = expire
+        self.version = 0
+        self.data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        """Get Value from Key, None if missing or expired"""
+        item = self.data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expired_at = item
+        if expired_at < time.monotonic():
+            self.data.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, expire: int = None):
+        """Set Value to Key, evict least recently used keys over maxsize"""
+        self.data[key] = (value, time.monotonic() + (expire or self.expire))
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def delete(self, key: str):
+        """Delete Key"""
+        self.data.pop(key, None)
+
+    def clear(self):
+        """Delete all Keys"""
+        self.data.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class LocalCacheInvalidator:
+    def __init__(self):
+        self.channel = "local_cache_invalidate"
+        self.version_key = "local_cache_version:"
+        self.caches: Dict[str, List[LocalCache]] = {}
+        self.pubsub: Optional[PubSub] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def register(self, cache: LocalCache) -> LocalCache:
+        """Register anything with name, version and clear() under its name"""
+        self.caches.setdefault(cache.name, []).append(cache)
+        return cache
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Size and hit/miss counters of every LocalCache in this worker, other
+        registered objects only take part in invalidation"""
+        return [
+            cache.get_stats()
+            for caches in self.caches.values()
+            for cache in caches
+            if isinstance(cache, LocalCache)
+        ]
+
+    async def invalidate(self, redis: Redis, name: str):
+        """Bump the version of a cache and clear it on every worker"""
+        for cache in self.caches.get(name, []):
+            cache.clear()
+
+        version = await redis.incr(self.version_key + name)
+        await redis.publish(self.channel, f"{name}:{version}")
+
+    def handle_message(self, data: bytes):
+        name, _, version = data.decode().rpartition(":")
+        for cache in self.caches.get(name, []):
+            if cache.version != int(version):
+                cache.clear()
+                cache.version = int(version)
+
+    async def listen(self):
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    if message["type"] == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Local cache invalidation listener failed: {e}")
+                for caches in self.caches.values():
+                    for cache in caches:
+                        cache.clear()
+                await asyncio.sleep(1)
+
+    async def start(self, redis: Redis):
+        self.pubsub = redis.pubsub()
+        await self.pubsub.subscribe(self.channel)
+        self.task = asyncio.create_task(self.listen())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if self.pubsub:
+            await self.pubsub.close()
+            self.pubsub = None
+
+
+local_cache_invalidator = LocalCacheInvalidator()
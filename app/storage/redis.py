@@ -46,9 +46,12 @@ class RedisBackend:
 
     async def set_list(self, key: str, value: list, expire: int = None):
         """Set Value to Key"""
-        for v in value:
-            await self.connection.rpush(key, json.dumps(v))
-        await self.connection.expire(key, expire or self.expire)
+        async with self.connection.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if value:
+                pipe.rpush(key, *[json.dumps(v) for v in value])
+                pipe.expire(key, expire or self.expire)
+            await pipe.execute()
 
     async def get_list(self, key: str) -> list:
         """Get Value from Key"""
@@ -56,8 +59,12 @@ class RedisBackend:
 
     async def set_dict(self, key: str, value: dict, expire: int = None):
         """Set Value to Key"""
-        await self.connection.hmset(key, value)
-        await self.connection.expire(key, expire or self.expire)
+        async with self.connection.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if value:
+                pipe.hset(key, mapping=value)
+                pipe.expire(key, expire or self.expire)
+            await pipe.execute()
 
     async def get_dict(self, key: str) -> dict:
         """Get Value from Key"""
@@ -1,8 +1,12 @@
+import asyncio
 import boto3
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import TransferConfig
 from typing import List, Optional
 from botocore.exceptions import ClientError
 
 from app.core.config import settings
+from app.core.loggers import logger
 
 
 class S3:
@@ -12,28 +16,62 @@ class S3:
         aws_secret_access_key: str,
         bucket_name: str,
         client: Optional[boto3.client] = None,
+        endpoint_url: Optional[str] = None,
+        max_workers: int = 8,
+        multipart_threshold: int = 8 * 1024 * 1024,
     ):
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
         self.bucket_name = bucket_name
+        self.endpoint_url = endpoint_url or None
         self.client = client or boto3.client(
             "s3",
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
+            endpoint_url=self.endpoint_url,
         )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_threshold,
+            max_concurrency=4,
+        )
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
 
     def upload_file(self, file, key):
         try:
+            file.file.seek(0)
             self.client.upload_fileobj(
                 file.file,
                 self.bucket_name,
                 key,
                 ExtraArgs={"ContentType": file.content_type},
+                Config=self.transfer_config,
             )
             return f"{self.bucket_name}.s3.amazonaws.com/{key}"
         except ClientError as e:
             raise e
 
+    async def async_upload_file(self, file, key):
+        """Upload on the bounded S3 thread pool without blocking the event loop"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="s3-upload"
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor, self.upload_file, file, key
+            )
+        except Exception as e:
+            logger.error(f"Upload {key} to S3 failed: {e}")
+            raise e
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
     def delete_file(self, key):
         try:
             self.client.delete_object(Bucket=self.bucket_name, Key=key)
@@ -52,6 +90,8 @@ class S3:
             raise e
 
     def get_file_url(self, key):
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{key}"
         return f"https://{self.bucket_name}.s3.amazonaws.com/{key}"
 
 
@@ -59,4 +99,7 @@ s3_service = S3(
     aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
     aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
     bucket_name=settings.AWS_BUCKET_NAME,
+    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+    max_workers=settings.S3_UPLOAD_WORKERS,
+    multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
 )
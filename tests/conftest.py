@@ -0,0 +1,10 @@
+import os
+from pathlib import Path
+
+# Settings are read when app modules are imported, default them from the example
+for line in (Path(__file__).parent.parent / ".env.example").read_text().splitlines():
+    key, sep, value = line.partition("=")
+    if sep and not key.startswith("#"):
+        os.environ.setdefault(key.strip(), value.strip())
+os.environ["MAIL_FROM"] = os.environ["MAIL_FROM"] or "test@example.com"
+os.environ["AWS_DEFAULT_REGION"] = os.environ["AWS_DEFAULT_REGION"] or "us-east-1"
@@ -0,0 +1,29 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.__main__ import app
+from app.core.auth.user_manager_service import user_manager_service
+from app.core.reference_data.reference_data_registry import reference_data_registry
+from app.storage.local_cache import local_cache_invalidator
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[user_manager_service.get_current_superuser] = lambda: None
+    # Without the context manager the lifespan, which needs MySQL and Redis,
+    # does not run
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_get_cache_stats(client):
+    # The registry shares the invalidation of the config cache but has no stats
+    assert reference_data_registry in local_cache_invalidator.caches["config_cache_"]
+
+    response = client.get("/api/v1/admin/cache/stats")
+
+    assert response.status_code == 200
+    stats = response.json()["data"]
+    assert {"config_cache_", "verified_token_"} <= {cache["name"] for cache in stats}
+    for cache in stats:
+        assert set(cache) == {"name", "size", "maxsize", "hits", "misses"}
@@ -0,0 +1,61 @@
+import asyncio
+import io
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+from starlette.datastructures import Headers, UploadFile
+
+from app.storage.s3 import S3
+
+BUCKET = "tvnow-test"
+# The smallest part size S3 accepts
+THRESHOLD = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        service = S3(
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            bucket_name=BUCKET,
+            client=client,
+            max_workers=2,
+            multipart_threshold=THRESHOLD,
+        )
+        yield service
+        service.close()
+
+
+def upload(s3: S3, size: int, key: str):
+    data = os.urandom(size)
+    file = UploadFile(
+        io.BytesIO(data),
+        filename="file.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+    return asyncio.run(s3.async_upload_file(file, key)), data
+
+
+def test_async_upload_file_single_part(s3):
+    url, data = upload(s3, 1024, "cv/small.pdf")
+
+    head = s3.client.head_object(Bucket=BUCKET, Key="cv/small.pdf")
+    assert url == f"{BUCKET}.s3.amazonaws.com/cv/small.pdf"
+    assert s3.get_file("cv/small.pdf") == data
+    assert head["ContentType"] == "application/pdf"
+    assert "-" not in head["ETag"]
+
+
+def test_async_upload_file_multipart(s3):
+    url, data = upload(s3, 2 * THRESHOLD + 1024, "cv/large.pdf")
+
+    head = s3.client.head_object(Bucket=BUCKET, Key="cv/large.pdf")
+    assert s3.get_file("cv/large.pdf") == data
+    assert head["ContentType"] == "application/pdf"
+    # Multipart ETags end with the number of parts
+    assert head["ETag"].strip('"').endswith("-3")